@@ -1,117 +1,249 @@
 import streamlit as st
 import pandas as pd
-from typing import Dict, List, Tuple, Callable
+import numpy as np
+from typing import Dict, List, Tuple, Callable, Union
 import os
+import operator
+import sqlite3
+import threading
+import uuid
+from functools import lru_cache, partial
 
 # Configuration and constants
-CONVERSION_TYPES = {
+# Every unit is defined once, relative to its category's base unit:
+#     value_in_base = value * factor + offset
+# Entries are (unit, factor) or (unit, factor, offset).
+UNIT_REGISTRY = {
     "Length": {
-        "units": ["Meter", "Kilometer", "Centimeter", "Millimeter", "Mile", "Yard", "Foot", "Inch"],
-        "conversions": {
-            "Meter": {"Meter": 1, "Kilometer": 0.001, "Centimeter": 100, "Millimeter": 1000, "Mile": 0.000621371, "Yard": 1.09361, "Foot": 3.28084, "Inch": 39.3701},
-            "Kilometer": {"Meter": 1000, "Kilometer": 1, "Centimeter": 100000, "Millimeter": 1000000, "Mile": 0.621371, "Yard": 1093.61, "Foot": 3280.84, "Inch": 39370.1},
-            "Centimeter": {"Meter": 0.01, "Kilometer": 0.00001, "Centimeter": 1, "Millimeter": 10, "Mile": 0.00000621371, "Yard": 0.0109361, "Foot": 0.0328084, "Inch": 0.393701},
-            "Millimeter": {"Meter": 0.001, "Kilometer": 0.000001, "Centimeter": 0.1, "Millimeter": 1, "Mile": 0.000000621371, "Yard": 0.00109361, "Foot": 0.00328084, "Inch": 0.0393701},
-            "Mile": {"Meter": 1609.34, "Kilometer": 1.60934, "Centimeter": 160934, "Millimeter": 1609340, "Mile": 1, "Yard": 1760, "Foot": 5280, "Inch": 63360},
-            "Yard": {"Meter": 0.9144, "Kilometer": 0.0009144, "Centimeter": 91.44, "Millimeter": 914.4, "Mile": 0.000568182, "Yard": 1, "Foot": 3, "Inch": 36},
-            "Foot": {"Meter": 0.3048, "Kilometer": 0.0003048, "Centimeter": 30.48, "Millimeter": 304.8, "Mile": 0.000189394, "Yard": 0.333333, "Foot": 1, "Inch": 12},
-            "Inch": {"Meter": 0.0254, "Kilometer": 0.0000254, "Centimeter": 2.54, "Millimeter": 25.4, "Mile": 0.0000157828, "Yard": 0.0277778, "Foot": 0.0833333, "Inch": 1}
-        }
+        "base": "Meter",
+        "units": [
+            ("Meter", 1.0),
+            ("Kilometer", 1000.0),
+            ("Centimeter", 0.01),
+            ("Millimeter", 0.001),
+            ("Mile", 1609.344),
+            ("Yard", 0.9144),
+            ("Foot", 0.3048),
+            ("Inch", 0.0254)
+        ]
     },
     "Weight": {
-        "units": ["Kilogram", "Gram", "Milligram", "Metric Ton", "Pound", "Ounce", "Stone"],
-        "conversions": {
-            "Kilogram": {"Kilogram": 1, "Gram": 1000, "Milligram": 1000000, "Metric Ton": 0.001, "Pound": 2.20462, "Ounce": 35.274, "Stone": 0.157473},
-            "Gram": {"Kilogram": 0.001, "Gram": 1, "Milligram": 1000, "Metric Ton": 0.000001, "Pound": 0.00220462, "Ounce": 0.035274, "Stone": 0.000157473},
-            "Milligram": {"Kilogram": 0.000001, "Gram": 0.001, "Milligram": 1, "Metric Ton": 0.000000001, "Pound": 0.00000220462, "Ounce": 0.000035274, "Stone": 0.000000157473},
-            "Metric Ton": {"Kilogram": 1000, "Gram": 1000000, "Milligram": 1000000000, "Metric Ton": 1, "Pound": 2204.62, "Ounce": 35274, "Stone": 157.473},
-            "Pound": {"Kilogram": 0.453592, "Gram": 453.592, "Milligram": 453592, "Metric Ton": 0.000453592, "Pound": 1, "Ounce": 16, "Stone": 0.0714286},
-            "Ounce": {"Kilogram": 0.0283495, "Gram": 28.3495, "Milligram": 28349.5, "Metric Ton": 0.0000283495, "Pound": 0.0625, "Ounce": 1, "Stone": 0.00446429},
-            "Stone": {"Kilogram": 6.35029, "Gram": 6350.29, "Milligram": 6350290, "Metric Ton": 0.00635029, "Pound": 14, "Ounce": 224, "Stone": 1}
-        }
+        "base": "Kilogram",
+        "units": [
+            ("Kilogram", 1.0),
+            ("Gram", 0.001),
+            ("Milligram", 0.000001),
+            ("Metric Ton", 1000.0),
+            ("Pound", 0.45359237),
+            ("Ounce", 0.028349523125),
+            ("Stone", 6.35029318)
+        ]
     },
     "Temperature": {
-        "units": ["Celsius", "Fahrenheit", "Kelvin"],
-        "conversions": {
-            "Celsius": {"Celsius": lambda x: x, "Fahrenheit": lambda x: (x * 9/5) + 32, "Kelvin": lambda x: x + 273.15},
-            "Fahrenheit": {"Celsius": lambda x: (x - 32) * 5/9, "Fahrenheit": lambda x: x, "Kelvin": lambda x: (x - 32) * 5/9 + 273.15},
-            "Kelvin": {"Celsius": lambda x: x - 273.15, "Fahrenheit": lambda x: (x - 273.15) * 9/5 + 32, "Kelvin": lambda x: x}
-        }
+        "base": "Kelvin",
+        "units": [
+            ("Celsius", 1.0, 273.15),
+            ("Fahrenheit", 5/9, 459.67 * 5/9),
+            ("Kelvin", 1.0)
+        ]
     },
     "Volume": {
-        "units": ["Liter", "Milliliter", "Cubic Meter", "Gallon (US)", "Quart (US)", "Pint (US)", "Cup", "Fluid Ounce (US)"],
-        "conversions": {
-            "Liter": {"Liter": 1, "Milliliter": 1000, "Cubic Meter": 0.001, "Gallon (US)": 0.264172, "Quart (US)": 1.05669, "Pint (US)": 2.11338, "Cup": 4.22675, "Fluid Ounce (US)": 33.814},
-            "Milliliter": {"Liter": 0.001, "Milliliter": 1, "Cubic Meter": 0.000001, "Gallon (US)": 0.000264172, "Quart (US)": 0.00105669, "Pint (US)": 0.00211338, "Cup": 0.00422675, "Fluid Ounce (US)": 0.033814},
-            "Cubic Meter": {"Liter": 1000, "Milliliter": 1000000, "Cubic Meter": 1, "Gallon (US)": 264.172, "Quart (US)": 1056.69, "Pint (US)": 2113.38, "Cup": 4226.75, "Fluid Ounce (US)": 33814},
-            "Gallon (US)": {"Liter": 3.78541, "Milliliter": 3785.41, "Cubic Meter": 0.00378541, "Gallon (US)": 1, "Quart (US)": 4, "Pint (US)": 8, "Cup": 16, "Fluid Ounce (US)": 128},
-            "Quart (US)": {"Liter": 0.946353, "Milliliter": 946.353, "Cubic Meter": 0.000946353, "Gallon (US)": 0.25, "Quart (US)": 1, "Pint (US)": 2, "Cup": 4, "Fluid Ounce (US)": 32},
-            "Pint (US)": {"Liter": 0.473176, "Milliliter": 473.176, "Cubic Meter": 0.000473176, "Gallon (US)": 0.125, "Quart (US)": 0.5, "Pint (US)": 1, "Cup": 2, "Fluid Ounce (US)": 16},
-            "Cup": {"Liter": 0.236588, "Milliliter": 236.588, "Cubic Meter": 0.000236588, "Gallon (US)": 0.0625, "Quart (US)": 0.25, "Pint (US)": 0.5, "Cup": 1, "Fluid Ounce (US)": 8},
-            "Fluid Ounce (US)": {"Liter": 0.0295735, "Milliliter": 29.5735, "Cubic Meter": 0.0000295735, "Gallon (US)": 0.0078125, "Quart (US)": 0.03125, "Pint (US)": 0.0625, "Cup": 0.125, "Fluid Ounce (US)": 1}
-        }
+        "base": "Liter",
+        "units": [
+            ("Liter", 1.0),
+            ("Milliliter", 0.001),
+            ("Cubic Meter", 1000.0),
+            ("Gallon (US)", 3.785411784),
+            ("Quart (US)", 0.946352946),
+            ("Pint (US)", 0.473176473),
+            ("Cup", 0.2365882365),
+            ("Fluid Ounce (US)", 0.0295735295625)
+        ]
     },
     "Time": {
-        "units": ["Second", "Minute", "Hour", "Day", "Week", "Month", "Year"],
-        "conversions": {
-            "Second": {"Second": 1, "Minute": 1/60, "Hour": 1/3600, "Day": 1/86400, "Week": 1/604800, "Month": 1/2592000, "Year": 1/31536000},
-            "Minute": {"Second": 60, "Minute": 1, "Hour": 1/60, "Day": 1/1440, "Week": 1/10080, "Month": 1/43200, "Year": 1/525600},
-            "Hour": {"Second": 3600, "Minute": 60, "Hour": 1, "Day": 1/24, "Week": 1/168, "Month": 1/720, "Year": 1/8760},
-            "Day": {"Second": 86400, "Minute": 1440, "Hour": 24, "Day": 1, "Week": 1/7, "Month": 1/30, "Year": 1/365},
-            "Week": {"Second": 604800, "Minute": 10080, "Hour": 168, "Day": 7, "Week": 1, "Month": 0.23, "Year": 1/52},
-            "Month": {"Second": 2592000, "Minute": 43200, "Hour": 720, "Day": 30, "Week": 4.35, "Month": 1, "Year": 1/12},
-            "Year": {"Second": 31536000, "Minute": 525600, "Hour": 8760, "Day": 365, "Week": 52, "Month": 12, "Year": 1}
-        }
+        "base": "Second",
+        "units": [
+            ("Second", 1.0),
+            ("Minute", 60.0),
+            ("Hour", 3600.0),
+            ("Day", 86400.0),
+            ("Week", 604800.0),
+            ("Month", 2592000.0),  # 30 days
+            ("Year", 31536000.0)  # 365 days
+        ]
     },
     "Area": {
-        "units": ["Square Meter", "Square Kilometer", "Square Centimeter", "Square Millimeter", "Square Mile", "Square Yard", "Square Foot", "Square Inch", "Hectare", "Acre"],
-        "conversions": {
-            "Square Meter": {"Square Meter": 1, "Square Kilometer": 0.000001, "Square Centimeter": 10000, "Square Millimeter": 1000000, "Square Mile": 3.861e-7, "Square Yard": 1.19599, "Square Foot": 10.7639, "Square Inch": 1550, "Hectare": 0.0001, "Acre": 0.000247105},
-            "Square Kilometer": {"Square Meter": 1000000, "Square Kilometer": 1, "Square Centimeter": 10000000000, "Square Millimeter": 1000000000000, "Square Mile": 0.386102, "Square Yard": 1195990, "Square Foot": 10763900, "Square Inch": 1.55e+9, "Hectare": 100, "Acre": 247.105},
-            "Square Centimeter": {"Square Meter": 0.0001, "Square Kilometer": 1e-10, "Square Centimeter": 1, "Square Millimeter": 100, "Square Mile": 3.861e-11, "Square Yard": 0.000119599, "Square Foot": 0.00107639, "Square Inch": 0.155, "Hectare": 1e-8, "Acre": 2.47105e-8},
-            "Square Millimeter": {"Square Meter": 0.000001, "Square Kilometer": 1e-12, "Square Centimeter": 0.01, "Square Millimeter": 1, "Square Mile": 3.861e-13, "Square Yard": 1.19599e-6, "Square Foot": 1.07639e-5, "Square Inch": 0.00155, "Hectare": 1e-10, "Acre": 2.47105e-10},
-            "Square Mile": {"Square Meter": 2589990, "Square Kilometer": 2.58999, "Square Centimeter": 2.59e+10, "Square Millimeter": 2.59e+12, "Square Mile": 1, "Square Yard": 3097600, "Square Foot": 27878400, "Square Inch": 4.014e+9, "Hectare": 258.999, "Acre": 640},
-            "Square Yard": {"Square Meter": 0.836127, "Square Kilometer": 8.36127e-7, "Square Centimeter": 8361.27, "Square Millimeter": 836127, "Square Mile": 3.22831e-7, "Square Yard": 1, "Square Foot": 9, "Square Inch": 1296, "Hectare": 8.36127e-5, "Acre": 0.000206612},
-            "Square Foot": {"Square Meter": 0.092903, "Square Kilometer": 9.2903e-8, "Square Centimeter": 929.03, "Square Millimeter": 92903, "Square Mile": 3.587e-8, "Square Yard": 0.111111, "Square Foot": 1, "Square Inch": 144, "Hectare": 9.2903e-6, "Acre": 2.29568e-5},
-            "Square Inch": {"Square Meter": 0.00064516, "Square Kilometer": 6.4516e-10, "Square Centimeter": 6.4516, "Square Millimeter": 645.16, "Square Mile": 2.491e-10, "Square Yard": 0.000771605, "Square Foot": 0.00694444, "Square Inch": 1, "Hectare": 6.4516e-8, "Acre": 1.59423e-7},
-            "Hectare": {"Square Meter": 10000, "Square Kilometer": 0.01, "Square Centimeter": 100000000, "Square Millimeter": 10000000000, "Square Mile": 0.00386102, "Square Yard": 11959.9, "Square Foot": 107639, "Square Inch": 15500000, "Hectare": 1, "Acre": 2.47105},
-            "Acre": {"Square Meter": 4046.86, "Square Kilometer": 0.00404686, "Square Centimeter": 40468600, "Square Millimeter": 4046860000, "Square Mile": 0.0015625, "Square Yard": 4840, "Square Foot": 43560, "Square Inch": 6272640, "Hectare": 0.404686, "Acre": 1}
-        }
+        "base": "Square Meter",
+        "units": [
+            ("Square Meter", 1.0),
+            ("Square Kilometer", 1000000.0),
+            ("Square Centimeter", 0.0001),
+            ("Square Millimeter", 0.000001),
+            ("Square Mile", 2589988.110336),
+            ("Square Yard", 0.83612736),
+            ("Square Foot", 0.09290304),
+            ("Square Inch", 0.00064516),
+            ("Hectare", 10000.0),
+            ("Acre", 4046.8564224)
+        ]
     },
     "Speed": {
-        "units": ["Meter per Second", "Kilometer per Hour", "Mile per Hour", "Knot", "Foot per Second"],
-        "conversions": {
-            "Meter per Second": {"Meter per Second": 1, "Kilometer per Hour": 3.6, "Mile per Hour": 2.23694, "Knot": 1.94384, "Foot per Second": 3.28084},
-            "Kilometer per Hour": {"Meter per Second": 0.277778, "Kilometer per Hour": 1, "Mile per Hour": 0.621371, "Knot": 0.539957, "Foot per Second": 0.911344},
-            "Mile per Hour": {"Meter per Second": 0.44704, "Kilometer per Hour": 1.60934, "Mile per Hour": 1, "Knot": 0.868976, "Foot per Second": 1.46667},
-            "Knot": {"Meter per Second": 0.514444, "Kilometer per Hour": 1.852, "Mile per Hour": 1.15078, "Knot": 1, "Foot per Second": 1.68781},
-            "Foot per Second": {"Meter per Second": 0.3048, "Kilometer per Hour": 1.09728, "Mile per Hour": 0.681818, "Knot": 0.592484, "Foot per Second": 1}
-        }
+        "base": "Meter per Second",
+        "units": [
+            ("Meter per Second", 1.0),
+            ("Kilometer per Hour", 1/3.6),
+            ("Mile per Hour", 0.44704),
+            ("Knot", 1852/3600),
+            ("Foot per Second", 0.3048)
+        ]
     },
     "Data": {
-        "units": ["Bit", "Byte", "Kilobyte", "Megabyte", "Gigabyte", "Terabyte", "Petabyte"],
-        "conversions": {
-            "Bit": {"Bit": 1, "Byte": 0.125, "Kilobyte": 0.000125, "Megabyte": 1.25e-7, "Gigabyte": 1.25e-10, "Terabyte": 1.25e-13, "Petabyte": 1.25e-16},
-            "Byte": {"Bit": 8, "Byte": 1, "Kilobyte": 0.001, "Megabyte": 1e-6, "Gigabyte": 1e-9, "Terabyte": 1e-12, "Petabyte": 1e-15},
-            "Kilobyte": {"Bit": 8000, "Byte": 1000, "Kilobyte": 1, "Megabyte": 0.001, "Gigabyte": 1e-6, "Terabyte": 1e-9, "Petabyte": 1e-12},
-            "Megabyte": {"Bit": 8000000, "Byte": 1000000, "Kilobyte": 1000, "Megabyte": 1, "Gigabyte": 0.001, "Terabyte": 1e-6, "Petabyte": 1e-9},
-            "Gigabyte": {"Bit": 8000000000, "Byte": 1000000000, "Kilobyte": 1000000, "Megabyte": 1000, "Gigabyte": 1, "Terabyte": 0.001, "Petabyte": 1e-6},
-            "Terabyte": {"Bit": 8000000000000, "Byte": 1000000000000, "Kilobyte": 1000000000, "Megabyte": 1000000, "Gigabyte": 1000, "Terabyte": 1, "Petabyte": 0.001},
-            "Petabyte": {"Bit": 8000000000000000, "Byte": 1000000000000000, "Kilobyte": 1000000000000, "Megabyte": 1000000000, "Gigabyte": 1000000, "Terabyte": 1000, "Petabyte": 1}
-        }
+        "base": "Bit",
+        "units": [
+            ("Bit", 1.0),
+            ("Byte", 8.0),
+            ("Kilobyte", 8e3),
+            ("Megabyte", 8e6),
+            ("Gigabyte", 8e9),
+            ("Terabyte", 8e12),
+            ("Petabyte", 8e15)
+        ]
     }
 }
 
+def build_conversion_types(registry: Dict) -> Dict:
+    """Flatten the registry into per-category arrays indexed by integer unit ID."""
+    conversion_types = {}
+    for name, category in registry.items():
+        units = [entry[0] for entry in category["units"]]
+        factors = [float(entry[1]) for entry in category["units"]]
+        offsets = [float(entry[2]) if len(entry) > 2 else 0.0 for entry in category["units"]]
+        conversion_types[name] = {
+            "units": units,
+            "base": category["base"],
+            "unit_ids": {unit: i for i, unit in enumerate(units)},
+            "factors": factors,
+            "inverse_factors": [1.0 / factor for factor in factors],
+            "offsets": offsets
+        }
+    return conversion_types
+
+CONVERSION_TYPES = build_conversion_types(UNIT_REGISTRY)
+
+# Number of compiled (category, from, to) converters kept around
+CONVERTER_CACHE_SIZE = 256
+
+# Number of (category, from unit, value) all-units tables kept around
+CONVERSION_TABLE_CACHE_SIZE = 128
+
+# Conversion history: rows kept in memory per session, rows per page, and an
+# optional SQLite file that keeps every conversion beyond the in-memory cap
+HISTORY_CAPACITY = 1000
+HISTORY_PAGE_SIZE = 50
+HISTORY_SPILL_FILE = os.environ.get("CONVERTER_HISTORY_DB")
+HISTORY_COLUMNS = ["timestamp", "conversion_type", "from_unit", "to_unit", "input_value", "result"]
+
+# Separators offered for formatted batch output
+NUMBER_STYLES = {
+    "1234.5": {"decimal_point": ".", "thousands_sep": ""},
+    "1,234.5": {"decimal_point": ".", "thousands_sep": ","},
+    "1.234,5": {"decimal_point": ",", "thousands_sep": "."},
+    "1 234,5": {"decimal_point": ",", "thousands_sep": " "}
+}
+
 # Helper functions
 def convert_value(value: float, from_unit: str, to_unit: str, conversion_type: Dict) -> float:
     """Convert a value from one unit to another."""
-    if conversion_type == "Temperature":
-        conversion_func = CONVERSION_TYPES[conversion_type]["conversions"][from_unit][to_unit]
-        return conversion_func(value)
+    return get_converter(conversion_type, from_unit, to_unit)(value)
+
+@lru_cache(maxsize=CONVERTER_CACHE_SIZE)
+def get_converter(conversion_type: str, from_unit: str, to_unit: str) -> Callable[[float], float]:
+    """Compile a unit pair into a single-purpose converter.
+    
+    Registry lookups happen once per pair; the returned callable is a bare
+    identity, multiply or affine step. Use get_converter.cache_info() for
+    hit and miss counts.
+    """
+    scale, shift = conversion_coefficients(conversion_type, from_unit, to_unit)
+    if from_unit == to_unit:
+        return float
+    if shift:
+        return lambda value: value * scale + shift
+    return partial(operator.mul, scale)
+
+def conversion_coefficients(conversion_type: str, from_unit: str, to_unit: str) -> Tuple[float, float]:
+    """Return (scale, shift) such that converted = value * scale + shift."""
+    category = CONVERSION_TYPES[conversion_type]
+    i = category["unit_ids"][from_unit]
+    j = category["unit_ids"][to_unit]
+    scale = category["factors"][i] * category["inverse_factors"][j]
+    shift = (category["offsets"][i] - category["offsets"][j]) * category["inverse_factors"][j]
+    return scale, shift
+
+@lru_cache(maxsize=CONVERSION_TABLE_CACHE_SIZE)
+def conversion_table(conversion_type: str, from_unit: str, value: float) -> np.ndarray:
+    """Convert one value to every unit of its category in a single pass.
+    
+    The category's factor matrix is the outer product of its factors and
+    inverse factors, so the row for from_unit is one multiply into the base
+    unit followed by one vector multiply out of it. Results come back in
+    the order of CONVERSION_TYPES[conversion_type]["units"], read-only since
+    they are shared through the cache.
+    """
+    category = CONVERSION_TYPES[conversion_type]
+    i = category["unit_ids"][from_unit]
+    offsets = np.asarray(category["offsets"])
+    base_value = value * category["factors"][i] + offsets[i]
+    results = (base_value - offsets) * np.asarray(category["inverse_factors"])
+    results.setflags(write=False)
+    return results
+
+def check_conversion_table(conversion_type: str, table: Dict[str, Dict], rel_tol: float = 1e-4) -> List[Dict]:
+    """Check a from→to conversion table against the registry.
+    
+    Entries may be plain factors or functions of one value (compared at 0 and
+    1). Returns one record per entry that disagrees by more than rel_tol.
+    """
+    mismatches = []
+    for from_unit, targets in table.items():
+        for to_unit, entry in targets.items():
+            scale, shift = conversion_coefficients(conversion_type, from_unit, to_unit)
+            if callable(entry):
+                checks = [(entry(0.0), shift), (entry(1.0), scale + shift)]
+            else:
+                checks = [(entry, scale)]
+            for given, expected in checks:
+                if abs(given - expected) > rel_tol * max(abs(expected), 1.0 if callable(entry) else 0.0):
+                    mismatches.append({
+                        "conversion_type": conversion_type,
+                        "from_unit": from_unit,
+                        "to_unit": to_unit,
+                        "given": given,
+                        "expected": expected
+                    })
+                    break
+    return mismatches
+
+ArrayLike = Union[np.ndarray, pd.Series, List[float]]
+
+def convert_array(values: ArrayLike, from_unit: str, to_unit: str, conversion_type: str) -> Union[np.ndarray, pd.Series]:
+    """Convert many values at once in a single vectorized pass.
+    
+    Accepts a NumPy array, a pandas Series or a plain list. A Series comes back
+    as a Series with the same index, anything else as a float64 array. Values
+    that aren't numbers become NaN.
+    """
+    if isinstance(values, pd.Series):
+        data = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
     else:
-        from_to_base = CONVERSION_TYPES[conversion_type]["conversions"][from_unit][from_unit]
-        base_to_target = CONVERSION_TYPES[conversion_type]["conversions"][from_unit][to_unit]
-        return value * base_to_target / from_to_base
+        data = np.asarray(values, dtype=np.float64)
+    
+    scale, shift = conversion_coefficients(conversion_type, from_unit, to_unit)
+    result = data * scale + shift if shift else data * scale
+    
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
 
 def format_result(value: float) -> str:
     """Format the result with appropriate precision."""
@@ -122,6 +254,265 @@ def format_result(value: float) -> str:
     else:
         return f"{value:.10f}".rstrip('0').rstrip('.') if '.' in f"{value:.10f}" else f"{value:.10f}"
 
+def _ascii_digits(numbers: np.ndarray, width: int) -> np.ndarray:
+    """Spell non-negative integers as a (len, width) matrix of zero-padded UCS4 digit codes."""
+    chars = np.empty((width, numbers.size), dtype=np.uint32)
+    numbers = numbers.copy()
+    for k in range(width - 1, -1, -1):
+        chars[k] = numbers % 10
+        numbers //= 10
+    chars += ord("0")
+    return chars.T
+
+def _merge_pieces(shape: Tuple[int, ...], pieces: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+    """Scatter (mask, text) pieces into one str array just wide enough for all of them."""
+    width = max([text.dtype.itemsize // 4 for _, text in pieces] + [1])
+    out = np.empty(shape, dtype=f"<U{width}")
+    for mask, text in pieces:
+        out[mask] = text
+    return out
+
+def _exact_rounding(scaled: np.ndarray) -> np.ndarray:
+    """Mask of values whose float rounding can't land on the other side of a half."""
+    with np.errstate(invalid="ignore"):
+        distance = np.abs(scaled - np.floor(scaled) - 0.5)
+    return np.isfinite(scaled) & (scaled < 2.0 ** 52) & (distance > scaled * 1e-15 + 1e-12)
+
+def _apply_number_style(text: np.ndarray, grouped: np.ndarray, decimal_point: str, thousands_sep: str) -> np.ndarray:
+    """Swap in a decimal point and group the whole part of already formatted text."""
+    whole, _, fraction = np.strings.partition(text, ".")
+    fraction = np.where(fraction == "", fraction, np.strings.add(decimal_point, fraction))
+    if thousands_sep and grouped.any():
+        replacement = r"\1" + thousands_sep.replace("\\", "\\\\")
+        whole = whole.astype(object)
+        whole[grouped] = pd.Series(whole[grouped]).str.replace(r"(\d)(?=(?:\d{3})+$)", replacement, regex=True).to_numpy()
+        whole = whole.astype(str)
+    return np.strings.add(whole, fraction)
+
+def _format_fixed(data: np.ndarray, decimals: int, decimal_point: str = ".", thousands_sep: str = "") -> np.ndarray:
+    """Vectorized f"{value:.{decimals}f}" with trailing zeros and point stripped.
+    
+    Separators must be single characters; they are written straight into
+    the digit matrix.
+    """
+    pieces = []
+    scaled = np.abs(data) * 10.0 ** decimals
+    fast = _exact_rounding(scaled)
+    
+    if fast.any():
+        digits = np.rint(scaled[fast]).astype(np.int64)
+        whole_width = max(1, len(str(int(digits.max()) // 10 ** decimals)))
+        whole = _ascii_digits(digits // 10 ** decimals, whole_width)
+        
+        # Blank the leading zeros of the whole part, keeping the units digit
+        leading = np.cumprod(whole[:, :-1] == ord("0"), axis=1, dtype=bool)
+        whole[:, :-1][leading] = ord(" ")
+        
+        columns = []
+        for k in range(whole_width):
+            if thousands_sep and k and (whole_width - k) % 3 == 0:
+                separator = np.where(whole[:, k - 1] == ord(" "), ord(" "), ord(thousands_sep))
+                columns.append(separator.astype(np.uint32)[:, None])
+            columns.append(whole[:, k:k + 1])
+        if decimals:
+            columns.append(np.full((digits.size, 1), ord(decimal_point), dtype=np.uint32))
+            columns.append(_ascii_digits(digits % 10 ** decimals, decimals))
+        chars = np.ascontiguousarray(np.hstack(columns))
+        
+        text = chars.view(f"U{chars.shape[1]}").ravel()
+        if decimals:
+            text = np.strings.rstrip(np.strings.rstrip(text, "0"), decimal_point)
+        text = np.strings.lstrip(text, " ")
+        pieces.append((fast, np.where(np.signbit(data[fast]), np.strings.add("-", text), text)))
+    
+    # Near-ties, huge values and NaN go through Python's exact formatting
+    if not fast.all():
+        text = np.char.mod(f"%.{decimals}f", data[~fast])
+        if decimals:
+            text = np.strings.rstrip(np.strings.rstrip(text, "0"), ".")
+        if decimal_point != "." or thousands_sep:
+            text = _apply_number_style(text, np.ones(text.shape, dtype=bool), decimal_point, thousands_sep)
+        pieces.append((~fast, text))
+    return _merge_pieces(data.shape, pieces)
+
+def _format_scientific(data: np.ndarray, decimals: int, decimal_point: str = ".") -> np.ndarray:
+    """Vectorized f"{value:.{decimals}e}"."""
+    pieces = []
+    magnitude = np.abs(data)
+    finite = np.isfinite(magnitude) & (magnitude > 0)
+    
+    exponent = np.zeros(data.shape, dtype=np.int64)
+    exponent[finite] = np.floor(np.log10(magnitude[finite])).astype(np.int64)
+    scaled = magnitude * 10.0 ** (decimals - exponent.astype(np.float64))
+    
+    # log10 can be off by one right at a power of ten
+    low = finite & (scaled < 10.0 ** decimals)
+    exponent[low] -= 1
+    high = finite & (scaled >= 10.0 ** (decimals + 1))
+    exponent[high] += 1
+    scaled[low | high] = magnitude[low | high] * 10.0 ** (decimals - exponent[low | high].astype(np.float64))
+    
+    fast = finite & _exact_rounding(scaled) & (np.abs(exponent) < 300)
+    if fast.any():
+        digits = np.rint(scaled[fast]).astype(np.int64)
+        exponents = exponent[fast]
+        
+        # Rounding up to 10.000... carries into the exponent
+        carry = digits >= 10 ** (decimals + 1)
+        digits[carry] //= 10
+        exponents[carry] += 1
+        
+        chars = _ascii_digits(digits, decimals + 1)
+        if decimals:
+            point = np.full((digits.size, 1), ord(decimal_point), dtype=np.uint32)
+            chars = np.hstack([chars[:, :1], point, chars[:, 1:]])
+        mantissa = np.ascontiguousarray(chars).view(f"U{chars.shape[1]}").ravel()
+        
+        exponent_text = np.array([f"e{e:+03d}" for e in range(-300, 301)])
+        text = np.strings.add(mantissa, exponent_text[exponents + 300])
+        pieces.append((fast, np.where(np.signbit(data[fast]), np.strings.add("-", text), text)))
+    
+    if not fast.all():
+        text = np.char.mod(f"%.{decimals}e", data[~fast])
+        pieces.append((~fast, np.strings.replace(text, ".", decimal_point) if decimal_point != "." else text))
+    return _merge_pieces(data.shape, pieces)
+
+def format_results(values: ArrayLike, precision: int = None, conventions: Dict = None) -> np.ndarray:
+    """Format many results at once, following the same rules as format_result.
+    
+    precision replaces the 6/6/10 digits format_result uses for scientific,
+    regular and small values. conventions supplies "decimal_point" and
+    "thousands_sep", e.g. an entry of NUMBER_STYLES or locale.localeconv();
+    only regular values are grouped. Returns an array of str.
+    """
+    data = np.asarray(values, dtype=np.float64).ravel()
+    magnitude = np.abs(data)
+    scientific = magnitude >= 1000000
+    small = ~(magnitude >= 1)
+    regular = ~scientific & ~small
+    
+    scientific_digits, regular_digits, small_digits = (6, 6, 10) if precision is None else (precision,) * 3
+    decimal_point = (conventions or {}).get("decimal_point") or "."
+    thousands_sep = (conventions or {}).get("thousands_sep") or ""
+    
+    # Multi-character separators can't go in the digit matrix; restyle afterwards
+    styled_inline = len(decimal_point) == 1 and len(thousands_sep) <= 1
+    style = (decimal_point, thousands_sep) if styled_inline else (".", "")
+    
+    out = _merge_pieces(data.shape, [
+        (scientific, _format_scientific(data[scientific], scientific_digits, style[0])),
+        (regular, _format_fixed(data[regular], regular_digits, *style)),
+        (small, _format_fixed(data[small], small_digits, style[0]))
+    ])
+    
+    if not styled_inline:
+        out = _apply_number_style(out, regular, decimal_point, thousands_sep)
+    return out
+
+class ConversionHistory:
+    """Bounded conversion history kept as a columnar ring buffer.
+    
+    Each column is a fixed-size array and rows are written in append order,
+    so the newest-first view is an index calculation rather than a sort.
+    Once capacity is reached the oldest rows are overwritten. If spill_file
+    is set, every row is also written to SQLite so the full history survives
+    the in-memory cap.
+    """
+    
+    def __init__(self, capacity: int = HISTORY_CAPACITY, spill_file: str = None):
+        self.capacity = capacity
+        self.session_id = uuid.uuid4().hex
+        self._columns = {name: np.empty(capacity, dtype=object) for name in HISTORY_COLUMNS}
+        self._columns["input_value"] = np.empty(capacity, dtype=np.float64)
+        # Rows written to the current buffer, which resize() rewrites, and
+        # conversions recorded this session, which it doesn't
+        self._appended = 0
+        self._total = 0
+        self._spill = None
+        self._spill_lock = threading.Lock()
+        
+        if spill_file:
+            self._spill = sqlite3.connect(spill_file, check_same_thread=False)
+            self._spill.execute(f"""
+                CREATE TABLE IF NOT EXISTS conversion_history (
+                    id INTEGER PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    {", ".join(HISTORY_COLUMNS)}
+                )
+            """)
+            self._spill.execute("CREATE INDEX IF NOT EXISTS idx_history_session ON conversion_history (session_id, id)")
+            self._spill.commit()
+    
+    def __len__(self) -> int:
+        return min(self._appended, self.capacity)
+    
+    @property
+    def total(self) -> int:
+        """Number of conversions recorded, including ones rotated out of memory."""
+        return self._total
+    
+    def append(self, record: Dict) -> None:
+        """Record one conversion, overwriting the oldest row when full."""
+        slot = self._appended % self.capacity
+        for name in HISTORY_COLUMNS:
+            self._columns[name][slot] = record.get(name)
+        self._appended += 1
+        self._total += 1
+        
+        if self._spill is not None:
+            with self._spill_lock:
+                self._spill.execute(
+                    f"INSERT INTO conversion_history (session_id, {', '.join(HISTORY_COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' * len(HISTORY_COLUMNS))})",
+                    [self.session_id] + [record.get(name) for name in HISTORY_COLUMNS]
+                )
+                self._spill.commit()
+    
+    def clear(self) -> None:
+        """Forget every conversion, including spilled rows for this session."""
+        self._appended = 0
+        self._total = 0
+        if self._spill is not None:
+            with self._spill_lock:
+                self._spill.execute("DELETE FROM conversion_history WHERE session_id = ?", (self.session_id,))
+                self._spill.commit()
+    
+    def resize(self, capacity: int) -> None:
+        """Change the cap, keeping the newest rows that still fit."""
+        if capacity == self.capacity:
+            return
+        kept = min(len(self), capacity)
+        positions = self._newest_first_positions(0, kept)[::-1]
+        columns = {}
+        for name, column in self._columns.items():
+            resized = np.empty(capacity, dtype=column.dtype)
+            resized[:kept] = column[positions]
+            columns[name] = resized
+        self._columns = columns
+        self.capacity = capacity
+        self._appended = kept
+    
+    def _newest_first_positions(self, start: int, stop: int) -> np.ndarray:
+        """Buffer positions of rows start..stop counted from the newest."""
+        return (self._appended - 1 - np.arange(start, stop)) % self.capacity
+    
+    def window(self, start: int = 0, count: int = HISTORY_PAGE_SIZE) -> pd.DataFrame:
+        """Newest-first DataFrame of just the rows in [start, start + count)."""
+        stop = min(start + count, len(self))
+        positions = self._newest_first_positions(start, max(start, stop))
+        return pd.DataFrame({name: self._columns[name][positions] for name in HISTORY_COLUMNS})
+    
+    def full_history(self) -> pd.DataFrame:
+        """Every conversion this session, newest first, from the spill file if there is one."""
+        if self._spill is None:
+            return self.window(0, len(self))
+        with self._spill_lock:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(HISTORY_COLUMNS)} FROM conversion_history WHERE session_id = ? ORDER BY id DESC",
+                self._spill,
+                params=(self.session_id,)
+            )
+
 # App structure
 class UnitConverterApp:
     def __init__(self):
@@ -142,7 +533,7 @@ class UnitConverterApp:
     def initialize_session_state(self):
         """Initialize session state variables."""
         if "conversion_history" not in st.session_state:
-            st.session_state.conversion_history = []
+            st.session_state.conversion_history = ConversionHistory(HISTORY_CAPACITY, HISTORY_SPILL_FILE)
         if "dark_mode" not in st.session_state:
             st.session_state.dark_mode = False
             
@@ -164,9 +555,25 @@ class UnitConverterApp:
             source unit, and target unit.
             """)
             
+            cache_info = get_converter.cache_info()
+            st.caption(
+                f"Converter cache: {cache_info.hits} hits, {cache_info.misses} misses, "
+                f"{cache_info.currsize}/{cache_info.maxsize} pairs"
+            )
+            
             st.divider()
+            history_limit = st.number_input(
+                "History Limit",
+                min_value=10,
+                max_value=100000,
+                value=st.session_state.conversion_history.capacity,
+                step=100,
+                help="Most recent conversions kept in memory for this session."
+            )
+            st.session_state.conversion_history.resize(int(history_limit))
+            
             if st.button("Clear History", use_container_width=True):
-                st.session_state.conversion_history = []
+                st.session_state.conversion_history.clear()
                 st.success("Conversion history cleared!")
     
     def apply_dark_mode(self):
@@ -212,6 +619,12 @@ class UnitConverterApp:
             # Get units for the selected conversion type
             available_units = CONVERSION_TYPES[conversion_type]["units"]
             
+            table_mode = st.toggle(
+                "Conversion Table",
+                key="table_mode",
+                help="Show the value converted to every unit in this category."
+            )
+            
             # Unit selection
             from_unit = st.selectbox(
                 "From Unit",
@@ -224,7 +637,8 @@ class UnitConverterApp:
                 "To Unit",
                 options=available_units,
                 index=1 if len(available_units) > 1 else 0,
-                key="to_unit"
+                key="to_unit",
+                disabled=table_mode
             )
             
             # Input value
@@ -236,11 +650,14 @@ class UnitConverterApp:
             )
             
             # Convert button
-            convert_pressed = st.button("Convert", use_container_width=True, type="primary")
+            convert_pressed = st.button("Convert", use_container_width=True, type="primary", disabled=table_mode)
             
         with col2:
             # Results panel
-            st.markdown("### Conversion Result")
+            if table_mode:
+                self.display_conversion_table(conversion_type, from_unit, input_value)
+            else:
+                st.markdown("### Conversion Result")
             
             if convert_pressed:
                 try:
@@ -270,8 +687,8 @@ class UnitConverterApp:
                         else:  # Same unit
                             formula = f"{from_unit} = {to_unit} (No conversion needed)"
                     else:
-                        conversion_factor = CONVERSION_TYPES[conversion_type]["conversions"][from_unit][to_unit]
-                        formula = f"{input_value} {from_unit} × {conversion_factor} = {formatted_result} {to_unit}"
+                        conversion_factor, _ = conversion_coefficients(conversion_type, from_unit, to_unit)
+                        formula = f"{input_value} {from_unit} × {conversion_factor:.10g} = {formatted_result} {to_unit}"
                     
                     st.markdown(f"**Formula:** {formula}")
                     
@@ -332,6 +749,100 @@ class UnitConverterApp:
                     Essential in computing, telecommunications, and data storage.
                     """)
     
+    def display_conversion_table(self, conversion_type: str, from_unit: str, input_value: float):
+        """Display one value converted to every unit of its category."""
+        st.markdown("### Conversion Table")
+        st.write(f"{input_value} {from_unit} is equal to:")
+        
+        results = conversion_table(conversion_type, from_unit, float(input_value))
+        table_df = pd.DataFrame({
+            "Unit": CONVERSION_TYPES[conversion_type]["units"],
+            "Value": format_results(results)
+        })
+        st.dataframe(table_df, use_container_width=True, hide_index=True)
+    
+    def display_batch_interface(self):
+        """Display the batch interface for converting a whole CSV column."""
+        st.markdown("### Batch Conversion")
+        st.write("Upload a CSV file, pick a numeric column and convert every value in it at once.")
+        
+        uploaded_file = st.file_uploader("Upload CSV", type=["csv"], key="batch_file")
+        if uploaded_file is None:
+            return
+        
+        try:
+            data = pd.read_csv(uploaded_file)
+        except Exception as e:
+            st.error(f"Error reading CSV file: {str(e)}")
+            return
+        
+        if data.empty:
+            st.warning("The uploaded file has no rows.")
+            return
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            column = st.selectbox("Column to Convert", options=list(data.columns), key="batch_column")
+            conversion_type = st.selectbox(
+                "Conversion Type",
+                options=list(CONVERSION_TYPES.keys()),
+                key="batch_conversion_type"
+            )
+            available_units = CONVERSION_TYPES[conversion_type]["units"]
+            from_unit = st.selectbox("From Unit", options=available_units, index=0, key="batch_from_unit")
+            to_unit = st.selectbox(
+                "To Unit",
+                options=available_units,
+                index=1 if len(available_units) > 1 else 0,
+                key="batch_to_unit"
+            )
+            add_formatted = st.checkbox("Add formatted column", key="batch_formatted")
+            if add_formatted:
+                number_style = st.selectbox("Number Style", options=list(NUMBER_STYLES.keys()), key="batch_number_style")
+                precision = st.selectbox(
+                    "Decimal Places",
+                    options=["Auto"] + list(range(0, 13)),
+                    key="batch_precision",
+                    help="Auto keeps the converter's usual 6 or 10 places."
+                )
+            convert_pressed = st.button("Convert Column", use_container_width=True, type="primary")
+        
+        with col2:
+            if not convert_pressed:
+                st.dataframe(data.head(20), use_container_width=True)
+                return
+            
+            try:
+                result_column = f"{column} ({to_unit})"
+                data[result_column] = convert_array(data[column], from_unit, to_unit, conversion_type)
+                
+                shown_columns = [column, result_column]
+                if add_formatted:
+                    formatted_column = f"{result_column} formatted"
+                    data[formatted_column] = format_results(
+                        data[result_column],
+                        precision=None if precision == "Auto" else precision,
+                        conventions=NUMBER_STYLES[number_style]
+                    )
+                    shown_columns.append(formatted_column)
+                
+                invalid = int(data[result_column].isna().sum() - data[column].isna().sum())
+                st.success(f"Converted {len(data):,} values from {from_unit} to {to_unit}.")
+                if invalid:
+                    st.warning(f"{invalid:,} values were not numbers and were left empty.")
+                
+                st.dataframe(data[shown_columns].head(20), use_container_width=True)
+                st.download_button(
+                    label="Download Converted CSV",
+                    data=data.to_csv(index=False),
+                    file_name=f"converted_{uploaded_file.name}",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+            except Exception as e:
+                st.error(f"Error performing conversion: {str(e)}")
+    
     def display_history(self):
         """Display the conversion history."""
         st.markdown("### Conversion History")
@@ -340,9 +851,14 @@ class UnitConverterApp:
             st.info("No conversion history available. Make a conversion to see it here.")
             return
         
-        # Create DataFrame from history
-        history_df = pd.DataFrame(st.session_state.conversion_history)
-        history_df = history_df.sort_values(by="timestamp", ascending=False).reset_index(drop=True)
+        history = st.session_state.conversion_history
+        
+        # Only the visible page is turned into a DataFrame
+        page_count = (len(history) - 1) // HISTORY_PAGE_SIZE + 1
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="history_page")
+        history_df = history.window((page - 1) * HISTORY_PAGE_SIZE, HISTORY_PAGE_SIZE)
         
         # Display as table
         st.dataframe(
@@ -358,11 +874,26 @@ class UnitConverterApp:
             use_container_width=True,
             hide_index=True
         )
+        
+        if history.total > len(history):
+            st.caption(f"Showing the latest {len(history):,} of {history.total:,} conversions.")
+        
+        if HISTORY_SPILL_FILE and st.button("Prepare Full History Download"):
+            st.download_button(
+                label="Download Full History",
+                data=history.full_history().to_csv(index=False),
+                file_name="conversion_history.csv",
+                mime="text/csv"
+            )
     
     def run(self):
         """Run the Streamlit app."""
         self.display_header()
-        self.display_converter_interface()
+        single_tab, batch_tab = st.tabs(["Single Value", "Batch (CSV)"])
+        with single_tab:
+            self.display_converter_interface()
+        with batch_tab:
+            self.display_batch_interface()
         st.divider()
         self.display_history()
 
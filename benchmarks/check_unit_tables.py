@@ -0,0 +1,70 @@
+"""Check from→to conversion tables against the unit registry in app.py.
+
+Tables can come from a JSON file shaped like {"Time": {"Week": {"Month": 0.23}}}
+or from the CONVERSION_TYPES matrices of an older app.py in git history:
+
+    python benchmarks/check_unit_tables.py --git-rev bece4aa
+    python benchmarks/check_unit_tables.py --table tables.json --rel-tol 1e-6
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app
+
+
+def load_tables_from_git(rev):
+    """Evaluate the CONVERSION_TYPES literal of app.py at a git revision."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:app.py"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "CONVERSION_TYPES":
+            conversion_types = eval(compile(ast.Expression(node.value), f"{rev}:app.py", "eval"))
+            return {
+                name: category["conversions"]
+                for name, category in conversion_types.items()
+                if "conversions" in category
+            }
+    raise SystemExit(f"No CONVERSION_TYPES table found in app.py at {rev}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--table", help="JSON file of {category: {from: {to: factor}}}")
+    source.add_argument("--git-rev", help="git revision whose app.py holds N×N tables")
+    parser.add_argument("--rel-tol", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    if args.table:
+        with open(args.table) as f:
+            tables = json.load(f)
+    else:
+        tables = load_tables_from_git(args.git_rev)
+
+    mismatches = []
+    for conversion_type, table in tables.items():
+        mismatches.extend(app.check_conversion_table(conversion_type, table, args.rel_tol))
+
+    entries = sum(len(targets) for table in tables.values() for targets in table.values())
+    registry_entries = sum(len(category["units"]) for category in app.UNIT_REGISTRY.values())
+    print(f"checked {entries} table entries against {registry_entries} registry units")
+
+    for m in mismatches:
+        error = abs(m["given"] - m["expected"]) / max(abs(m["expected"]), 1e-300)
+        print(f"{m['conversion_type']:12} {m['from_unit']:>18} -> {m['to_unit']:<18} "
+              f"given {m['given']:<12.6g} expected {m['expected']:<12.6g} ({error:.2%} off)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
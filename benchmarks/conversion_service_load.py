@@ -0,0 +1,141 @@
+"""Load test the headless conversion service.
+
+Starts conversion_service.py on a local port (or targets --host/--port of a
+running one) and drives it with keep-alive connections, each sending POST
+/convert requests back to back. Reports requests per second and latency
+percentiles, plus the server's batching counters.
+
+    python benchmarks/conversion_service_load.py --connections 64 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAIRS = [
+    ("Length", "Mile", "Kilometer"),
+    ("Temperature", "Fahrenheit", "Celsius"),
+    ("Weight", "Pound", "Kilogram"),
+]
+
+
+def build_request(path, payload=None):
+    """Raw HTTP/1.1 request bytes for a keep-alive connection."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    method = "POST" if payload is not None else "GET"
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: localhost\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def read_response(reader):
+    """Read one response and return (status, body bytes)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = next(int(line.split(":", 1)[1]) for line in lines if line.lower().startswith("content-length"))
+    return status, await reader.readexactly(length)
+
+
+async def client(host, port, num_requests, values_per_request, latencies, worker):
+    """Send requests over one keep-alive connection, recording each latency."""
+    reader, writer = await asyncio.open_connection(host, port)
+    conversion_type, from_unit, to_unit = PAIRS[worker % len(PAIRS)]
+    request = build_request("/convert", {
+        "conversion_type": conversion_type,
+        "from_unit": from_unit,
+        "to_unit": to_unit,
+        "values": [float(i) for i in range(values_per_request)]
+    })
+    try:
+        for _ in range(num_requests):
+            start = time.perf_counter()
+            writer.write(request)
+            status, _ = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"Unexpected status {status}")
+    finally:
+        writer.close()
+
+
+async def fetch_json(host, port, path):
+    """GET a JSON endpoint on a fresh connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(build_request(path))
+    _, body = await read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+async def wait_until_ready(host, port, timeout=15.0):
+    """Poll /health until the server answers."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await fetch_json(host, port, "/health")
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run_load(args):
+    await wait_until_ready(args.host, args.port)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, args.requests, args.values, latencies, worker)
+        for worker in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{len(latencies)} requests over {args.connections} connections in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s ({len(latencies) * args.values / elapsed:,.0f} values/s)")
+    print(f"latency: p50 {statistics.median(latencies) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    print(f"server: {await fetch_json(args.host, args.port, '/stats')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="requests per connection")
+    parser.add_argument("--values", type=int, default=1, help="values per request")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0)
+    parser.add_argument("--external", action="store_true", help="don't start a server; use the one at --host/--port")
+    args = parser.parse_args()
+
+    server = None
+    if not args.external:
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "conversion_service.py"),
+             "--host", args.host, "--port", str(args.port),
+             "--batch-window-ms", str(args.batch_window_ms)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    try:
+        asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Microbenchmark the per-call cost of a single unit conversion.
+
+Compares the registry walk convert_value did before compiled converters
+(two lookups and two multiplies through the base unit) with the cached
+path, and with calling a compiled converter directly.
+
+    python benchmarks/converter_cache.py --calls 1000000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+PAIRS = [
+    ("Length", "Mile", "Kilometer"),
+    ("Temperature", "Fahrenheit", "Celsius"),
+    ("Data", "Gigabyte", "Megabyte"),
+    ("Time", "Hour", "Hour"),
+]
+
+
+def registry_convert(value, from_unit, to_unit, conversion_type):
+    """convert_value as it was before compiled converters."""
+    category = app.CONVERSION_TYPES[conversion_type]
+    i = category["unit_ids"][from_unit]
+    j = category["unit_ids"][to_unit]
+    base_value = value * category["factors"][i] + category["offsets"][i]
+    return (base_value - category["offsets"][j]) * category["inverse_factors"][j]
+
+
+def per_call_ns(func, calls):
+    """Best-of-five nanoseconds per call."""
+    return min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'pair':40} {'registry':>10} {'cached':>10} {'compiled':>10}  (ns/call)")
+    for conversion_type, from_unit, to_unit in PAIRS:
+        converter = app.get_converter(conversion_type, from_unit, to_unit)
+        for value in (0.0, 1.0, -40.0, 123.456):
+            assert abs(converter(value) - registry_convert(value, from_unit, to_unit, conversion_type)) <= 1e-9 * max(1.0, abs(value))
+
+        registry = per_call_ns(lambda: registry_convert(12.5, from_unit, to_unit, conversion_type), args.calls)
+        cached = per_call_ns(lambda: app.convert_value(12.5, from_unit, to_unit, conversion_type), args.calls)
+        compiled = per_call_ns(lambda: converter(12.5), args.calls)
+        print(f"{conversion_type + ': ' + from_unit + ' -> ' + to_unit:40} {registry:10.0f} {cached:10.0f} {compiled:10.0f}")
+
+    print(app.get_converter.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark formatting a large batch of conversion results.
+
+Formats the same values with format_result in a loop and with the
+vectorized format_results, checks the two agree, and reports timings.
+
+    python benchmarks/format_results.py --values 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+def sample_values(count, seed):
+    """Conversion-like results spread over the regular, small and scientific ranges."""
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=2.0, sigma=4.0, size=count)
+    values *= np.where(rng.random(count) < 0.1, -1.0, 1.0)
+    return values
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    values = sample_values(args.values, args.seed)
+    magnitude = np.abs(values)
+    print(f"{args.values:,} values: {np.mean(magnitude >= 1e6):.0%} scientific, "
+          f"{np.mean((magnitude >= 1) & (magnitude < 1e6)):.0%} regular, {np.mean(magnitude < 1):.0%} small")
+
+    expected, loop_time = timed(lambda: [app.format_result(value) for value in values.tolist()])
+    formatted, vector_time = timed(lambda: app.format_results(values))
+    mismatches = sum(a != b for a, b in zip(expected, formatted.tolist()))
+    styled, styled_time = timed(lambda: app.format_results(values, precision=3, conventions=app.NUMBER_STYLES["1.234,5"]))
+
+    print(f"format_result loop      {loop_time:8.3f} s")
+    print(f"format_results          {vector_time:8.3f} s  ({loop_time / vector_time:.1f}x, {mismatches} mismatches)")
+    print(f"format_results styled   {styled_time:8.3f} s  (3 places, 1.234,5)")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
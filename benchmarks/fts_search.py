@@ -0,0 +1,158 @@
+"""Benchmark full-text search over a large library.
+
+Seeds a scratch database through init_db() with synthetic books, then times
+search_books() and the library page's calls for a search (count_books() and
+the first get_books_page(), sorted by relevance and by title) for a set of
+two-word prefix queries. Also checks that progress updates leave the FTS
+index alone while title edits re-index the book. Exits non-zero if any
+median is over --target-ms.
+
+    python benchmarks/fts_search.py --books 100000 --queries 200
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import personal_library_manager as plm
+
+
+def make_vocabulary(size, rng):
+    """Pronounceable pseudo-words, so prefixes are shared the way real words share them."""
+    syllables = [
+        "ka", "lo", "mi", "ren", "sa", "tor", "vel", "an", "dri", "gen", "ho", "ul", "bre", "cas",
+        "fi", "ston", "par", "el", "win", "mor", "ta", "nes", "grim", "o", "li", "ber", "shan", "qui",
+        "de", "ru", "phos", "ith", "cal", "wen", "zo", "mar", "ny", "ex", "tha", "bo",
+    ]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class TextGenerator:
+    """Draws words with Zipf-like frequencies, as in natural text."""
+
+    def __init__(self, vocabulary, rng):
+        self.words = list(vocabulary)
+        rng.shuffle(self.words)
+        self.cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+        self.rng = rng
+
+    def __call__(self, count):
+        return " ".join(self.rng.choices(self.words, cum_weights=self.cum_weights, k=count))
+
+
+def seed_library(num_books, text):
+    """Fill the benchmark database with synthetic books in batches."""
+    statuses = ["Unread", "Reading", "Completed", "On Hold", "Abandoned", "Wishlist"]
+    for start in range(0, num_books, 10000):
+        with plm.db_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO books (title, author, status, pages, current_page, description, notes, tags, date_added)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (text(3).title(), text(2).title(), statuses[i % len(statuses)], 300, 0,
+                     text(25), text(8), ", ".join(text(2).split()), "2024-01-01")
+                    for i in range(start, min(num_books, start + 10000))
+                ],
+            )
+
+
+def fts_changes(sql, params):
+    """Rows written by a statement including its triggers; FTS inserts show up here."""
+    with plm.db_connection() as conn:
+        before = conn.execute("SELECT total_changes()").fetchone()[0]
+        conn.execute(sql, params)
+        return conn.execute("SELECT total_changes()").fetchone()[0] - before
+
+
+def time_ms(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<26} median {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms   max {timings[-1]:7.2f} ms")
+
+
+def library_page(filters, sort_by, page_size):
+    """The calls the library page makes for a search: the total, then the first page."""
+    total = plm.count_books(filters)
+    plm.get_books_page(filters, sort_by, True, page_size, None)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plm.DB_FILE = os.path.join(tmp, "fts_bench.db")
+        plm.init_db()
+        start = time.perf_counter()
+        seed_library(args.books, TextGenerator(vocabulary, rng))
+        print(f"seeded {args.books} books in {time.perf_counter() - start:.1f}s")
+
+        # Two words from a random book's title, each typed as a 3-6 letter
+        # prefix, the way someone looks up a book they have in mind
+        book_ids = rng.sample(range(1, args.books + 1), min(args.queries, args.books))
+        with plm.db_connection() as conn:
+            titles = [
+                conn.execute("SELECT title FROM books WHERE id = ?", (book_id,)).fetchone()[0]
+                for book_id in book_ids
+            ]
+        queries = [
+            " ".join(word[:rng.randint(3, 6)] for word in rng.sample(title.split(), 2))
+            for title in titles
+        ]
+        search_times, matches = [], []
+        page_times = {"relevance": [], "title": []}
+        for query in queries:
+            elapsed, _ = time_ms(plm.search_books, query)
+            search_times.append(elapsed)
+            for sort_by, timings in page_times.items():
+                elapsed, total = time_ms(library_page, {"search": query}, sort_by, args.page_size)
+                timings.append(elapsed)
+            matches.append(total)
+
+        print(f"{len(queries)} two-word prefix queries, median {statistics.median(matches):.0f} "
+              f"and max {max(matches)} matching books")
+        report("search_books()", search_times)
+        for sort_by, timings in page_times.items():
+            report(f"library page ({sort_by})", timings)
+
+        progress = fts_changes("UPDATE books SET current_page = current_page + 10 WHERE id = ?", (1,))
+        retitle = fts_changes("UPDATE books SET title = ? WHERE id = ?", ("Renamed Book", 1))
+        print(f"rows written: {progress} for a progress update, {retitle} for a title edit")
+        reindexed = plm.search_books("renamed")
+
+        plm.get_connection_pool(plm.DB_FILE).close_all()
+
+    medians = [statistics.median(timings) for timings in [search_times, *page_times.values()]]
+    ok = max(medians) <= args.target_ms and progress == 1 and retitle > 1 and reindexed
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Check the pre-generated challenge pool in growth_mindai.py.
+
+Imports the app in Streamlit's bare mode and fills a ChallengePool with a
+slow stub generator, checking that refills only start below the watermark
+and that generation never outruns the token bucket. Then seeds a pool file
+and clicks "Generate Today's Challenge" through AppTest with the fake model,
+comparing pooled click latency with a live model call.
+
+    python benchmarks/growth_challenge_pool.py --model-latency 2.0
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import growth_fakes
+
+
+def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-latency", type=float, default=2.0)
+    parser.add_argument("--rate", type=float, default=10.0, help="stub generations per second")
+    parser.add_argument("--burst", type=int, default=2)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    growth_fakes.install()
+    import growth_mindai
+
+    started = []
+    lock = threading.Lock()
+
+    def generate(focus):
+        with lock:
+            started.append(time.monotonic())
+        time.sleep(0.01)
+        return f"{focus} challenge #{len(started)}"
+
+    pool = growth_mindai.ChallengePool(
+        generate, db_path=os.path.join(workdir, "stub_pool.db"), focuses=["Career", "Health"],
+        target=6, low_watermark=3, rate=args.rate, burst=args.burst
+    )
+    filled = wait_for(lambda: pool.size("Career") == 6 and pool.size("Health") == 6, 30)
+    window = max(sum(1 for t in started if start <= t < start + 1.0) for start in started)
+    print(f"filled 2 x 6 in {started[-1] - started[0]:.2f}s; busiest second had {window} generations "
+          f"(limit {args.rate:g}/s + burst {args.burst})")
+    ok = filled and window <= args.rate + args.burst
+
+    generated = len(started)
+    pool.take("Career")
+    pool.take("Career")
+    time.sleep(0.5)
+    above = len(started) - generated
+    pool.take("Career")
+    pool.take("Career")
+    refilled = wait_for(lambda: pool.size("Career") == 6, 10)
+    print(f"2 takes above the watermark triggered {above} generations; "
+          f"dropping below it refilled to {pool.size('Career')}")
+    ok &= above == 0 and refilled
+
+    # Seed the app's pool file, then let the app serve from it
+    db_path = os.path.join(workdir, "app_pool.db")
+    seed = growth_mindai.ChallengePool(
+        generate, db_path=db_path, focuses=["Career"], target=5, low_watermark=5, rate=1000, burst=5
+    )
+    seeded = wait_for(lambda: seed.size("Career") == 5, 10)
+    os.environ["GROWTH_CHALLENGE_POOL_DB"] = db_path
+    growth_fakes.LATENCY["model"] = args.model_latency
+    at = growth_fakes.app_test()
+    at.run()
+    at.sidebar.text_input[0].set_value("pool@example.com")
+    at.run()
+
+    at.button[0].click()
+    start = time.perf_counter()
+    at.run()
+    pooled = time.perf_counter() - start
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+    served = any("Career challenge #" in markdown.value for markdown in at.main.markdown)
+    print(f"pooled click: {pooled * 1000:.0f} ms (a live call takes {args.model_latency * 1000:.0f} ms); "
+          f"served from pool: {served}")
+    ok &= seeded and served and pooled < args.model_latency / 4
+
+    background = wait_for(lambda: growth_fakes.STATS["model_calls"] > 0, args.model_latency * 3)
+    print(f"background refill reached the fake model: {background}")
+    ok &= background
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""In-process fakes of the services growth_mindai.py talks to.
+
+install() registers stand-ins for firebase_admin, google.generativeai and
+stripe in sys.modules so the app can be driven through Streamlit's AppTest
+without credentials or network. Every fake counts its calls in STATS and
+can sleep to simulate latency.
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+import types
+from collections import Counter
+
+STATS = Counter()
+DELETE_FIELD = object()
+LATENCY = {"init": 0.0, "firestore": 0.0, "model": 0.0}
+
+SECRETS = {
+    "firebase": {"type": "service_account", "project_id": "local-fake"},
+    "GEMINI_API_KEY": "fake-gemini-key",
+    "STRIPE_API_KEY": "fake-stripe-key",
+}
+
+
+def _sleep(kind):
+    if LATENCY[kind]:
+        time.sleep(LATENCY[kind])
+
+
+# --- Firestore -------------------------------------------------------------
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+
+class DocumentReference:
+    def __init__(self, store, path):
+        self._store = store
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return CollectionReference(self._store, f"{self.path}/{name}")
+
+    def get(self):
+        _sleep("firestore")
+        STATS["firestore_reads"] += 1
+        STATS["firestore_document_reads"] += 1
+        with self._store.lock:
+            return DocumentSnapshot(self, self._store.documents.get(self.path))
+
+    def set(self, data, merge=False):
+        _sleep("firestore")
+        STATS["firestore_writes"] += 1
+        self._store.write(self.path, dict(data), merge)
+
+    def update(self, fields):
+        _sleep("firestore")
+        STATS["firestore_writes"] += 1
+        self._store.write(self.path, dict(fields), True)
+
+    def delete(self):
+        _sleep("firestore")
+        STATS["firestore_writes"] += 1
+        self._store.write(self.path, None, False)
+
+    def on_snapshot(self, callback):
+        return self._store.watch(self, callback)
+
+
+class Query:
+    def __init__(self, store, path, filters=(), order=(), cursor=None, max_results=None):
+        self._store = store
+        self._path = path
+        self._filters = list(filters)
+        self._order = list(order)
+        self._cursor = cursor
+        self._limit = max_results
+
+    def _copy(self, **changes):
+        state = dict(filters=self._filters, order=self._order, cursor=self._cursor, max_results=self._limit)
+        state.update(changes)
+        return Query(self._store, self._path, **state)
+
+    def where(self, field_path=None, op_string=None, value=None, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + [(field_path, op_string, value)])
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._copy(order=self._order + [(field_path, direction)])
+
+    def start_after(self, document):
+        values = document.to_dict() if isinstance(document, DocumentSnapshot) else document
+        return self._copy(cursor=[values.get(field) for field, _ in self._order])
+
+    def limit(self, count):
+        return self._copy(max_results=count)
+
+    def stream(self):
+        _sleep("firestore")
+        prefix = self._path + "/"
+        with self._store.lock:
+            rows = [
+                (path, data) for path, data in self._store.documents.items()
+                if path.startswith(prefix) and "/" not in path[len(prefix):]
+            ]
+        ops = {
+            "==": lambda a, b: a == b, "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+            ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+        }
+        rows = [
+            (path, data) for path, data in rows
+            if all(field in data and ops[op](data[field], value) for field, op, value in self._filters)
+        ]
+        for field, direction in reversed(self._order):
+            rows.sort(key=lambda row: row[1].get(field), reverse=direction == "DESCENDING")
+        if self._cursor is not None:
+            key = [(field, direction) for field, direction in self._order]
+
+            def after(data):
+                for (field, direction), cursor_value in zip(key, self._cursor):
+                    value = data.get(field)
+                    if value != cursor_value:
+                        return value < cursor_value if direction == "DESCENDING" else value > cursor_value
+                return False
+
+            rows = [row for row in rows if after(row[1])]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        STATS["firestore_reads"] += max(1, len(rows))
+        for path, data in rows:
+            yield DocumentSnapshot(DocumentReference(self._store, path), dict(data))
+
+    def get(self):
+        return list(self.stream())
+
+
+class CollectionReference(Query):
+    def __init__(self, store, path):
+        super().__init__(store, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id=None):
+        if document_id is None:
+            document_id = f"auto{next(self._store.ids):08d}"
+        return DocumentReference(self._store, f"{self._path}/{document_id}")
+
+
+class WriteBatch:
+    def __init__(self, store):
+        self._store = store
+        self._writes = []
+
+    def set(self, reference, data, merge=False):
+        self._writes.append((reference.path, dict(data), merge))
+
+    def update(self, reference, fields):
+        self._writes.append((reference.path, dict(fields), True))
+
+    def delete(self, reference):
+        self._writes.append((reference.path, None, False))
+
+    def commit(self):
+        _sleep("firestore")
+        STATS["firestore_batches"] += 1
+        STATS["firestore_writes"] += len(self._writes)
+        for path, data, merge in self._writes:
+            self._store.write(path, data, merge)
+        self._writes = []
+
+
+class Watch:
+    def __init__(self, store, reference, callback):
+        self._store = store
+        self.reference = reference
+        self.callback = callback
+
+    def unsubscribe(self):
+        with self._store.lock:
+            self._store.watches.discard(self)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.documents = {}
+        self.watches = set()
+        self.lock = threading.RLock()
+        self.ids = itertools.count()
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def write(self, path, data, merge):
+        with self.lock:
+            if data is None:
+                self.documents.pop(path, None)
+            elif merge and path in self.documents:
+                self.documents[path].update(data)
+            else:
+                self.documents[path] = data
+            if data is not None:
+                document = self.documents[path]
+                for key in [key for key, value in document.items() if value is DELETE_FIELD]:
+                    del document[key]
+            STATS["firestore_bytes_written"] += len(repr(data))
+            watches = [watch for watch in self.watches if watch.reference.path == path]
+        for watch in watches:
+            snapshot = DocumentSnapshot(watch.reference, self.documents.get(path))
+            watch.callback([snapshot], [], datetime_now())
+
+    def watch(self, reference, callback):
+        watch = Watch(self, reference, callback)
+        with self.lock:
+            self.watches.add(watch)
+        callback([DocumentSnapshot(reference, self.documents.get(reference.path))], [], datetime_now())
+        return watch
+
+
+def datetime_now():
+    from datetime import datetime, timezone
+    return datetime.now(timezone.utc)
+
+
+class FieldFilter:
+    def __init__(self, field_path, op_string, value):
+        self.field_path = field_path
+        self.op_string = op_string
+        self.value = value
+
+
+# --- Gemini ----------------------------------------------------------------
+
+class UsageMetadata:
+    def __init__(self, prompt_tokens, completion_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = completion_tokens
+        self.total_token_count = prompt_tokens + completion_tokens
+
+
+class GenerateContentResponse:
+    def __init__(self, chunks, prompt):
+        self._chunks = chunks
+        self.usage_metadata = UsageMetadata(len(prompt.split()), sum(len(c.split()) for c in chunks))
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            time.sleep(LATENCY["model"] / max(1, len(self._chunks)))
+            yield types.SimpleNamespace(text=chunk, usage_metadata=self.usage_metadata)
+
+
+class GenerativeModel:
+    def __init__(self, model_name, **kwargs):
+        _sleep("init")
+        STATS["gemini_models"] += 1
+        self.model_name = model_name
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        STATS["model_calls"] += 1
+        text = f"Fake answer #{STATS['model_calls']} to: {prompt.splitlines()[-1][:80]}"
+        chunks = [word + " " for word in text.split()]
+        if stream:
+            return GenerateContentResponse(chunks, prompt)
+        _sleep("model")
+        return GenerateContentResponse(chunks, prompt)
+
+    def count_tokens(self, contents):
+        return types.SimpleNamespace(total_tokens=len(str(contents).split()))
+
+
+# --- install ---------------------------------------------------------------
+
+def install():
+    """Register the fakes in sys.modules and reset their counters."""
+    STATS.clear()
+
+    firebase_admin = types.ModuleType("firebase_admin")
+    firebase_admin._apps = {}
+
+    def initialize_app(credential=None, options=None):
+        _sleep("init")
+        STATS["firebase_apps"] += 1
+        firebase_admin._apps["[DEFAULT]"] = credential
+
+    firebase_admin.initialize_app = initialize_app
+
+    credentials = types.ModuleType("firebase_admin.credentials")
+    credentials.Certificate = lambda info: ("certificate", dict(info))
+
+    store = FakeFirestore()
+    firestore = types.ModuleType("firebase_admin.firestore")
+    firestore.Query = types.SimpleNamespace(ASCENDING="ASCENDING", DESCENDING="DESCENDING")
+    firestore.FieldFilter = FieldFilter
+    firestore.SERVER_TIMESTAMP = "SERVER_TIMESTAMP"
+    firestore.DELETE_FIELD = DELETE_FIELD
+
+    def client():
+        _sleep("init")
+        STATS["firestore_clients"] += 1
+        return store
+
+    firestore.client = client
+    firebase_admin.credentials = credentials
+    firebase_admin.firestore = firestore
+
+    # google is a namespace package shared with protobuf; only add to it
+    try:
+        import google
+    except ImportError:
+        google = types.ModuleType("google")
+        google.__path__ = []
+        sys.modules["google"] = google
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda api_key=None, **kwargs: STATS.update(["gemini_configures"])
+    genai.GenerativeModel = GenerativeModel
+    google.generativeai = genai
+
+    stripe = types.ModuleType("stripe")
+    stripe.api_key = None
+
+    def create_session(**kwargs):
+        STATS["stripe_sessions"] += 1
+        return types.SimpleNamespace(url="https://checkout.stripe.test/session")
+
+    stripe.checkout = types.SimpleNamespace(Session=types.SimpleNamespace(create=create_session))
+
+    sys.modules.update({
+        "firebase_admin": firebase_admin,
+        "firebase_admin.credentials": credentials,
+        "firebase_admin.firestore": firestore,
+        "google.generativeai": genai,
+        "stripe": stripe,
+    })
+    return store
+
+
+def app_test(timeout=30):
+    """An AppTest for growth_mindai.py with fake secrets filled in."""
+    from streamlit.testing.v1 import AppTest
+
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "growth_mindai.py")
+    at = AppTest.from_file(path, default_timeout=timeout)
+    for key, value in SECRETS.items():
+        at.secrets[key] = value
+    return at
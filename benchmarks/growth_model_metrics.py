@@ -0,0 +1,103 @@
+"""Check model usage metrics and token budgets in growth_mindai.py.
+
+Imports the app in Streamlit's bare mode and drives GrowthCoach with the fake
+model: checks that blocking and streamed calls record tokens and latency per
+agent, that failures count as errors, and that a user is refused once their
+daily budget is used up while cached answers stay free. Then runs the app
+through AppTest with the metrics endpoint enabled, scrapes /metrics and
+opens the admin panel.
+
+    python benchmarks/growth_model_metrics.py --budget 60 --port 9464
+"""
+import argparse
+import os
+import re
+import sys
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import growth_fakes
+
+SAMPLE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? [0-9.e+-]+$')
+
+
+class FailingModel:
+    def generate_content(self, prompt, stream=False):
+        raise RuntimeError("quota exceeded")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=int, default=60, help="tokens per user per day")
+    parser.add_argument("--port", type=int, default=9464)
+    args = parser.parse_args()
+
+    growth_fakes.install()
+    import growth_mindai
+
+    metrics = growth_mindai.ModelMetrics()
+    cache = growth_mindai.ResponseCache(db_path=None)
+    coach = growth_mindai.GrowthCoach(
+        model=growth_fakes.GenerativeModel("fake"), cache=cache, metrics=metrics,
+        user="budget@example.com", token_budget=args.budget
+    )
+
+    answered = 0
+    refused = None
+    while refused is None and answered < 100:
+        try:
+            coach.generate_response("analyst", f"User asked: question {answered}")
+            answered += 1
+        except growth_mindai.TokenBudgetExceeded as e:
+            refused = str(e)
+    used = metrics.tokens_used("budget@example.com")
+    cached = coach.generate_response("analyst", "User asked: question 0")
+    print(f"budget {args.budget}: {answered} answers ({used} tokens) before refusal: {refused!r}")
+    print(f"cached answer still served after the budget ran out: {bool(cached)}")
+    ok = refused is not None and used >= args.budget and bool(cached)
+
+    streamer = growth_mindai.GrowthCoach(model=growth_fakes.GenerativeModel("fake"), cache=cache, metrics=metrics)
+    "".join(streamer.stream_response("mentor", "User asked: streamed"))
+    failing = growth_mindai.GrowthCoach(model=FailingModel(), cache=cache, metrics=metrics)
+    try:
+        failing.generate_response("motivator", "User asked: will this fail?")
+    except RuntimeError:
+        pass
+    rows = {row["agent"]: row for row in metrics.agent_rows()}
+    for row in rows.values():
+        print("agent:", row)
+    ok &= rows["mentor"]["completion_tokens"] > 0 and rows["motivator"]["error_rate"] == 1.0
+    ok &= metrics.budget_rejections == 1
+
+    os.environ["GROWTH_METRICS_PORT"] = str(args.port)
+    at = growth_fakes.app_test()
+    at.secrets["ADMIN_EMAILS"] = ["admin@example.com"]
+    at.run()
+    at.sidebar.text_input[0].set_value("admin@example.com")
+    at.main.text_input[0].set_value("What should I focus on?")
+    at.run()
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/metrics") as response:
+        content_type = response.headers["Content-Type"]
+        text = response.read().decode("utf-8")
+    samples = [line for line in text.splitlines() if line and not line.startswith("#")]
+    malformed = [line for line in samples if not SAMPLE.match(line)]
+    print(f"/metrics ({content_type}): {len(samples)} samples, {len(malformed)} malformed")
+    print("\n".join(line for line in samples if 'agent="analyst"' in line and "bucket" not in line))
+    ok &= bool(samples) and not malformed and 'growth_model_calls_total{agent="analyst"} 1' in text
+
+    admin = [expander for expander in at.sidebar.expander if expander.label == "Admin: Model Usage"]
+    print(f"admin panel shown: {bool(admin)}; tokens caption: "
+          f"{next(c.value for c in at.sidebar.caption if c.value.startswith('AI tokens'))}")
+    ok &= bool(admin) and bool(admin[0].table)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Check the coaching panel in growth_mindai.py with per-agent model latency.
+
+Imports the app in Streamlit's bare mode and runs GrowthCoach.panel against a
+stub model that sleeps a different time for each agent persona. Checks that
+the panel takes about as long as its slowest agent, that results arrive in
+completion order, that an agent past the timeout yields an error without
+holding up the rest, and that the concurrency limit is respected, also by
+calls that are still running after their timeout. Then runs
+the panel in the AI Coaching tab through AppTest.
+
+    python benchmarks/growth_panel.py --latencies analyst=0.4,motivator=0.8,mentor=1.2,planner=0.2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import growth_fakes
+
+
+class LatencyModel:
+    """Stub model whose latency depends on which agent persona the prompt starts with."""
+
+    def __init__(self, personas, latencies):
+        self.personas = personas
+        self.latencies = latencies
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        agent = next(name for name, persona in self.personas.items() if prompt.startswith(persona))
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latencies[agent])
+        finally:
+            with self._lock:
+                self.active -= 1
+        return types.SimpleNamespace(text=f"{agent} says: keep going")
+
+
+def run_panel(coach, prompt, **kwargs):
+    async def collect():
+        return [result async for result in coach.panel(prompt, **kwargs)]
+
+    start = time.perf_counter()
+    results = asyncio.run(collect())
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latencies", default="analyst=0.4,motivator=0.8,mentor=1.2,planner=0.2")
+    args = parser.parse_args()
+    latencies = {name: float(value) for name, value in (pair.split("=") for pair in args.latencies.split(","))}
+
+    growth_fakes.install()
+    import growth_mindai
+
+    def new_coach():
+        coach = growth_mindai.GrowthCoach(cache=growth_mindai.ResponseCache(db_path=None))
+        coach.model = LatencyModel(coach.agents, latencies)
+        return coach
+
+    slowest, total = max(latencies.values()), sum(latencies.values())
+    ok = True
+
+    results, elapsed = run_panel(new_coach(), "User asked: what next?")
+    order = [result["agent"] for result in results]
+    print(f"{len(results)} agents in {elapsed:.2f}s (slowest {slowest:.2f}s, sequential {total:.2f}s); "
+          f"completion order {order}")
+    ok &= elapsed < slowest + 0.3 and order == sorted(latencies, key=latencies.get)
+    ok &= all(result["response"] for result in results)
+
+    timeout = (sorted(latencies.values())[-2] + slowest) / 2
+    results, elapsed = run_panel(new_coach(), "User asked: and then?", timeout=timeout)
+    errors = {result["agent"]: result["error"] for result in results if result["error"]}
+    print(f"timeout {timeout:.2f}s: finished in {elapsed:.2f}s, errors {errors}")
+    ok &= len(errors) == 1 and elapsed < (timeout + slowest) / 2
+
+    coach = new_coach()
+    results, elapsed = run_panel(coach, "User asked: one at a time?", concurrency=2)
+    print(f"concurrency 2: peak {coach.model.peak} calls in flight, {elapsed:.2f}s")
+    ok &= coach.model.peak == 2
+
+    # Timed-out calls keep running in their threads and must keep their slots
+    coach = new_coach()
+    timeout = min(latencies.values()) / 2
+    results, elapsed = run_panel(coach, "User asked: too slow?", timeout=timeout, concurrency=2)
+    errors = [result for result in results if result["error"]]
+    print(f"timeout {timeout:.2f}s, concurrency 2: {len(errors)} errors, peak {coach.model.peak} calls in flight")
+    ok &= len(errors) == len(latencies) and coach.model.peak == 2
+
+    growth_fakes.LATENCY["model"] = 0.5
+    store = growth_fakes.install()
+    store.documents["users/panel@example.com"] = {"premium": True}
+    at = growth_fakes.app_test()
+    at.run()
+    at.sidebar.text_input[0].set_value("panel@example.com")
+    at.run()
+    at.main.toggle[0].set_value(True)
+    at.main.text_input[0].set_value("How do I keep momentum?")
+    at.run()
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+    captions = [caption.value for caption in at.main.caption if caption.value.startswith("Panel answered")]
+    print("AI Coaching tab:", captions[0] if captions else "panel did not render",
+          f"({growth_fakes.STATS['model_calls']} model calls)")
+    ok &= bool(captions) and growth_fakes.STATS["model_calls"] == 3
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Check the user profile cache in growth_mindai.py against the local fakes.
+
+Reruns the app for a few users with simulated Firestore latency, then
+changes a profile behind the app's back (as another instance would) and
+checks that the snapshot listener delivered it without a fresh read.
+Prints the cache counters and how many Firestore document reads happened.
+
+    python benchmarks/growth_profile_cache.py --reruns 50 --firestore-latency 0.05
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import growth_fakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--firestore-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    store = growth_fakes.install()
+    growth_fakes.LATENCY["firestore"] = args.firestore_latency
+
+    at = growth_fakes.app_test()
+    at.run()
+
+    start = time.perf_counter()
+    for i in range(args.reruns):
+        at.sidebar.text_input[0].set_value(f"user{i % args.users}@example.com")
+        at.run()
+    elapsed = time.perf_counter() - start
+    reads_before_push = growth_fakes.STATS["firestore_document_reads"]
+
+    # Another app instance upgrades user0; the listener should push it in
+    store.collection("users").document("user0@example.com").set({"progress": {}, "premium": True})
+    at.sidebar.text_input[0].set_value("user0@example.com")
+    at.run()
+
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+    premium_seen = any("Premium features unlocked" in success.value for success in at.success)
+    print(f"{args.reruns} reruns over {args.users} users in {elapsed:.2f}s")
+    print(f"Firestore document reads: {reads_before_push} before the external write, "
+          f"{growth_fakes.STATS['firestore_document_reads'] - reads_before_push} after")
+    print(f"external premium upgrade visible without a re-read: {premium_seen}")
+    for element in at.sidebar.json:
+        print("cache:", element.value)
+
+    sys.exit(0 if premium_seen and reads_before_push <= args.users else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Check the progress subcollection and write-behind queue in growth_mindai.py.
+
+Seeds a user whose profile still embeds a large progress dict, loads the app
+so the migration moves it into users/{email}/progress, then generates a run
+of challenges and checks that each one costs a small, constant-size write
+instead of rewriting the whole profile. Finally pages through the Progress
+Hub and filters it by date, counting the documents each page reads, and
+checks that a rerun that doesn't change the page reads nothing.
+
+    python benchmarks/growth_progress.py --seed 500 --challenges 20
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import growth_fakes
+
+EMAIL = "progress@example.com"
+
+
+def progress_docs(store):
+    prefix = f"users/{EMAIL}/progress/"
+    return {path: data for path, data in store.documents.items() if path.startswith(prefix)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=500, help="embedded entries to migrate")
+    parser.add_argument("--challenges", type=int, default=20)
+    parser.add_argument("--wait", type=float, default=3.0, help="seconds to let the writer flush")
+    args = parser.parse_args()
+
+    store = growth_fakes.install()
+    start = datetime(2024, 1, 1)
+    store.documents[f"users/{EMAIL}"] = {
+        "premium": False,
+        "progress": {
+            str(start + timedelta(days=i)): f"Seeded challenge {i} " + "x" * 200
+            for i in range(args.seed)
+        }
+    }
+    profile_bytes = len(repr(store.documents[f"users/{EMAIL}"]))
+
+    at = growth_fakes.app_test()
+    at.run()
+    at.sidebar.text_input[0].set_value(EMAIL)
+    at.run()
+
+    migrated = progress_docs(store)
+    profile = store.documents[f"users/{EMAIL}"]
+    print(f"migrated {len(migrated)} of {args.seed} embedded entries; "
+          f"profile fields now {sorted(profile)}")
+
+    writes_before = growth_fakes.STATS["firestore_writes"]
+    bytes_before = growth_fakes.STATS["firestore_bytes_written"]
+    for _ in range(args.challenges):
+        at.button[0].click()
+        at.run()
+    # Only the new challenges have a focus in their label
+    queued_visible = sum("·" in expander.label for expander in at.main.expander)
+    first_page = len(at.main.expander)
+
+    time.sleep(args.wait)
+    at.run()
+
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+    writes = growth_fakes.STATS["firestore_writes"] - writes_before
+    written = growth_fakes.STATS["firestore_bytes_written"] - bytes_before
+    total = len(progress_docs(store))
+    print(f"{args.challenges} challenges -> {writes} document writes in "
+          f"{growth_fakes.STATS['firestore_batches']} batches, {written / max(1, writes):,.0f} bytes each "
+          f"(an embedded rewrite would be over {profile_bytes:,} bytes)")
+    print(f"new challenges on the first page before the flush: {queued_visible}; {total} documents stored")
+
+    seen = 0
+    seeded = set()
+    pages = 0
+    reads = []
+    while True:
+        pages += 1
+        seen += len(at.main.expander)
+        seeded.update(e.markdown[0].value for e in at.main.expander if e.markdown[0].value.startswith("Seeded"))
+        older = next(button for button in at.main.button if button.label == "Older")
+        if older.disabled:
+            break
+        reads_before = growth_fakes.STATS["firestore_reads"]
+        older.click()
+        at.run()
+        reads.append(growth_fakes.STATS["firestore_reads"] - reads_before)
+    print(f"paged through {seen} entries ({len(seeded)} distinct seeded) in {pages} pages "
+          f"of {first_page}; at most {max(reads)} document reads per page")
+
+    at.date_input[0].set_value((date(2024, 1, 5), date(2024, 1, 14)))
+    at.run()
+    in_range = len(at.main.expander)
+    print(f"2024-01-05 to 2024-01-14: {in_range} entries")
+
+    # A rerun for a widget elsewhere in the app keeps the page it has
+    reads_before = growth_fakes.STATS["firestore_reads"]
+    at.run()
+    rerun_reads = growth_fakes.STATS["firestore_reads"] - reads_before
+    print(f"rerun without changing the page: {rerun_reads} document reads")
+
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+    ok = (len(migrated) == args.seed and "progress" not in profile
+          and total == args.seed + args.challenges and writes == args.challenges
+          and queued_visible == min(args.challenges, first_page)
+          and seen == total and len(seeded) == args.seed
+          and max(reads) <= first_page + 1 and in_range == 10 and rerun_reads == 0)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Check the model response cache in growth_mindai.py against the local fakes.
+
+Generates the same daily challenge repeatedly, then from several threads at
+once while the fake model is slow, and finally after dropping the in-memory
+cache so only the SQLite tier can answer. Prints model calls, wall time and
+the cache's hit-rate counters.
+
+    python benchmarks/growth_response_cache.py --repeats 20 --sessions 8 --model-latency 1.0
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import growth_fakes
+
+
+def generate(at, focus):
+    at.selectbox[0].set_value(focus)
+    at.button[0].click()
+    at.run()
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+
+def session(email):
+    at = growth_fakes.app_test()
+    at.run()
+    at.sidebar.text_input[0].set_value(email)
+    at.run()
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--model-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "responses.db")
+    os.environ["GROWTH_RESPONSE_CACHE_DB"] = db_path
+    growth_fakes.install()
+    growth_fakes.LATENCY["model"] = args.model_latency
+    ok = True
+
+    at = session("repeat@example.com")
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        generate(at, "Career")
+    elapsed = time.perf_counter() - start
+    calls = growth_fakes.STATS["model_calls"]
+    print(f"{args.repeats} identical challenges: {calls} model call(s) in {elapsed:.2f}s")
+    ok &= calls == 1
+
+    # Concurrent AppTest runs race in CPython 3.11's ast.parse, so the
+    # overlapping requests go straight to GrowthCoach in bare mode instead
+    sys.path.insert(0, ROOT)
+    import growth_mindai
+    coach = growth_mindai.GrowthCoach(
+        model=growth_fakes.GenerativeModel("fake"), cache=growth_mindai.ResponseCache(db_path=None)
+    )
+    prompt = growth_mindai.challenge_prompt("Health")
+    threads = [
+        threading.Thread(target=coach.generate_response, args=("planner", prompt))
+        for _ in range(args.sessions)
+    ]
+    calls = growth_fakes.STATS["model_calls"]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    calls = growth_fakes.STATS["model_calls"] - calls
+    print(f"{args.sessions} concurrent identical challenges: {calls} model call(s) in {elapsed:.2f}s")
+    print("cache:", coach.cache.stats())
+    ok &= calls == 1
+
+    # A restart loses the memory tier; the SQLite tier should still answer
+    import streamlit as st
+    st.cache_resource.clear()
+    calls = growth_fakes.STATS["model_calls"]
+    at = session("restart@example.com")
+    generate(at, "Career")
+    calls = growth_fakes.STATS["model_calls"] - calls
+    print(f"after clearing the memory tier: {calls} model call(s)")
+    ok &= calls == 0
+
+    print("cache:", next(element.value for element in at.sidebar.json if "hit_rate" in element.value))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
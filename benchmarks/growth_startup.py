@@ -0,0 +1,62 @@
+"""Report growth_mindai.py start-up cost and check clients are built once.
+
+Runs the app through Streamlit's AppTest against the local fakes in
+growth_fakes.py, with simulated client initialization latency, then
+reruns it several times as a user would by interacting. Prints the
+per-client import/init timings the app records, the wall time of the
+first and later reruns, and fails if any client was constructed more
+than once.
+
+    python benchmarks/growth_startup.py --reruns 10 --init-latency 0.2
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import growth_fakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--init-latency", type=float, default=0.2, help="seconds each fake client takes to build")
+    args = parser.parse_args()
+
+    growth_fakes.install()
+    growth_fakes.LATENCY["init"] = args.init_latency
+
+    at = growth_fakes.app_test()
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+
+    rerun_times = []
+    for i in range(args.reruns):
+        at.sidebar.text_input[0].set_value(f"user{i % 2}@example.com")
+        at.main.text_input[0].set_value(f"How do I keep going? ({i})")
+        start = time.perf_counter()
+        at.run()
+        rerun_times.append(time.perf_counter() - start)
+
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+
+    print(f"first run {first * 1000:.0f} ms, later reruns median {statistics.median(rerun_times) * 1000:.0f} ms")
+    for table in at.sidebar.table:
+        print(table.value.to_string(index=False))
+
+    built = {
+        "firebase app": growth_fakes.STATS["firebase_apps"],
+        "firestore client": growth_fakes.STATS["firestore_clients"],
+        "gemini model": growth_fakes.STATS["gemini_models"],
+    }
+    print("constructed:", ", ".join(f"{name} x{count}" for name, count in built.items()))
+    sys.exit(0 if all(count <= 1 for count in built.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
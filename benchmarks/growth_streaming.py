@@ -0,0 +1,87 @@
+"""Check streamed coaching responses in growth_mindai.py against the local fakes.
+
+Imports the app in Streamlit's bare mode and drives GrowthCoach.stream_response
+with the fake model: compares time to first chunk with the blocking
+generate_response, cancels a stream through its event and by dropping the
+generator, and checks that only completed streams are cached. Then asks a
+question in the AI Coaching tab through AppTest to check the rendering.
+
+    python benchmarks/growth_streaming.py --model-latency 1.0
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import growth_fakes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    growth_fakes.install()
+    growth_fakes.LATENCY["model"] = args.model_latency
+    import growth_mindai
+
+    def new_coach():
+        return growth_mindai.GrowthCoach(
+            model=growth_fakes.GenerativeModel("fake"),
+            cache=growth_mindai.ResponseCache(db_path=None)
+        )
+
+    coach = new_coach()
+    start = time.perf_counter()
+    coach.generate_response("analyst", "User asked: how do I start?")
+    blocking = time.perf_counter() - start
+
+    coach = new_coach()
+    start = time.perf_counter()
+    stream = coach.stream_response("analyst", "User asked: how do I start?")
+    next(stream)
+    first_chunk = time.perf_counter() - start
+    text = "".join(stream)
+    print(f"blocking response: {blocking * 1000:.0f} ms; streamed first chunk: {first_chunk * 1000:.0f} ms, "
+          f"{coach.last_stream['tokens_per_second']:.1f} tokens/s")
+    ok = first_chunk < blocking / 2 and bool(text)
+
+    cancel = threading.Event()
+    stream = coach.stream_response("analyst", "User asked: question one", cancel)
+    next(stream)
+    cancel.set()
+    leftover = list(stream)
+    stream = coach.stream_response("analyst", "User asked: question two")
+    next(stream)
+    stream.close()
+
+    calls = growth_fakes.STATS["model_calls"]
+    again = "".join(coach.stream_response("analyst", "User asked: question one"))
+    stats = growth_mindai.get_stream_stats().summary()
+    print(f"cancelled streams: {stats['cancelled']} (chunks after cancel: {len(leftover)}); "
+          f"re-asking a cancelled question called the model {growth_fakes.STATS['model_calls'] - calls} time(s)")
+    print("stream stats:", stats)
+    ok &= stats["cancelled"] == 2 and not leftover and bool(again)
+    ok &= growth_fakes.STATS["model_calls"] - calls == 1
+
+    at = growth_fakes.app_test()
+    at.run()
+    at.sidebar.text_input[0].set_value("stream@example.com")
+    at.main.text_input[0].set_value("How do I stay consistent?")
+    at.run()
+    if at.exception:
+        raise SystemExit(f"App raised: {at.exception[0].value}")
+    rendered = [caption.value for caption in at.main.caption if "First token" in caption.value]
+    print("AI Coaching tab:", rendered[0] if rendered else "no timing caption")
+    ok &= bool(rendered)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Check that a library export imports back unchanged and bad imports roll back.
+
+Builds a scratch database through init_db() with a few books and reading
+sessions, then checks that export/import round trips keep current_page,
+that a books CSV with a repeated id is rejected by the dry run and by the
+real import, and that a rejected import leaves the existing library as it
+was. Exits non-zero on the first failed check.
+
+    python benchmarks/library_import.py
+"""
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import personal_library_manager as plm
+
+
+def library_rows():
+    """Every book and session, in a comparable form."""
+    with plm.db_connection() as conn:
+        books = [tuple(row) for row in conn.execute("SELECT * FROM books ORDER BY id")]
+        sessions = [tuple(row) for row in conn.execute("SELECT * FROM reading_sessions ORDER BY id")]
+    return books, sessions
+
+
+def import_csv(books_csv, sessions_csv, dry_run=False):
+    return plm.import_library(BytesIO(books_csv), BytesIO(sessions_csv), dry_run=dry_run)
+
+
+def check(ok, message):
+    print(f"{'ok  ' if ok else 'FAIL'} {message}")
+    if not ok:
+        plm.get_connection_pool(plm.DB_FILE).close_all()
+        sys.exit(1)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        plm.DB_FILE = os.path.join(tmp, "library_import.db")
+        plm.init_db()
+
+        for title, pages in [("Dune", 600), ("Emma", 400), ("Ulysses", 700)]:
+            plm.add_book({"title": title, "author": "Author", "status": "Reading", "pages": pages})
+        with plm.db_connection() as conn:
+            book_id = conn.execute("SELECT id FROM books ORDER BY id LIMIT 1").fetchone()[0]
+        plm.add_reading_session({"book_id": book_id, "date": "2024-01-01", "pages_read": 10, "minutes_spent": 15})
+        before = library_rows()
+
+        for cycle in range(1, 4):
+            ok, message = import_csv(*plm.export_library())
+            check(ok and library_rows() == before, f"round trip {cycle} keeps every row: {message}")
+
+        books_csv, sessions_csv = plm.export_library()
+        first_row = books_csv.splitlines()[1]
+        duplicated = books_csv + first_row + b"\n"
+
+        ok, message = import_csv(duplicated, sessions_csv, dry_run=True)
+        check(not ok and "more than one book" in message, f"dry run rejects a repeated id: {message}")
+
+        ok, message = import_csv(duplicated, sessions_csv)
+        check(not ok and "more than one book" in message, f"import rejects a repeated id: {message}")
+        check(library_rows() == before, f"rejected import leaves {len(before[0])} books and {len(before[1])} sessions")
+
+        plm.get_connection_pool(plm.DB_FILE).close_all()
+
+
+if __name__ == "__main__":
+    main()
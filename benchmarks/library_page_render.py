@@ -0,0 +1,111 @@
+"""Benchmark the database work behind one render of the library page.
+
+Compares the old connect-per-call pattern with the pooled connections used
+by personal_library_manager, optionally with several concurrent "sessions".
+
+    python benchmarks/library_page_render.py --books 2000 --renders 200 --threads 8
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import personal_library_manager as plm
+
+POOLED_CONNECTION = plm.db_connection
+
+
+@contextmanager
+def unpooled_connection():
+    """The pre-pool behaviour: a fresh connection for every data call."""
+    conn = sqlite3.connect(plm.DB_FILE)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def seed_library(num_books):
+    """Fill the benchmark database with synthetic books."""
+    genres = ["Fantasy", "History", "Science", "Poetry", "Biography", "Mystery"]
+    statuses = ["Unread", "Reading", "Completed", "On Hold", "Abandoned", "Wishlist"]
+    with plm.db_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO books (title, author, publication_year, genre, status, rating,
+                               pages, current_page, description, tags, date_added)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    f"Book {i}", f"Author {i % 97}", 1950 + i % 70, genres[i % len(genres)],
+                    statuses[i % len(statuses)], i % 6, 300, i % 300,
+                    f"Description of book {i}", f"tag{i % 13}, tag{i % 7}", "2024-01-01",
+                )
+                for i in range(num_books)
+            ],
+        )
+
+
+def render_library_page():
+    """Run the same data calls a library page render makes."""
+    plm.init_db()
+    plm.get_genres_list()
+    plm.get_tags_list()
+    books = plm.get_all_books({}, "title", True)
+    if books:
+        plm.get_book(books[0]["id"])
+    plm.get_library_statistics()
+
+
+def time_renders(renders, threads):
+    """Return per-render wall times in milliseconds."""
+    def timed(_):
+        start = time.perf_counter()
+        render_library_page()
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(timed, range(renders)))
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} mean {statistics.mean(timings):8.2f} ms   "
+          f"median {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plm.DB_FILE = os.path.join(tmp, "library_bench.db")
+        plm.init_db()
+        seed_library(args.books)
+
+        print(f"{args.books} books, {args.renders} renders, {args.threads} thread(s)")
+        plm.db_connection = unpooled_connection
+        report("unpooled", time_renders(args.renders, args.threads))
+
+        plm.db_connection = POOLED_CONNECTION
+        report("pooled", time_renders(args.renders, args.threads))
+
+        plm.get_connection_pool(plm.DB_FILE).close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Assert that the library's hot queries are served by indexes.
+
+Builds a scratch database through init_db() (so every migration runs) and
+checks EXPLAIN QUERY PLAN for each query. Exits non-zero on the first query
+that falls back to a full table scan or a temporary sort.
+
+    python benchmarks/query_plans.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import personal_library_manager as plm
+
+# (description, sql, params, index the plan must use)
+EXPECTED_PLANS = [
+    (
+        "sessions for one book",
+        "SELECT rs.*, b.title as book_title FROM reading_sessions rs "
+        "JOIN books b ON rs.book_id = b.id WHERE rs.book_id = ? ORDER BY rs.date DESC",
+        (1,),
+        "idx_reading_sessions_book_id",
+    ),
+    (
+        "all sessions by date",
+        "SELECT rs.*, b.title as book_title FROM reading_sessions rs "
+        "JOIN books b ON rs.book_id = b.id ORDER BY rs.date DESC",
+        (),
+        "idx_reading_sessions_date",
+    ),
+    (
+        "read pages recompute",
+        "SELECT COALESCE(SUM(pages_read), 0) FROM reading_sessions WHERE book_id = ?",
+        (1,),
+        "idx_reading_sessions_book_id",
+    ),
+    (
+        "books by status",
+        "SELECT status, COUNT(*) as count FROM books GROUP BY status",
+        (),
+        "idx_books_status",
+    ),
+    (
+        "books by genre",
+        "SELECT genre, COUNT(*) as count FROM books WHERE genre != '' GROUP BY genre",
+        (),
+        "idx_books_genre",
+    ),
+    (
+        "books by author",
+        "SELECT author, COUNT(*) as count FROM books GROUP BY author",
+        (),
+        "idx_books_author",
+    ),
+    (
+        "tag counts",
+        "SELECT t.name, COUNT(*) as count FROM book_tags bt "
+        "JOIN tags t ON t.id = bt.tag_id GROUP BY bt.tag_id",
+        (),
+        "idx_book_tags_tag_id",
+    ),
+    (
+        "books with a tag",
+        "SELECT bt.book_id FROM book_tags bt JOIN tags t ON t.id = bt.tag_id WHERE t.name IN (?, ?)",
+        ("fantasy", "history"),
+        "idx_book_tags_tag_id",
+    ),
+] + [
+    (
+        f"sort by {column} {direction}",
+        f"SELECT * FROM books ORDER BY {column} {direction}",
+        (),
+        f"idx_books_{column}",
+    )
+    for column in plm.SORTABLE_COLUMNS
+    for direction in ("ASC", "DESC")
+]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        plm.DB_FILE = os.path.join(tmp, "library_plans.db")
+        plm.init_db()
+
+        with plm.db_connection() as conn:
+            version = plm.get_schema_version(conn)
+        assert version == len(plm.MIGRATIONS), f"schema at version {version}"
+
+        failures = 0
+        for description, sql, params, expected in EXPECTED_PLANS:
+            plan = plm.explain_query_plan(sql, params)
+            ok = any(f"INDEX {expected}" in line for line in plan) and not any(
+                "TEMP B-TREE" in line for line in plan
+            )
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {description}: {' | '.join(plan)}")
+
+        plm.get_connection_pool(plm.DB_FILE).close_all()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
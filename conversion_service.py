@@ -0,0 +1,276 @@
+"""Headless HTTP service for the unit converter.
+
+Serves the conversion core from app.py over a small asyncio HTTP/1.1 server
+with keep-alive, without running the Streamlit script:
+
+    python conversion_service.py --port 8502
+
+    POST /convert  {"conversion_type": "Length", "from_unit": "Mile",
+                    "to_unit": "Kilometer", "values": [1, 2.5], "format": true}
+    POST /convert  {"conversions": [{...}, {...}]}
+    GET  /units    categories and their units
+    GET  /stats    request coalescing counters
+    GET  /health
+
+Concurrent requests for the same unit pair are coalesced into one
+vectorized convert_array() call per event loop tick (or per batch window).
+"""
+import argparse
+import asyncio
+import json
+import math
+from http import HTTPStatus
+
+import numpy as np
+
+from app import CONVERSION_TYPES, conversion_coefficients, convert_array, format_results
+
+KEEP_ALIVE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_VALUES = 1_000_000
+
+
+class ConversionBatcher:
+    """Coalesce concurrent conversions of the same unit pair into one array pass."""
+
+    def __init__(self, window=0.0, max_values=MAX_BATCH_VALUES):
+        self.window = window
+        self.max_values = max_values
+        self._pending = {}
+        self._pending_values = 0
+        self._flush_handle = None
+        self.requests = 0
+        self.batches = 0
+        self.values = 0
+
+    async def convert(self, conversion_type, from_unit, to_unit, values):
+        """Queue values for conversion and wait for the batch they land in."""
+        # Fail fast on unknown units instead of poisoning a shared batch
+        conversion_coefficients(conversion_type, from_unit, to_unit)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault((conversion_type, from_unit, to_unit), []).append((values, future))
+        self._pending_values += len(values)
+        self.requests += 1
+
+        if self._pending_values >= self.max_values:
+            self.flush()
+        elif self._flush_handle is None:
+            if self.window > 0:
+                self._flush_handle = loop.call_later(self.window, self.flush)
+            else:
+                self._flush_handle = loop.call_soon(self.flush)
+
+        return await future
+
+    def flush(self):
+        """Convert everything queued so far, one convert_array() call per unit pair."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending, self._pending_values = self._pending, {}, 0
+
+        for (conversion_type, from_unit, to_unit), items in pending.items():
+            merged = np.concatenate([values for values, _ in items])
+            try:
+                results = convert_array(merged, from_unit, to_unit, conversion_type)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.values += len(merged)
+            offsets = np.cumsum([len(values) for values, _ in items])[:-1]
+            for (_, future), chunk in zip(items, np.split(results, offsets)):
+                if not future.done():
+                    future.set_result(chunk)
+
+    def stats(self):
+        """Counters for the /stats endpoint."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "values": self.values,
+            "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0
+        }
+
+
+def parse_conversion(item):
+    """Validate one conversion object from a request body."""
+    if not isinstance(item, dict):
+        raise ValueError("Each conversion must be a JSON object")
+
+    for field in ("conversion_type", "from_unit", "to_unit"):
+        if not isinstance(item.get(field), str):
+            raise ValueError(f"Missing or invalid '{field}'")
+
+    if "values" in item:
+        values = item["values"]
+    elif "value" in item:
+        values = [item["value"]]
+    else:
+        raise ValueError("Provide 'value' or 'values'")
+
+    try:
+        values = np.asarray(values, dtype=np.float64).ravel()
+    except (TypeError, ValueError):
+        raise ValueError("'values' must be numbers")
+
+    return item["conversion_type"], item["from_unit"], item["to_unit"], values
+
+
+async def run_conversion(batcher, item):
+    """Convert one request object and shape its response."""
+    conversion_type, from_unit, to_unit, values = parse_conversion(item)
+    try:
+        results = await batcher.convert(conversion_type, from_unit, to_unit, values)
+    except KeyError as e:
+        raise ValueError(f"Unknown conversion type or unit: {e.args[0]}")
+
+    response = {
+        "conversion_type": conversion_type,
+        "from_unit": from_unit,
+        "to_unit": to_unit,
+        # JSON has no NaN or Infinity, so results that overflow or are undefined are null
+        "results": [result if math.isfinite(result) else None for result in results.tolist()]
+    }
+    if item.get("format"):
+        response["formatted"] = format_results(results).tolist()
+    return response
+
+
+async def route(batcher, method, path, body):
+    """Dispatch a request and return (status, JSON payload)."""
+    path = path.split("?", 1)[0]
+
+    if path == "/health":
+        return HTTPStatus.OK, {"status": "ok"}
+
+    if path == "/units":
+        if method != "GET":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET"}
+        return HTTPStatus.OK, {
+            name: {"base": category["base"], "units": category["units"]}
+            for name, category in CONVERSION_TYPES.items()
+        }
+
+    if path == "/stats":
+        return HTTPStatus.OK, {"batching": batcher.stats()}
+
+    if path == "/convert":
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}
+        try:
+            payload = json.loads(body or b"null")
+            if isinstance(payload, dict) and "conversions" in payload:
+                if not isinstance(payload["conversions"], list):
+                    raise ValueError("'conversions' must be a list")
+                results = await asyncio.gather(*(run_conversion(batcher, item) for item in payload["conversions"]))
+                return HTTPStatus.OK, {"conversions": list(results)}
+            return HTTPStatus.OK, await run_conversion(batcher, payload)
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {e.msg}"}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+    return HTTPStatus.NOT_FOUND, {"error": f"No route for {path}"}
+
+
+def encode_response(status, payload, keep_alive):
+    """Serialize a JSON response with HTTP/1.1 framing."""
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(batcher, reader, writer):
+    """Serve requests on one connection until the client closes or goes idle."""
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(encode_response(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {"error": "Headers too large"}, False))
+                break
+
+            try:
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, version = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if line:
+                        name, _, value = line.partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                writer.write(encode_response(HTTPStatus.BAD_REQUEST, {"error": "Malformed request"}, False))
+                break
+
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                writer.write(encode_response(HTTPStatus.LENGTH_REQUIRED, {"error": "Send a Content-Length body"}, False))
+                break
+            if length > MAX_BODY_BYTES:
+                writer.write(encode_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"}, False))
+                break
+
+            try:
+                body = await reader.readexactly(length) if length else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            status, payload = await route(batcher, method, target, body)
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host="127.0.0.1", port=8502, window=0.0):
+    """Run the conversion service until cancelled."""
+    batcher = ConversionBatcher(window=window)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(batcher, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES
+    )
+    print(f"Conversion service listening on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve unit conversions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument(
+        "--batch-window-ms", type=float, default=0.0,
+        help="How long to hold requests for coalescing; 0 batches whatever arrived in the same loop tick."
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.batch_window_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,416 @@
 import streamlit as st
-import google.generativeai as genai
-from datetime import datetime
-import firebase_admin
-from firebase_admin import credentials, firestore
-import stripe
+import asyncio
+import atexit
+import bisect
+import copy
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # Set the Streamlit page configuration at the very top
 st.set_page_config(page_title="GrowthMindset.AI", layout="wide")
 
-# Initialize Firebase using your service account key file
-firebase_credentials = st.secrets["firebase"]
-if not firebase_admin._apps:
-    # cred = credentials.Certificate(firebase_credentials)
-    cred = credentials.Certificate(dict(firebase_credentials))
-    firebase_admin.initialize_app(cred)
-db = firestore.client()
+# External clients are imported and built lazily, once per process, and
+# shared across reruns and sessions through st.cache_resource.
+GEMINI_MODEL = "gemini-1.5-flash"
 
-# Configure Gemini AI using your API key from st.secrets
-genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-model = genai.GenerativeModel('gemini-1.5-flash')
+@st.cache_resource
+def get_startup_timings():
+    """Process-wide record of how long each client took to import and initialize."""
+    return {}
 
-# Initialize Stripe with the secret key from st.secrets
-stripe.api_key = st.secrets["STRIPE_API_KEY"]
+def record_startup(client, import_start, init_start):
+    """Store the import and initialization cost of a client in milliseconds."""
+    get_startup_timings()[client] = {
+        "import_ms": round((init_start - import_start) * 1000, 1),
+        "init_ms": round((time.perf_counter() - init_start) * 1000, 1)
+    }
+
+@st.cache_resource
+def get_firestore_client():
+    """Initialize Firebase using your service account key and return a Firestore client."""
+    import_start = time.perf_counter()
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    init_start = time.perf_counter()
+    
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(dict(st.secrets["firebase"]))
+        firebase_admin.initialize_app(cred)
+    client = firestore.client()
+    
+    record_startup("firestore", import_start, init_start)
+    return client
+
+@st.cache_resource
+def get_gemini_model():
+    """Configure Gemini AI using your API key from st.secrets and return the model."""
+    import_start = time.perf_counter()
+    import google.generativeai as genai
+    init_start = time.perf_counter()
+    
+    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+    model = genai.GenerativeModel(GEMINI_MODEL)
+    
+    record_startup("gemini", import_start, init_start)
+    return model
+
+@st.cache_resource
+def get_stripe():
+    """Return the Stripe module, configured with the secret key from st.secrets."""
+    import_start = time.perf_counter()
+    import stripe
+    init_start = time.perf_counter()
+    
+    stripe.api_key = st.secrets["STRIPE_API_KEY"]
+    
+    record_startup("stripe", import_start, init_start)
+    return stripe
+
+# User profiles are cached per process for USER_CACHE_TTL seconds and kept
+# fresh by Firestore snapshot listeners on up to USER_CACHE_SIZE users
+USER_CACHE_TTL = 300
+USER_CACHE_SIZE = 500
+
+def new_user():
+    """Profile for someone without a user document yet."""
+    return {"premium": False}
+
+class UserProfileCache:
+    """Process-wide read-through cache of user documents.
+    
+    Each entry carries a version that changes whenever the cached document
+    does (our own writes, or a snapshot pushed by Firestore), so sessions
+    can keep their copy for as long as the version still matches.
+    """
+    
+    def __init__(self, ttl=USER_CACHE_TTL, max_users=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.metrics = Counter()
+        self._entries = OrderedDict()
+        self._listeners = {}
+        self._versions = Counter()
+        self._lock = threading.Lock()
+    
+    def version(self, email):
+        """Current version of a cached profile, or None if it isn't cached or has expired."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry["expires"] < time.monotonic():
+                return None
+            return entry["version"]
+    
+    def get(self, email):
+        """Return (profile copy, version), reading Firestore only on a miss."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry["expires"] >= time.monotonic():
+                self._entries.move_to_end(email)
+                self.metrics["process_hits"] += 1
+                return copy.deepcopy(entry["data"]), entry["version"]
+        
+        self.metrics["firestore_reads"] += 1
+        user_ref = get_firestore_client().collection("users").document(email)
+        data = migrate_embedded_progress(email, user_ref.get().to_dict() or new_user())
+        version = self._store(email, data)
+        self._listen(email, user_ref)
+        return copy.deepcopy(data), version
+    
+    def put(self, email, data):
+        """Record a profile we just wrote to Firestore and return its new version."""
+        self.metrics["own_writes"] += 1
+        return self._store(email, copy.deepcopy(data))
+    
+    def invalidate(self, email):
+        """Drop a profile so the next read goes to Firestore."""
+        with self._lock:
+            self._entries.pop(email, None)
+        self._unlisten(email)
+    
+    def record_session_hit(self):
+        self.metrics["session_hits"] += 1
+    
+    def stats(self):
+        """Counters plus the number of Firestore reads the caches saved."""
+        metrics = dict(self.metrics)
+        metrics["reads_saved"] = metrics.get("session_hits", 0) + metrics.get("process_hits", 0)
+        metrics["cached_users"] = len(self._entries)
+        return metrics
+    
+    def _store(self, email, data):
+        evicted = []
+        with self._lock:
+            self._versions[email] += 1
+            self._entries[email] = {
+                "data": data,
+                "version": self._versions[email],
+                "expires": time.monotonic() + self.ttl
+            }
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_users:
+                evicted.append(self._entries.popitem(last=False)[0])
+            version = self._versions[email]
+        for old_email in evicted:
+            self._unlisten(old_email)
+        return version
+    
+    def _listen(self, email, user_ref):
+        """Subscribe to pushed updates so other writers' changes reach the cache."""
+        with self._lock:
+            if email in self._listeners:
+                return
+            self._listeners[email] = None
+        
+        def on_snapshot(snapshots, changes, read_time):
+            for snapshot in snapshots:
+                data = migrate_embedded_progress(email, snapshot.to_dict() or new_user())
+                with self._lock:
+                    cached = self._entries.get(email)
+                    if cached is None or cached["data"] == data:
+                        continue
+                self.metrics["snapshot_updates"] += 1
+                self._store(email, data)
+        
+        try:
+            watch = user_ref.on_snapshot(on_snapshot)
+        except Exception as e:
+            print(f"Error listening for profile updates: {str(e)}")
+            watch = None
+        with self._lock:
+            self._listeners[email] = watch
+    
+    def _unlisten(self, email):
+        with self._lock:
+            watch = self._listeners.pop(email, None)
+        if watch is not None:
+            watch.unsubscribe()
+
+@st.cache_resource
+def get_user_cache():
+    return UserProfileCache()
+
+def load_user(email):
+    """Return the session's profile for email, going to the shared cache or Firestore only when stale."""
+    cache = get_user_cache()
+    version = cache.version(email)
+    if (
+        version is not None
+        and st.session_state.get("user_email") == email
+        and st.session_state.get("user_version") == version
+    ):
+        cache.record_session_hit()
+        return st.session_state.user
+    
+    user, version = cache.get(email)
+    st.session_state.user_email = email
+    st.session_state.user_version = version
+    return user
+
+def save_user(email, user):
+    """Write a user document and update both cache tiers with it."""
+    get_firestore_client().collection("users").document(email).set(user)
+    version = get_user_cache().put(email, user)
+    if st.session_state.get("user_email") == email:
+        st.session_state.user_version = version
+
+# Challenges live in users/{email}/progress, one document each, written by a
+# background queue in batches at most every PROGRESS_FLUSH_INTERVAL seconds
+# and read back PROGRESS_PAGE_SIZE at a time
+PROGRESS_FLUSH_INTERVAL = 2.0
+PROGRESS_BATCH_SIZE = 500  # Firestore's limit on writes per batch
+PROGRESS_PAGE_SIZE = 20
+
+def progress_collection(email):
+    return get_firestore_client().collection("users").document(email).collection("progress")
+
+def migrate_embedded_progress(email, user):
+    """Move a legacy embedded progress dict into the progress subcollection.
+    
+    Entries keep their original timestamp and get a document id derived from
+    it, so running the migration twice rewrites the same documents. Returns
+    the user dict without the progress field, or unchanged if the migration
+    failed.
+    """
+    embedded = user.pop("progress", None)
+    if not embedded:
+        return user
+    
+    from firebase_admin import firestore
+    client = get_firestore_client()
+    entries = list(embedded.items())
+    try:
+        for start in range(0, len(entries), PROGRESS_BATCH_SIZE):
+            batch = client.batch()
+            for created, challenge in entries[start:start + PROGRESS_BATCH_SIZE]:
+                try:
+                    # Keys were str(datetime.now()), i.e. naive local time
+                    created_at = datetime.fromisoformat(created).astimezone(timezone.utc)
+                except ValueError:
+                    created_at = datetime.now(timezone.utc)
+                entry_id = hashlib.sha1(created.encode("utf-8")).hexdigest()[:20]
+                batch.set(progress_collection(email).document(entry_id), {
+                    "created_at": created_at,
+                    "focus": None,
+                    "challenge": challenge
+                })
+            batch.commit()
+        client.collection("users").document(email).update({"progress": firestore.DELETE_FIELD})
+    except Exception as e:
+        # Keep the embedded copy on the profile, so a later save_user() doesn't
+        # drop it, and try again on the next load
+        print(f"Error migrating progress for {email}: {str(e)}")
+        user["progress"] = embedded
+    return user
+
+class ProgressWriter:
+    """Write-behind queue for progress entries.
+    
+    Entries are committed from a background thread in Firestore batches, so
+    adding a challenge costs one small document write however long the
+    user's history is. Entries stay visible through pending() until their
+    batch commits.
+    """
+    
+    def __init__(self, interval=PROGRESS_FLUSH_INTERVAL, batch_size=PROGRESS_BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.metrics = Counter()
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+    
+    def enqueue(self, email, entry):
+        with self._lock:
+            self._pending.setdefault(email, {})[entry["id"]] = entry
+        self._queue.put((email, entry))
+        self.metrics["queued"] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+    
+    def pending(self, email):
+        """Entries for email that haven't been committed yet."""
+        with self._lock:
+            return list(self._pending.get(email, {}).values())
+    
+    def flush(self):
+        """Commit everything queued so far."""
+        with self._flush_lock:
+            items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for start in range(0, len(items), self.batch_size):
+                chunk = items[start:start + self.batch_size]
+                try:
+                    batch = get_firestore_client().batch()
+                    for email, entry in chunk:
+                        fields = {key: value for key, value in entry.items() if key != "id"}
+                        batch.set(progress_collection(email).document(entry["id"]), fields)
+                    batch.commit()
+                except Exception as e:
+                    print(f"Error writing progress: {str(e)}")
+                    self.metrics["errors"] += 1
+                    for item in chunk:
+                        self._queue.put(item)
+                    continue
+                
+                self.metrics["batches"] += 1
+                self.metrics["written"] += len(chunk)
+                with self._lock:
+                    for email, entry in chunk:
+                        self._pending.get(email, {}).pop(entry["id"], None)
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+@st.cache_resource
+def get_progress_writer():
+    return ProgressWriter()
+
+def record_progress(email, focus, challenge):
+    """Queue a new challenge for the user's progress history."""
+    created_at = datetime.now(timezone.utc)
+    get_progress_writer().enqueue(email, {
+        "id": f"{created_at.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:6]}",
+        "created_at": created_at,
+        "focus": focus,
+        "challenge": challenge
+    })
+    # The cached page may be the first one, which should now show this entry
+    st.session_state.pop("progress_page", None)
+
+def get_progress_page(email, cursor=None, start=None, end=None, page_size=PROGRESS_PAGE_SIZE):
+    """One page of a user's progress entries, newest first.
+    
+    cursor is the created_at of the last entry on the previous page, and
+    start/end bound created_at (end exclusive). Returns (entries, cursor for
+    the next page or None). The first page also shows entries still queued
+    for writing.
+    """
+    from firebase_admin import firestore
+    query = progress_collection(email).order_by("created_at", direction=firestore.Query.DESCENDING)
+    if start is not None:
+        query = query.where(filter=firestore.FieldFilter("created_at", ">=", start))
+    if end is not None:
+        query = query.where(filter=firestore.FieldFilter("created_at", "<", end))
+    if cursor is not None:
+        query = query.start_after({"created_at": cursor})
+    
+    entries = {}
+    if cursor is None:
+        for entry in get_progress_writer().pending(email):
+            if (start is None or entry["created_at"] >= start) and (end is None or entry["created_at"] < end):
+                entries[entry["id"]] = entry
+    try:
+        # One extra document tells whether there is a next page
+        for snapshot in query.limit(page_size + 1).stream():
+            entries.setdefault(snapshot.id, {"id": snapshot.id, **snapshot.to_dict()})
+    except Exception as e:
+        print(f"Error loading progress: {str(e)}")
+    
+    page = sorted(entries.values(), key=lambda entry: entry["created_at"], reverse=True)
+    if len(page) > page_size:
+        return page[:page_size], page[page_size - 1]["created_at"]
+    return page, None
+
+def get_session_progress_page(email, cursor=None, start=None, end=None):
+    """get_progress_page() kept in the session, so reruns for other widgets don't query again.
+    
+    The page is read again when the user, cursor or date range changes, or
+    after record_progress() adds an entry.
+    """
+    key = (email, cursor, start, end)
+    cached = st.session_state.get("progress_page")
+    if cached is None or cached[0] != key:
+        cached = st.session_state.progress_page = (key, get_progress_page(email, cursor, start, end))
+    return cached[1]
 
 def create_checkout_session(amount, currency, success_url, cancel_url):
     """
     Creates a Stripe Checkout session for a recurring subscription.
     Amount is in cents (e.g., 999 for $9.99).
     """
-    session = stripe.checkout.Session.create(
+    session = get_stripe().checkout.Session.create(
         payment_method_types=["card"],
         line_items=[{
             "price_data": {
@@ -51,17 +433,372 @@ def create_checkout_session(amount, currency, success_url, cancel_url):
 query_params = st.query_params
 if query_params.get("payment") == ["success"] and query_params.get("email"):
     email = query_params["email"][0]
-    user_ref = db.collection("users").document(email)
-    user_data = user_ref.get().to_dict() or {"progress": {}, "premium": False}
+    user_data = load_user(email)
     if not user_data.get("premium"):
         user_data["premium"] = True
-        user_ref.set(user_data)
+        save_user(email, user_data)
         st.session_state.user = user_data
         st.success("Your premium subscription has been activated!")
 
 # AI Agent System
+# Model responses are cached by prompt for RESPONSE_CACHE_TTL seconds, in
+# memory and, when GROWTH_RESPONSE_CACHE_DB names a file, in SQLite as well
+RESPONSE_CACHE_TTL = 6 * 60 * 60
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_DB = os.environ.get("GROWTH_RESPONSE_CACHE_DB")
+
+class ResponseCache:
+    """Prompt-keyed cache of model responses with in-flight deduplication.
+    
+    Requests for a prompt that is already being generated wait for that call
+    instead of starting their own. Failed calls are not cached. The optional
+    SQLite tier lets responses survive restarts and be shared between
+    processes.
+    """
+    
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE, db_path=RESPONSE_CACHE_DB):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.metrics = Counter()
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )
+            """)
+            self._db.commit()
+    
+    @staticmethod
+    def key(model_name, prompt):
+        return hashlib.sha256(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()
+    
+    def get_or_generate(self, key, generate):
+        """Return the cached response for key, calling generate() at most once per miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires"] > now:
+                self._entries.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return entry["response"]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        
+        if not owner:
+            self.metrics["deduplicated"] += 1
+            return future.result()
+        
+        try:
+            stored = self._load(key, now)
+            if stored is not None:
+                self.metrics["disk_hits"] += 1
+                response, expires = stored
+            else:
+                self.metrics["misses"] += 1
+                response = generate()
+                expires = now + self.ttl
+                self._save(key, response, expires)
+            self._remember(key, response, expires)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            self.metrics["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+    
+    def lookup(self, key):
+        """Cached response for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["expires"] > now:
+                self._entries.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return entry["response"]
+        
+        stored = self._load(key, now)
+        if stored is None:
+            self.metrics["misses"] += 1
+            return None
+        self.metrics["disk_hits"] += 1
+        self._remember(key, *stored)
+        return stored[0]
+    
+    def store(self, key, response):
+        """Cache a response produced outside get_or_generate, e.g. by a finished stream."""
+        expires = time.time() + self.ttl
+        self._save(key, response, expires)
+        self._remember(key, response, expires)
+    
+    def stats(self):
+        hits = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["deduplicated"]
+        requests = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_rate": round(hits / requests, 3) if requests else 0.0,
+            "cached_responses": len(self._entries)
+        }
+    
+    def _remember(self, key, response, expires):
+        with self._lock:
+            self._entries[key] = {"response": response, "expires": expires}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _load(self, key, now):
+        if self._db is None:
+            return None
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT response, expires FROM responses WHERE key = ? AND expires > ?", (key, now)
+            ).fetchone()
+    
+    def _save(self, key, response, expires):
+        if self._db is None:
+            return
+        with self._db_lock:
+            self._db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                (key, response, expires)
+            )
+            self._db.commit()
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+class StreamStats:
+    """Time to first token and throughput of the most recent streamed responses."""
+    
+    def __init__(self, window=200):
+        self.metrics = Counter()
+        self._ttft = deque(maxlen=window)
+        self._tokens_per_second = deque(maxlen=window)
+    
+    def record(self, ttft, tokens, seconds):
+        self.metrics["completed"] += 1
+        self._ttft.append(ttft)
+        if seconds > 0:
+            self._tokens_per_second.append(tokens / seconds)
+    
+    def summary(self):
+        ttft = sorted(self._ttft)
+        return {
+            **self.metrics,
+            "ttft_p50_ms": round(ttft[len(ttft) // 2] * 1000, 1) if ttft else None,
+            "ttft_p95_ms": round(ttft[int(len(ttft) * 0.95)] * 1000, 1) if ttft else None,
+            "tokens_per_second": round(sum(self._tokens_per_second) / len(self._tokens_per_second), 1)
+            if self._tokens_per_second else None
+        }
+
+@st.cache_resource
+def get_stream_stats():
+    return StreamStats()
+
+# Every model call is recorded per agent (tokens, latency, errors) and
+# charged to the user's daily token budget. When GROWTH_METRICS_PORT is set
+# the counters are also served in Prometheus text format at /metrics.
+TOKEN_BUDGET = int(os.environ.get("GROWTH_TOKEN_BUDGET", "20000"))
+PREMIUM_TOKEN_BUDGET = int(os.environ.get("GROWTH_PREMIUM_TOKEN_BUDGET", "200000"))
+METRICS_HOST = os.environ.get("GROWTH_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.environ.get("GROWTH_METRICS_PORT")
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class TokenBudgetExceeded(Exception):
+    pass
+
+def token_budget_for(user):
+    return PREMIUM_TOKEN_BUDGET if user.get("premium") else TOKEN_BUDGET
+
+def usage_tokens(usage, prompt, completion):
+    """(prompt, completion) token counts, estimated from word counts when the response has no usage metadata."""
+    if usage is not None and usage.prompt_token_count is not None:
+        return usage.prompt_token_count, usage.candidates_token_count or 0
+    return len(prompt.split()), len(completion.split())
+
+class ModelMetrics:
+    """Per-agent token, latency and error counters, plus per-user daily token use."""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.budget_rejections = 0
+        self._agents = {}
+        self._users = {}
+        self._lock = threading.Lock()
+    
+    def record(self, agent, seconds, prompt_tokens=0, completion_tokens=0, user=None, error=False):
+        with self._lock:
+            stats = self._agents.setdefault(agent, {
+                "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "latency_sum": 0.0, "latency_buckets": [0] * (len(self.buckets) + 1)
+            })
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["latency_sum"] += seconds
+            stats["latency_buckets"][bisect.bisect_left(self.buckets, seconds)] += 1
+            if user:
+                self._usage(user)["tokens"] += prompt_tokens + completion_tokens
+    
+    def tokens_used(self, user):
+        """Tokens charged to user today (UTC)."""
+        with self._lock:
+            return self._usage(user)["tokens"]
+    
+    def check_budget(self, user, budget):
+        """Raise TokenBudgetExceeded once user has used up today's budget."""
+        if user and self.tokens_used(user) >= budget:
+            with self._lock:
+                self.budget_rejections += 1
+            raise TokenBudgetExceeded(f"You've used today's AI budget of {budget:,} tokens. It resets at midnight UTC.")
+    
+    def agent_rows(self):
+        """One summary row per agent for the admin panel."""
+        with self._lock:
+            agents = copy.deepcopy(self._agents)
+        rows = []
+        for agent, stats in sorted(agents.items()):
+            calls = stats["calls"]
+            rows.append({
+                "agent": agent,
+                "calls": calls,
+                "error_rate": round(stats["errors"] / calls, 3),
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "avg_tokens": round((stats["prompt_tokens"] + stats["completion_tokens"]) / calls, 1),
+                "avg_latency_s": round(stats["latency_sum"] / calls, 2),
+                "p95_latency_s": self._quantile(stats["latency_buckets"], 0.95)
+            })
+        return rows
+    
+    def top_users(self, count=10):
+        """The users with the most tokens today."""
+        today = datetime.now(timezone.utc).date()
+        with self._lock:
+            usage = [(user, entry["tokens"]) for user, entry in self._users.items() if entry["day"] == today]
+        usage.sort(key=lambda item: item[1], reverse=True)
+        return [{"user": user, "tokens_today": tokens} for user, tokens in usage[:count]]
+    
+    def prometheus(self):
+        """All counters in the Prometheus text exposition format."""
+        with self._lock:
+            agents = copy.deepcopy(self._agents)
+            rejections = self.budget_rejections
+        lines = [
+            "# HELP growth_model_calls_total Model calls by agent.",
+            "# TYPE growth_model_calls_total counter",
+            *(f'growth_model_calls_total{{agent="{agent}"}} {stats["calls"]}' for agent, stats in agents.items()),
+            "# HELP growth_model_errors_total Failed model calls by agent.",
+            "# TYPE growth_model_errors_total counter",
+            *(f'growth_model_errors_total{{agent="{agent}"}} {stats["errors"]}' for agent, stats in agents.items()),
+            "# HELP growth_model_tokens_total Tokens used by agent and kind.",
+            "# TYPE growth_model_tokens_total counter",
+        ]
+        for agent, stats in agents.items():
+            lines.append(f'growth_model_tokens_total{{agent="{agent}",kind="prompt"}} {stats["prompt_tokens"]}')
+            lines.append(f'growth_model_tokens_total{{agent="{agent}",kind="completion"}} {stats["completion_tokens"]}')
+        lines += [
+            "# HELP growth_model_latency_seconds Model call latency by agent.",
+            "# TYPE growth_model_latency_seconds histogram",
+        ]
+        for agent, stats in agents.items():
+            cumulative = 0
+            for bound, count in zip([*map(str, self.buckets), "+Inf"], stats["latency_buckets"]):
+                cumulative += count
+                lines.append(f'growth_model_latency_seconds_bucket{{agent="{agent}",le="{bound}"}} {cumulative}')
+            lines.append(f'growth_model_latency_seconds_sum{{agent="{agent}"}} {stats["latency_sum"]:.6f}')
+            lines.append(f'growth_model_latency_seconds_count{{agent="{agent}"}} {stats["calls"]}')
+        lines += [
+            "# HELP growth_token_budget_rejections_total Calls refused because the user's daily budget was used up.",
+            "# TYPE growth_token_budget_rejections_total counter",
+            f"growth_token_budget_rejections_total {rejections}",
+        ]
+        return "\n".join(lines) + "\n"
+    
+    def _usage(self, user):
+        # Caller holds the lock; a user's count starts over each UTC day
+        today = datetime.now(timezone.utc).date()
+        entry = self._users.get(user)
+        if entry is None or entry["day"] != today:
+            entry = self._users[user] = {"day": today, "tokens": 0}
+        return entry
+    
+    def _quantile(self, bucket_counts, quantile):
+        # Upper bound of the bucket holding the quantile, as Prometheus would estimate it
+        target = quantile * sum(bucket_counts)
+        cumulative = 0
+        for bound, count in zip(self.buckets, bucket_counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+@st.cache_resource
+def get_model_metrics():
+    return ModelMetrics()
+
+@st.cache_resource
+def start_metrics_server(host, port):
+    """Serve get_model_metrics() at http://host:port/metrics from a daemon thread."""
+    metrics = get_model_metrics()
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+# The coaching panel asks several agents at once; each gets PANEL_TIMEOUT
+# seconds and at most PANEL_CONCURRENCY model calls run at the same time
+PANEL_TIMEOUT = 30.0
+PANEL_CONCURRENCY = 4
+PANEL_WORKERS = 16
+
+@st.cache_resource
+def get_panel_executor():
+    # Not asyncio's default executor: asyncio.run() waits for that one on
+    # exit, which would make a timed-out agent hold up the whole panel
+    return ThreadPoolExecutor(max_workers=PANEL_WORKERS, thread_name_prefix="coaching-panel")
+
 class GrowthCoach:
-    def __init__(self):
+    def __init__(self, model=None, cache=None, metrics=None, user=None, token_budget=TOKEN_BUDGET):
+        # model, cache and metrics default to the shared ones; pass stubs to exercise the coach offline.
+        # Model calls are charged to user, if given, and refused once token_budget is used up today.
+        self.model = model
+        self.cache = cache
+        self.metrics = metrics
+        self.user = user
+        self.token_budget = token_budget
+        self.last_stream = None
         self.agents = {
             "planner": "You are expert at creating personalized growth challenges...",
             "analyst": "You specialize in tracking progress and identifying patterns...",
@@ -69,14 +806,318 @@ class GrowthCoach:
             "mentor": "You simulate famous mentors like Tony Robbins..."
         }
     def generate_response(self, agent_type, prompt):
-        response = model.generate_content(
-            f"{self.agents[agent_type]}\n\n{prompt}"
+        full_prompt = f"{self.agents[agent_type]}\n\n{prompt}"
+        cache = self.cache if self.cache is not None else get_response_cache()
+        return cache.get_or_generate(
+            ResponseCache.key(GEMINI_MODEL, full_prompt),
+            lambda: self.generate_uncached(agent_type, prompt)
+        )
+    
+    def generate_uncached(self, agent_type, prompt):
+        """Call the model directly, recording tokens, latency and errors under agent_type."""
+        full_prompt = f"{self.agents[agent_type]}\n\n{prompt}"
+        model = self.model if self.model is not None else get_gemini_model()
+        metrics = self.metrics if self.metrics is not None else get_model_metrics()
+        metrics.check_budget(self.user, self.token_budget)
+        
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(full_prompt)
+            text = response.text
+        except Exception:
+            metrics.record(agent_type, time.perf_counter() - start, user=self.user, error=True)
+            raise
+        prompt_tokens, completion_tokens = usage_tokens(getattr(response, "usage_metadata", None), full_prompt, text)
+        metrics.record(agent_type, time.perf_counter() - start, prompt_tokens, completion_tokens, user=self.user)
+        return text
+    
+    def stream_response(self, agent_type, prompt, cancel=None):
+        """Yield the response in chunks as the model produces them.
+        
+        A cached response is yielded whole. Otherwise the model is called with
+        stream=True; the finished text is cached, while a stream that is
+        cancelled (cancel is set, or the consumer stops iterating) is not.
+        Per-stream timings end up in self.last_stream and get_stream_stats().
+        """
+        full_prompt = f"{self.agents[agent_type]}\n\n{prompt}"
+        cache = self.cache if self.cache is not None else get_response_cache()
+        key = ResponseCache.key(GEMINI_MODEL, full_prompt)
+        self.last_stream = None
+        
+        cached = cache.lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        model = self.model if self.model is not None else get_gemini_model()
+        metrics = self.metrics if self.metrics is not None else get_model_metrics()
+        metrics.check_budget(self.user, self.token_budget)
+        stats = get_stream_stats()
+        start = time.perf_counter()
+        first_token = None
+        chunks = []
+        tokens = 0
+        usage = None
+        
+        def charge(error=False):
+            # Cancelled streams are charged for what was generated before they stopped
+            prompt_tokens, completion_tokens = usage_tokens(usage, full_prompt, "".join(chunks))
+            metrics.record(
+                agent_type, time.perf_counter() - start, prompt_tokens, completion_tokens,
+                user=self.user, error=error
+            )
+        
+        try:
+            for chunk in model.generate_content(full_prompt, stream=True):
+                if cancel is not None and cancel.is_set():
+                    stats.metrics["cancelled"] += 1
+                    charge()
+                    return
+                if first_token is None:
+                    first_token = time.perf_counter()
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if usage is not None and usage.candidates_token_count:
+                    tokens = usage.candidates_token_count
+                else:
+                    tokens += len(chunk.text.split())
+                chunks.append(chunk.text)
+                yield chunk.text
+        except GeneratorExit:
+            # The consumer went away, e.g. Streamlit interrupted the run for a new query
+            stats.metrics["cancelled"] += 1
+            charge()
+            raise
+        except Exception:
+            charge(error=True)
+            raise
+        
+        charge()
+        end = time.perf_counter()
+        first_token = first_token or end
+        stats.record(first_token - start, tokens, end - first_token)
+        self.last_stream = {
+            "ttft": first_token - start,
+            "tokens_per_second": tokens / (end - first_token) if end > first_token else None
+        }
+        cache.store(key, "".join(chunks))
+
+    async def panel(self, prompt, agents=None, timeout=PANEL_TIMEOUT, concurrency=PANEL_CONCURRENCY):
+        """Ask several agents the same prompt concurrently.
+        
+        Yields a result dict per agent in the order they finish, so the whole
+        panel takes as long as its slowest agent. An agent that fails or runs
+        past timeout yields an error instead of a response; its call keeps
+        running in its worker thread, holding one of the concurrency slots,
+        and still fills the response cache.
+        """
+        # Resolve shared clients here; the worker threads have no script context
+        coach = GrowthCoach(
+            self.model if self.model is not None else get_gemini_model(),
+            self.cache if self.cache is not None else get_response_cache(),
+            self.metrics if self.metrics is not None else get_model_metrics(),
+            self.user,
+            self.token_budget
         )
-        return response.text
+        executor = get_panel_executor()
+        limit = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        
+        def release(call):
+            try:
+                loop.call_soon_threadsafe(limit.release)
+            except RuntimeError:
+                # The panel is over and its loop closed; nothing waits on the slot
+                pass
+        
+        async def ask(agent):
+            await limit.acquire()
+            start = time.perf_counter()
+            result = {"agent": agent, "response": None, "error": None}
+            # The slot is freed when the worker thread returns, not when we stop
+            # waiting, so a timed-out call still counts against the limit
+            call = executor.submit(coach.generate_response, agent, prompt)
+            call.add_done_callback(release)
+            try:
+                result["response"] = await asyncio.wait_for(asyncio.wrap_future(call), timeout)
+            except asyncio.TimeoutError:
+                result["error"] = f"No answer after {timeout:g} s"
+            except Exception as e:
+                result["error"] = str(e)
+            result["seconds"] = time.perf_counter() - start
+            return result
+        
+        for next_result in asyncio.as_completed([ask(agent) for agent in (agents or self.agents)]):
+            yield await next_result
+
+def render_panel(coach, prompt, agents):
+    """Show a placeholder per agent and fill each one in as its answer arrives."""
+    placeholders = {}
+    for agent in agents:
+        placeholders[agent] = st.empty()
+        placeholders[agent].info(f"{agent.title()} is thinking...")
+    
+    async def fill():
+        async for result in coach.panel(prompt, agents):
+            with placeholders[result["agent"]].container():
+                st.markdown(f"#### {result['agent'].title()}")
+                if result["error"]:
+                    st.error(result["error"])
+                else:
+                    st.write(result["response"])
+                st.caption(f"{result['seconds']:.1f} s")
+    
+    start = time.perf_counter()
+    asyncio.run(fill())
+    return time.perf_counter() - start
+
+# Daily challenges are pre-generated into a SQLite pool per focus area. A
+# background worker tops a focus back up to CHALLENGE_POOL_TARGET once it
+# drops below CHALLENGE_POOL_LOW_WATERMARK, generating at most
+# CHALLENGE_GENERATION_RATE challenges per second. Pre-generation spends
+# model calls ahead of demand, so it is off unless GROWTH_CHALLENGE_POOL_DB
+# names the pool's database file.
+CHALLENGE_FOCUSES = ["Career", "Health", "Relationships", "Skills"]
+CHALLENGE_POOL_DB = os.environ.get("GROWTH_CHALLENGE_POOL_DB", "")
+CHALLENGE_POOL_TARGET = 10
+CHALLENGE_POOL_LOW_WATERMARK = 3
+CHALLENGE_GENERATION_RATE = 0.2
+CHALLENGE_GENERATION_BURST = 2
+CHALLENGE_RETRY_INTERVAL = 60
+
+def challenge_prompt(focus):
+    return f"Create {focus} growth challenge for intermediate level user"
+
+class TokenBucket:
+    """Blocking token bucket: rate tokens per second, bursts of at most capacity."""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                time.sleep((1 - self._tokens) / self.rate)
+
+class ChallengePool:
+    """Pre-generated challenges per focus, refilled by a background thread.
+    
+    take() hands out each stored challenge once and returns None when the
+    pool for that focus is empty, so the caller can fall back to a live
+    call. Pooled challenges are generated without the response cache so
+    they differ from each other.
+    """
+    
+    def __init__(self, generate, db_path, focuses=CHALLENGE_FOCUSES,
+                 target=CHALLENGE_POOL_TARGET, low_watermark=CHALLENGE_POOL_LOW_WATERMARK,
+                 rate=CHALLENGE_GENERATION_RATE, burst=CHALLENGE_GENERATION_BURST):
+        self.generate = generate
+        self.focuses = list(focuses)
+        self.target = target
+        self.low_watermark = low_watermark
+        self.bucket = TokenBucket(rate, burst)
+        self.metrics = Counter()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS challenge_pool (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                focus TEXT NOT NULL,
+                challenge TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_challenge_pool_focus ON challenge_pool (focus, id)")
+        self._db.commit()
+        self._wake = threading.Event()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="challenge-pool", daemon=True)
+        self._thread.start()
+    
+    def take(self, focus):
+        """Remove and return the oldest pooled challenge for focus, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, challenge FROM challenge_pool WHERE focus = ? ORDER BY id LIMIT 1", (focus,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM challenge_pool WHERE id = ?", (row[0],))
+                self._db.commit()
+        
+        self.metrics["served" if row is not None else "empty"] += 1
+        if self.size(focus) < self.low_watermark:
+            self._wake.set()
+        return row[1] if row is not None else None
+    
+    def size(self, focus):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM challenge_pool WHERE focus = ?", (focus,)).fetchone()[0]
+    
+    def stats(self):
+        return {**self.metrics, "pool": {focus: self.size(focus) for focus in self.focuses}}
+    
+    def _add(self, focus, challenge):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO challenge_pool (focus, challenge, created_at) VALUES (?, ?, ?)",
+                (focus, challenge, time.time())
+            )
+            self._db.commit()
+    
+    def _refill(self):
+        # Only focuses under the watermark are refilled, then all the way to
+        # target, emptiest first so one focus can't starve the others
+        refilling = {focus for focus in self.focuses if self.size(focus) < self.low_watermark}
+        while refilling:
+            focus = min(refilling, key=self.size)
+            if self.size(focus) >= self.target:
+                refilling.discard(focus)
+                continue
+            self.bucket.acquire()
+            try:
+                challenge = self.generate(focus)
+            except Exception as e:
+                print(f"Error pre-generating {focus} challenge: {str(e)}")
+                self.metrics["errors"] += 1
+                return False
+            self._add(focus, challenge)
+            self.metrics["generated"] += 1
+        return True
+    
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if not self._refill():
+                # Try again later even if nobody takes a challenge meanwhile
+                time.sleep(CHALLENGE_RETRY_INTERVAL)
+                self._wake.set()
+
+def generate_pooled_challenge(focus):
+    """One fresh challenge for the pool, straight from the model."""
+    return GrowthCoach().generate_uncached("planner", challenge_prompt(focus))
+
+@st.cache_resource
+def get_challenge_pool():
+    if not CHALLENGE_POOL_DB:
+        return None
+    return ChallengePool(generate_pooled_challenge, CHALLENGE_POOL_DB)
 
 # Session State Management
 if "user" not in st.session_state:
-    st.session_state.user = {"progress": {}, "premium": False}
+    st.session_state.user = new_user()
+
+if METRICS_PORT:
+    start_metrics_server(METRICS_HOST, int(METRICS_PORT))
 
 # Main App Interface
 st.title("GrowthMindset.AI")
@@ -87,8 +1128,9 @@ with st.sidebar:
     st.header("Your Profile")
     user_email = st.text_input("Enter Email to Continue")
     if user_email:
-        user_ref = db.collection("users").document(user_email)
-        st.session_state.user = user_ref.get().to_dict() or {"progress": {}, "premium": False}
+        st.session_state.user = load_user(user_email)
+        budget = token_budget_for(st.session_state.user)
+        st.caption(f"AI tokens used today: {get_model_metrics().tokens_used(user_email):,} of {budget:,}")
     else:
         st.write("Please enter your email to continue.")
 
@@ -96,42 +1138,100 @@ with st.sidebar:
 tab1, tab2, tab3, tab4 = st.tabs(["Daily Challenge", "Progress Hub", "AI Coaching", "Premium"])
 
 with tab1:
-    coach = GrowthCoach()
-    challenge_type = st.selectbox("Choose Challenge Focus", ["Career", "Health", "Relationships", "Skills"])
+    coach = GrowthCoach(user=user_email or None, token_budget=token_budget_for(st.session_state.user))
+    # Started on the first page load so the pool fills before the first click
+    pool = get_challenge_pool()
+    challenge_type = st.selectbox("Choose Challenge Focus", CHALLENGE_FOCUSES)
     if st.button("Generate Today's Challenge"):
         if user_email:
-            prompt = f"Create {challenge_type} growth challenge for intermediate level user"
-            challenge = coach.generate_response("planner", prompt)
-            st.session_state.user["progress"][str(datetime.now())] = challenge
-            db.collection("users").document(user_email).set(st.session_state.user)
-            with st.chat_message("assistant"):
-                st.markdown(f"## 🚀 Your Challenge\n{challenge}")
-                st.button("I Completed This!", on_click=lambda: st.balloons())
+            challenge = pool.take(challenge_type) if pool is not None else None
+            try:
+                if challenge is None:
+                    challenge = coach.generate_response("planner", challenge_prompt(challenge_type))
+            except TokenBudgetExceeded as e:
+                st.error(str(e))
+            else:
+                record_progress(user_email, challenge_type, challenge)
+                with st.chat_message("assistant"):
+                    st.markdown(f"## 🚀 Your Challenge\n{challenge}")
+                    st.button("I Completed This!", on_click=lambda: st.balloons())
         else:
             st.error("Please enter your email in the sidebar to generate a challenge.")
 
 with tab2:
     st.header("Your Growth Journey")
-    if st.session_state.user.get("progress"):
-        for date, challenge in st.session_state.user["progress"].items():
-            st.expander(f"{date}").write(challenge)
+    dates = st.date_input("Filter by date", value=(), format="YYYY-MM-DD")
+    start = end = None
+    if dates:
+        start = datetime(dates[0].year, dates[0].month, dates[0].day).astimezone()
+        last = dates[-1]
+        end = datetime(last.year, last.month, last.day).astimezone() + timedelta(days=1)
+    
+    # Cursors of the pages seen so far; a new user or filter starts over
+    view = (user_email, start, end)
+    if st.session_state.get("progress_view") != view:
+        st.session_state.progress_view = view
+        st.session_state.progress_cursors = [None]
+    cursors = st.session_state.progress_cursors
+    
+    progress, next_cursor = get_session_progress_page(user_email, cursors[-1], start, end) if user_email else ([], None)
+    if progress:
+        for entry in progress:
+            label = entry["created_at"].astimezone().strftime("%Y-%m-%d %H:%M")
+            if entry.get("focus"):
+                label += f" · {entry['focus']}"
+            st.expander(label).write(entry["challenge"])
+    elif dates:
+        st.write("No challenges in this date range.")
     else:
         st.write("No challenges completed yet!")
+    
+    if progress or len(cursors) > 1:
+        previous_col, page_col, next_col = st.columns([1, 2, 1])
+        # Callbacks move the cursor before the rerun, so each click reads one page
+        previous_col.button("Newer", disabled=len(cursors) == 1, on_click=cursors.pop)
+        page_col.caption(f"Page {len(cursors)}")
+        next_col.button("Older", disabled=next_cursor is None, on_click=cursors.append, args=(next_cursor,))
 
 with tab3:
     st.header("24/7 AI Coaching")
     # If the user is premium, let them select from additional agents; otherwise, only show "analyst"
+    panel_mode = False
     if st.session_state.user.get("premium"):
-        agent_choice = st.selectbox("Select a Coaching Agent", ["analyst", "motivator", "mentor"])
+        panel_mode = st.toggle("Coaching panel", help="Ask several agents at once")
+        if panel_mode:
+            panel_agents = st.multiselect(
+                "Panel Agents", ["analyst", "motivator", "mentor"], default=["analyst", "motivator", "mentor"]
+            )
+        else:
+            agent_choice = st.selectbox("Select a Coaching Agent", ["analyst", "motivator", "mentor"])
     else:
         agent_choice = "analyst"
     query = st.text_input("Ask your growth question:")
-    if query:
-        with st.spinner("Analyzing..."):
-            response = coach.generate_response(agent_choice, f"User asked: {query}")
-            st.write(response)
-            if not st.session_state.user.get("premium"):
-                st.warning("Unlock premium for detailed analysis and access to pro coaching agents!")
+    if query and panel_mode:
+        if panel_agents:
+            elapsed = render_panel(coach, f"User asked: {query}", panel_agents)
+            st.caption(f"Panel answered in {elapsed:.1f} s")
+        else:
+            st.info("Pick at least one agent for the panel.")
+    elif query:
+        # A new query (or agent) cancels a stream still running for the old one
+        previous = st.session_state.get("coaching_stream")
+        if previous is not None:
+            previous.set()
+        cancel = st.session_state.coaching_stream = threading.Event()
+        try:
+            st.write_stream(coach.stream_response(agent_choice, f"User asked: {query}", cancel))
+        except TokenBudgetExceeded as e:
+            st.error(str(e))
+        if coach.last_stream is not None:
+            rate = coach.last_stream["tokens_per_second"]
+            st.caption(
+                f"First token after {coach.last_stream['ttft']:.2f} s"
+                + (f" · {rate:.0f} tokens/s" if rate else "")
+            )
+        if not st.session_state.user.get("premium"):
+            st.warning("Unlock premium for detailed analysis and access to pro coaching agents!")
 
 with tab4:
     st.header("Premium Features")
@@ -160,6 +1260,39 @@ with st.sidebar:
     st.write("1. **Affiliate Products** (Books/Courses)")
     st.write("2. **Sponsored Challenges**")
     st.write("3. **Corporate Training Packages**")
+    
+    with st.expander("Diagnostics"):
+        timings = get_startup_timings()
+        if timings:
+            st.markdown("**Startup timings**")
+            st.table([{"client": name, **cost} for name, cost in timings.items()])
+        st.markdown("**Profile cache**")
+        st.json(get_user_cache().stats())
+        st.markdown("**Progress writes**")
+        st.json(dict(get_progress_writer().metrics))
+        st.markdown("**Response cache**")
+        st.json(get_response_cache().stats())
+        st.markdown("**Streaming**")
+        st.json(get_stream_stats().summary())
+        if get_challenge_pool() is not None:
+            st.markdown("**Challenge pool**")
+            st.json(get_challenge_pool().stats())
+    
+    # Model usage per agent and per user, for the emails listed in the ADMIN_EMAILS secret
+    if user_email and user_email in st.secrets.get("ADMIN_EMAILS", []):
+        with st.expander("Admin: Model Usage"):
+            metrics = get_model_metrics()
+            rows = metrics.agent_rows()
+            if rows:
+                st.table(rows)
+            else:
+                st.write("No model calls yet.")
+            if metrics.top_users():
+                st.markdown("**Top users today**")
+                st.table(metrics.top_users())
+            st.caption(f"Calls refused by token budgets: {metrics.budget_rejections}")
+            if METRICS_PORT:
+                st.caption(f"Prometheus metrics: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
 
 # Community Features
 st.markdown("---")
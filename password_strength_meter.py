@@ -4,10 +4,9 @@ import string
 import zxcvbn
 import time
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 from io import BytesIO
-import base64
 
 # Set page configuration
 st.set_page_config(
@@ -131,9 +130,9 @@ def get_strength_color(score):
     }
     return colors.get(score, "#AAAAAA")  # Grey as default
 
-def create_bar_chart(analysis):
-    """Create a horizontal bar chart showing password elements"""
-    factors = [
+def get_strength_factors(analysis):
+    """Return the 0-100 score of each password strength factor"""
+    return [
         {"name": "Length", "value": min(analysis["length"] / 12, 1) * 100 if analysis["length"] > 0 else 0},
         {"name": "Lowercase", "value": 100 if analysis["has_lowercase"] else 0},
         {"name": "Uppercase", "value": 100 if analysis["has_uppercase"] else 0},
@@ -142,23 +141,52 @@ def create_bar_chart(analysis):
         {"name": "No Common Patterns", "value": 0 if analysis["has_common_patterns"] else 100},
         {"name": "Uniqueness", "value": 0 if analysis["is_common_password"] else 100}
     ]
+
+def create_bar_chart(analysis):
+    """Create a horizontal bar chart of the password elements as PNG bytes"""
+    factors = get_strength_factors(analysis)
+    return render_factor_chart(tuple((factor["name"], factor["value"]) for factor in factors))
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_factor_chart(factors):
+    """Render the strength factor chart, cached on the factor values.
     
-    df = pd.DataFrame(factors)
+    Only the length factor varies continuously, so a small LRU of rendered
+    images covers almost every password typed.
+    """
+    df = pd.DataFrame(factors, columns=["name", "value"])
     
-    plt.figure(figsize=(10, 5))
-    chart = sns.barplot(x="value", y="name", data=df, palette="viridis")
-    plt.xlim(0, 100)
-    plt.xlabel("Score")
-    plt.title("Password Strength Factors")
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    sns.barplot(x="value", y="name", data=df, palette="viridis", ax=ax)
+    ax.set_xlim(0, 100)
+    ax.set_xlabel("Score")
+    ax.set_title("Password Strength Factors")
     
-    # Convert plot to base64 for embedding
     buffer = BytesIO()
-    plt.savefig(buffer, format="png", bbox_inches="tight")
-    buffer.seek(0)
-    chart_data = base64.b64encode(buffer.read()).decode()
-    plt.close()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+def display_factor_chart(analysis, native=False):
+    """Display the strength factor chart as a cached image or a native chart"""
+    if not native:
+        st.image(create_bar_chart(analysis), use_container_width=True)
+        return
     
-    return chart_data
+    st.vega_lite_chart(
+        {
+            "data": {"values": get_strength_factors(analysis)},
+            "mark": {"type": "bar", "tooltip": True},
+            "encoding": {
+                "y": {"field": "name", "type": "nominal", "sort": None, "title": None},
+                "x": {"field": "value", "type": "quantitative", "title": "Score",
+                      "scale": {"domain": [0, 100]}},
+                "color": {"field": "name", "type": "nominal", "legend": None,
+                          "scale": {"scheme": "viridis"}},
+            },
+        },
+        use_container_width=True
+    )
 
 def generate_password_suggestions():
     """Generate helpful suggestions for creating strong passwords"""
@@ -261,11 +289,9 @@ def main():
                         st.markdown(f"- {suggestion}")
                 
                 # Display chart
-                chart_data = create_bar_chart(analysis)
-                st.markdown(f"""
-                ### Strength Factors
-                <img src="data:image/png;base64,{chart_data}" width="100%">
-                """, unsafe_allow_html=True)
+                st.markdown("### Strength Factors")
+                native_chart = st.checkbox("Interactive chart", value=False)
+                display_factor_chart(analysis, native=native_chart)
                 
         else:
             # Instructions when no password is entered
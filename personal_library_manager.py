@@ -3,14 +3,20 @@ import pandas as pd
 import sqlite3
 import os
 import datetime
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import uuid
 from PIL import Image
 import io
-import base64
 from io import BytesIO
 import re
+import csv
+import json
+import shutil
+import tempfile
+import zipfile
+import threading
+from contextlib import contextmanager
 
 # Set page configuration
 st.set_page_config(
@@ -23,6 +29,10 @@ st.set_page_config(
 # Define constants
 DB_FILE = "library.db"
 IMAGE_FOLDER = "book_covers"
+CHART_CACHE_ENTRIES = 32
+IMPORT_CHUNK_SIZE = 5000
+EXPORT_BATCH_SIZE = 1000
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
 
 # Create directories if they don't exist
 if not os.path.exists(IMAGE_FOLDER):
@@ -109,6 +119,89 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Database connection pool
+class ConnectionPool:
+    """Pool of SQLite connections shared by every session in the process.
+
+    A connection is bound to the calling thread for the duration of a
+    ``connection()`` block, so nested blocks on the same thread reuse it and
+    commit only once at the outermost level. Idle connections are kept for
+    reuse instead of reconnecting on every query.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -16000",
+        "PRAGMA mmap_size = 134217728",
+        "PRAGMA busy_timeout = 5000",
+    )
+
+    def __init__(self, db_file, max_idle=8):
+        self.db_file = db_file
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file, timeout=5, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Yield a connection, committing on success and rolling back on error."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Nested use on the same thread joins the outer transaction
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close_all(self):
+        """Close every idle connection (used before removing the database file)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+@st.cache_resource(show_spinner=False)
+def get_connection_pool(db_file):
+    """Return the process-wide connection pool for a database file."""
+    return ConnectionPool(db_file)
+
+def db_connection():
+    """Context manager yielding a pooled connection to the library database."""
+    return get_connection_pool(DB_FILE).connection()
+
 # Database functions
 def init_db():
     """Initialize the database with required tables if they don't exist."""
@@ -341,30 +434,7 @@ def add_reading_session(session_data):
 
 def get_reading_sessions(book_id=None):
     """Retrieve reading sessions, optionally filtered by book."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
-    if book_id:
-        c.execute("""
-            SELECT rs.*, b.title as book_title 
-            FROM reading_sessions rs
-            JOIN books b ON rs.book_id = b.id
-            WHERE rs.book_id = ?
-            ORDER BY rs.date DESC
-        """, (book_id,))
-    else:
-        c.execute("""
-            SELECT rs.*, b.title as book_title 
-            FROM reading_sessions rs
-            JOIN books b ON rs.book_id = b.id
-            ORDER BY rs.date DESC
-        """)
-    
-    sessions = [dict(row) for row in c.fetchall()]
-    
-    conn.close()
-    return sessions
+    return get_all_reading_sessions(book_id)
 
 def get_library_statistics():
     """Get statistics about the library."""
@@ -514,25 +584,6 @@ def save_book_cover(book_id, image_data):
     
     return filepath
 
-def get_tags_list():
-    """Get a list of all unique tags in the library."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    
-    c.execute("SELECT tags FROM books WHERE tags IS NOT NULL AND tags != ''")
-    tag_strings = c.fetchall()
-    conn.close()
-    
-    all_tags = []
-    for tag_string in tag_strings:
-        if tag_string[0]:
-            tags = [tag.strip() for tag in tag_string[0].split(',')]
-            all_tags.extend(tags)
-    
-    # Remove duplicates and sort
-    unique_tags = sorted(list(set(all_tags)))
-    return unique_tags
-
 def get_genres_list():
     """Get a list of all unique genres in the library."""
     conn = sqlite3.connect(DB_FILE)
@@ -870,27 +921,58 @@ def display_reading_session_list(sessions):
                 reading_speed = round(session.get('pages_read', 0) / (session.get('minutes_spent', 1) / 60), 1)
                 st.metric("Pages/Hour", f"{reading_speed}")
 
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
 def create_chart(data, chart_type, title):
-    """Create a chart based on the provided data and type."""
-    plt.figure(figsize=(10, 6))
-    plt.title(title)
+    """Render a chart to PNG bytes.
+    
+    Results are cached on a hash of the arguments (least recently used
+    entries are evicted past CHART_CACHE_ENTRIES), so reruns with unchanged
+    statistics skip matplotlib entirely.
+    """
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.set_title(title)
     
     if chart_type == "bar":
-        chart = sns.barplot(x=list(data.keys()), y=list(data.values()))
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        sns.barplot(x=list(data.keys()), y=list(data.values()), ax=ax)
+        ax.tick_params(axis='x', labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment('right')
+        fig.tight_layout()
     elif chart_type == "pie":
-        plt.pie(list(data.values()), labels=list(data.keys()), autopct='%1.1f%%', startangle=90)
-        plt.axis('equal')
+        ax.pie(list(data.values()), labels=list(data.keys()), autopct='%1.1f%%', startangle=90)
+        ax.axis('equal')
     
-    # Convert plot to base64 string
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-    plt.close()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+def display_chart(data, chart_type, title):
+    """Display a chart, natively in the browser or as a cached PNG image."""
+    st.markdown(f"<h4 style='text-align:center;'>{title}</h4>", unsafe_allow_html=True)
     
-    return image_base64
+    if not st.session_state.get('native_charts', False):
+        st.image(create_chart(data, chart_type, title), use_container_width=True)
+        return
+    
+    values = [{"label": str(label), "count": count} for label, count in data.items()]
+    if chart_type == "pie":
+        spec = {
+            "mark": {"type": "arc", "tooltip": True},
+            "encoding": {
+                "theta": {"field": "count", "type": "quantitative"},
+                "color": {"field": "label", "type": "nominal", "title": None},
+            },
+        }
+    else:
+        spec = {
+            "mark": {"type": "bar", "tooltip": True},
+            "encoding": {
+                "x": {"field": "label", "type": "nominal", "sort": "-y", "title": None},
+                "y": {"field": "count", "type": "quantitative", "title": None},
+            },
+        }
+    st.vega_lite_chart({"data": {"values": values}, **spec}, use_container_width=True)
 
 def display_library_statistics(stats):
     """Display library statistics and charts."""
@@ -961,29 +1043,11 @@ def display_library_statistics(stats):
     
     with chart_col1:
         if stats.get("status_counts"):
-            status_chart = create_chart(stats["status_counts"], "pie", "Books by Status")
-            st.markdown(
-                f"""
-                <div style="text-align:center;">
-                    <h4>Books by Status</h4>
-                    <img src="data:image/png;base64,{status_chart}" style="max-width:100%;">
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+            display_chart(stats["status_counts"], "pie", "Books by Status")
     
     with chart_col2:
         if stats.get("genre_counts"):
-            genre_chart = create_chart(stats["genre_counts"], "bar", "Top Genres")
-            st.markdown(
-                f"""
-                <div style="text-align:center;">
-                    <h4>Top Genres</h4>
-                    <img src="data:image/png;base64,{genre_chart}" style="max-width:100%;">
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+            display_chart(stats["genre_counts"], "bar", "Top Genres")
     
     # Reading activity
     st.subheader("Reading Activity")
@@ -1034,26 +1098,50 @@ def display_library_management():
     st.subheader("Library Management")
     
     # Export library
+    col1, col2 = st.columns(2)
+    with col1:
+        export_format = st.selectbox("Export Format", list(EXPORT_FORMATS.keys()))
+    with col2:
+        export_archive = st.checkbox(
+            "Single zip archive",
+            value=True,
+            help="Bundle books, reading sessions and cover images into one download."
+        )
+    
     if st.button("Export Library Data"):
-        books_csv, sessions_csv = export_library()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.download_button(
-                label="Download Books Data",
-                data=books_csv,
-                file_name="library_books.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            st.download_button(
-                label="Download Reading Sessions Data",
-                data=sessions_csv,
-                file_name="library_sessions.csv",
-                mime="text/csv"
-            )
+        extension, mime = EXPORT_FORMATS[export_format]
+        
+        try:
+            if export_archive:
+                with export_library_archive(extension) as archive:
+                    st.download_button(
+                        label="Download Library Archive",
+                        data=archive.read(),
+                        file_name=f"library_export_{datetime.datetime.now().strftime('%Y%m%d')}.zip",
+                        mime="application/zip"
+                    )
+            else:
+                col1, col2 = st.columns(2)
+                
+                with col1, export_table("books", extension) as books_file:
+                    st.download_button(
+                        label="Download Books Data",
+                        data=books_file.read(),
+                        file_name=f"library_books.{extension}",
+                        mime=mime
+                    )
+                
+                with col2, export_table("sessions", extension) as sessions_file:
+                    st.download_button(
+                        label="Download Reading Sessions Data",
+                        data=sessions_file.read(),
+                        file_name=f"library_sessions.{extension}",
+                        mime=mime
+                    )
+        except ImportError:
+            st.error("Parquet export requires the pyarrow package.")
+        except Exception as e:
+            st.error(f"Error exporting library: {str(e)}")
     
     # Import library
     with st.expander("Import Library Data"):
@@ -1061,9 +1149,17 @@ def display_library_management():
         
         books_file = st.file_uploader("Upload Books CSV", type=["csv"])
         sessions_file = st.file_uploader("Upload Reading Sessions CSV", type=["csv"])
+        dry_run = st.checkbox("Validate only (dry run)", help="Check the files without changing your library.")
         
         if st.button("Import Data") and books_file and sessions_file:
-            success, message = import_library(books_file, sessions_file)
+            progress_bar = st.progress(0.0, text="Starting import...")
+            success, message = import_library(
+                books_file,
+                sessions_file,
+                dry_run=dry_run,
+                progress=lambda fraction, text: progress_bar.progress(fraction, text=text)
+            )
+            progress_bar.empty()
             if success:
                 st.success(message)
             else:
@@ -1099,6 +1195,9 @@ def main():
     if 'show_add_session' not in st.session_state:
         st.session_state.show_add_session = False
     
+    if 'page_cursors' not in st.session_state:
+        st.session_state.page_cursors = [None]
+    
     # Navigation functions
     def set_page(page):
         st.session_state.page = page
@@ -1121,6 +1220,13 @@ def main():
         st.session_state.book_id = book_id
         st.session_state.show_add_session = True
     
+    def next_page(cursor):
+        st.session_state.page_cursors.append(cursor)
+    
+    def previous_page():
+        if len(st.session_state.page_cursors) > 1:
+            st.session_state.page_cursors.pop()
+    
     def delete_book_prompt(book_id):
         st.session_state.book_id = book_id
         st.session_state.confirm_delete = True
@@ -1158,34 +1264,46 @@ def main():
         
         # Filter section
         with st.expander("Filter Books", expanded=False):
+            filter_search = st.text_input(
+                "Search",
+                help="Searches title, author, description, notes and tags. Words match as prefixes."
+            )
+            
             filter_col1, filter_col2, filter_col3 = st.columns(3)
             
             with filter_col1:
-                filter_title = st.text_input("Title Contains")
-                filter_author = st.text_input("Author Contains")
+                filter_title = st.text_input("Title Words")
+                filter_author = st.text_input("Author Words")
             
             with filter_col2:
                 filter_genre = st.selectbox("Genre", [""] + get_genres_list())
-                filter_tags = st.text_input("Tags Contains")
+                filter_tags = st.multiselect("Tags", get_tags_list())
+                filter_tags_mode = st.radio("Match Tags", ["Any", "All"], horizontal=True)
             
             with filter_col3:
                 filter_status = st.selectbox("Status", ["", "Unread", "Reading", "Completed", "On Hold", "Abandoned", "Wishlist"])
                 filter_rating = st.slider("Minimum Rating", 0, 5, 0)
             
-            sort_col1, sort_col2 = st.columns(2)
+            sort_col1, sort_col2, sort_col3 = st.columns(3)
             
             with sort_col1:
-                sort_by = st.selectbox("Sort By", ["title", "author", "publication_year", "rating", "status", "date_added"])
+                sort_options = (["relevance"] if filter_search else []) + SORTABLE_COLUMNS
+                sort_by = st.selectbox("Sort By", sort_options)
             
             with sort_col2:
                 sort_order = st.radio("Sort Order", ["Ascending", "Descending"], horizontal=True)
+            
+            with sort_col3:
+                page_size = st.selectbox("Books per Page", PAGE_SIZE_OPTIONS, index=1)
         
         # Apply filters
         filters = {
+            "search": filter_search,
             "title": filter_title,
             "author": filter_author,
             "genre": filter_genre,
             "tags": filter_tags,
+            "tags_mode": filter_tags_mode.lower() if filter_tags else "",
             "status": filter_status,
             "rating": filter_rating
         }
@@ -1193,19 +1311,60 @@ def main():
         # Remove empty filters
         filters = {k: v for k, v in filters.items() if v}
         
-        # Get books with filters and sorting
-        books = get_all_books(filters, sort_by, sort_order == "Ascending")
+        ascending = sort_order == "Ascending"
+        
+        # Go back to the first page whenever the query changes
+        page_key = (sorted((k, str(v)) for k, v in filters.items()), sort_by, ascending, page_size)
+        if st.session_state.get('page_key') != page_key:
+            st.session_state.page_key = page_key
+            st.session_state.page_cursors = [None]
+        
+        # Only the visible page is fetched; the total comes from a COUNT query
+        total_books = count_books(filters)
+        books, next_cursor = get_books_page(
+            filters, sort_by, ascending, page_size, st.session_state.page_cursors[-1]
+        )
+        # Deleting the last books on a later page leaves it empty; step back
+        # to the nearest page that still has books
+        while not books and len(st.session_state.page_cursors) > 1:
+            st.session_state.page_cursors.pop()
+            books, next_cursor = get_books_page(
+                filters, sort_by, ascending, page_size, st.session_state.page_cursors[-1]
+            )
         
         # Display books
         if not books:
             st.info("No books found. Add some books to your library!")
         else:
-            st.subheader(f"Found {len(books)} books")
+            page_number = len(st.session_state.page_cursors)
+            first_index = (page_number - 1) * page_size + 1
+            st.subheader(f"Found {total_books} books")
+            # Relevance order only ranks the newest matches of a broad search
+            ranked_books = total_books
+            if sort_by == "relevance" and total_books > SEARCH_RANK_LIMIT:
+                ranked_books = SEARCH_RANK_LIMIT
+                st.caption(
+                    f"Sorted by relevance among the {SEARCH_RANK_LIMIT:,} most recently added matches. "
+                    "Refine the search or sort by another column to see the rest."
+                )
+            st.caption(f"Showing {first_index}-{first_index + len(books) - 1} of {ranked_books}")
             
             for book in books:
                 with st.container():
                     display_book_card(book, on_edit=show_edit_book, on_delete=delete_book_prompt)
                     st.markdown("---")
+            
+            nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+            
+            with nav_col1:
+                st.button("← Previous", disabled=page_number == 1, on_click=previous_page)
+            
+            with nav_col2:
+                total_pages = max(1, -(-ranked_books // page_size))
+                st.markdown(f"<p style='text-align:center;'>Page {page_number} of {total_pages}</p>", unsafe_allow_html=True)
+            
+            with nav_col3:
+                st.button("Next →", disabled=next_cursor is None, on_click=next_page, args=(next_cursor,))
         
         # Add Book Form
         if st.session_state.show_add_form:
@@ -1341,153 +1500,355 @@ def main():
         # Custom settings
         st.subheader("Appearance")
         theme = st.selectbox("Theme", ["Light", "Dark", "System Default"])
+        st.session_state.native_charts = st.checkbox(
+            "Interactive charts",
+            value=st.session_state.get('native_charts', False),
+            help="Draw statistics charts in the browser instead of as rendered images."
+        )
         
         # Save settings
         if st.button("Save Settings"):
             st.success("Settings saved successfully!")
 
+# Tables written by the exporter, with the query that streams them in order
+EXPORT_TABLES = {
+    "books": "SELECT * FROM books ORDER BY id",
+    "sessions": """
+        SELECT rs.*, b.title AS book_title
+        FROM reading_sessions rs
+        LEFT JOIN books b ON rs.book_id = b.id
+        ORDER BY rs.date DESC, rs.id
+    """,
+}
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "JSON Lines": ("jsonl", "application/x-ndjson"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+def _iter_export_rows(conn, query):
+    """Yield (column names, batch of rows) for a query, EXPORT_BATCH_SIZE rows at a time."""
+    c = conn.cursor()
+    c.execute(query)
+    columns = [column[0] for column in c.description]
+    
+    while True:
+        rows = c.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            break
+        yield columns, rows
+
+def _parquet_schema(conn, query):
+    """Build a pyarrow schema for a query from the declared column types."""
+    import pyarrow as pa
+    
+    declared = {}
+    for table in ("books", "reading_sessions"):
+        for column in conn.execute(f"PRAGMA table_info({table})"):
+            declared.setdefault(column["name"], column["type"].upper())
+    
+    c = conn.execute(f"SELECT * FROM ({query}) LIMIT 0")
+    return pa.schema([
+        (column[0], pa.int64() if declared.get(column[0]) == "INTEGER" else pa.string())
+        for column in c.description
+    ])
+
+def _write_export(out, conn, query, extension):
+    """Stream the rows of a query into a binary file in the given format."""
+    if extension == "csv":
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        writer = csv.writer(text, lineterminator="\n")
+        header_written = False
+        for columns, rows in _iter_export_rows(conn, query):
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+        if not header_written:
+            writer.writerow([column[0] for column in conn.execute(f"SELECT * FROM ({query}) LIMIT 0").description])
+        text.flush()
+        text.detach()
+    elif extension == "jsonl":
+        for columns, rows in _iter_export_rows(conn, query):
+            out.write("".join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+            ).encode("utf-8"))
+    elif extension == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = _parquet_schema(conn, query)
+        with pq.ParquetWriter(out, schema) as writer:
+            for columns, rows in _iter_export_rows(conn, query):
+                writer.write_table(pa.Table.from_pylist([dict(zip(columns, row)) for row in rows], schema=schema))
+    else:
+        raise ValueError(f"Unsupported export format: {extension}")
+
+def export_table(table, extension="csv"):
+    """Export one table to a spooled temporary file, rewound and ready to read.
+    
+    Rows are fetched EXPORT_BATCH_SIZE at a time and written straight to the
+    file, which only moves from memory to disk once it grows past
+    EXPORT_SPOOL_BYTES.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    with db_connection() as conn:
+        _write_export(out, conn, EXPORT_TABLES[table], extension)
+    out.seek(0)
+    return out
+
+def export_library_archive(extension="csv", include_covers=True):
+    """Export books, reading sessions and cover images as a single zip archive."""
+    out = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        # sqlite3 only opens transactions before writes, so begin one here to
+        # read both tables from the same snapshot; sessions then match the books
+        with db_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            for table in EXPORT_TABLES:
+                with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as part:
+                    _write_export(part, conn, EXPORT_TABLES[table], extension)
+                    part.seek(0)
+                    with archive.open(f"library_{table}.{extension}", "w", force_zip64=True) as entry:
+                        shutil.copyfileobj(part, entry)
+        
+        if include_covers and os.path.isdir(IMAGE_FOLDER):
+            for filename in sorted(os.listdir(IMAGE_FOLDER)):
+                path = os.path.join(IMAGE_FOLDER, filename)
+                if os.path.isfile(path):
+                    archive.write(path, f"covers/{filename}")
+    
+    out.seek(0)
+    return out
+
 def export_library():
     """Export library data to CSV format."""
-    books = get_all_books()
-    sessions = get_all_reading_sessions()
+    with export_table("books") as books_file, export_table("sessions") as sessions_file:
+        return books_file.read(), sessions_file.read()
+
+# Columns accepted from imported CSV files, grouped by how they are coerced
+BOOK_TEXT_COLUMNS = ["title", "author", "genre", "status", "description", "notes", "tags", "date_added"]
+BOOK_INTEGER_COLUMNS = ["id", "publication_year", "rating", "pages", "current_page"]
+SESSION_TEXT_COLUMNS = ["date", "notes"]
+SESSION_INTEGER_COLUMNS = ["book_id", "pages_read", "minutes_spent"]
+
+def _coerce_import_chunk(df, text_columns, integer_columns, required_columns):
+    """Coerce a CSV chunk to the table's column types in vectorized form.
+    
+    Missing optional columns are added as NULL, text is stripped, numbers
+    that don't parse become NULL, and rows lacking a required value are
+    dropped. Returns (rows ready for executemany, number of rows dropped).
+    """
+    df = df.reindex(columns=integer_columns + text_columns)
+    
+    for column in text_columns:
+        df[column] = df[column].astype("string").str.strip().replace("", pd.NA)
+    for column in integer_columns:
+        df[column] = pd.to_numeric(df[column], errors="coerce").round().astype("Int64")
+    
+    valid = df[required_columns].notna().all(axis=1)
+    for column in required_columns:
+        if column in integer_columns and column != "book_id":
+            valid &= df[column].fillna(0) > 0
+    
+    df = df[valid].astype(object).where(df[valid].notna(), None)
+    rows = [
+        tuple(int(value) if column in integer_columns and value is not None else value
+              for column, value in zip(df.columns, row))
+        for row in df.itertuples(index=False, name=None)
+    ]
+    return rows, int((~valid).sum())
+
+def _read_csv_chunks(csv_file):
+    """Yield (chunk, fraction of the file read) for a CSV upload."""
+    csv_file.seek(0, os.SEEK_END)
+    total_bytes = csv_file.tell() or 1
+    csv_file.seek(0)
+    
+    for chunk in pd.read_csv(csv_file, chunksize=IMPORT_CHUNK_SIZE, dtype=str, keep_default_na=False):
+        yield chunk, min(1.0, csv_file.tell() / total_bytes)
+
+class _ImportRejected(Exception):
+    """Raised inside an import's transaction so that it rolls back."""
+
+def import_library(books_file, sessions_file, dry_run=False, progress=None):
+    """Import library data from CSV files in a single transaction.
     
-    # Create CSV for books
-    books_df = pd.DataFrame(books)
-    books_csv = books_df.to_csv(index=False)
+    Both files are streamed in chunks of IMPORT_CHUNK_SIZE rows, coerced
+    in vectorized form and written with executemany. Book tags are rebuilt
+    once at the end, and books being read without a current_page get one
+    from their sessions. Book ids from the CSV are kept so that sessions
+    still point at them; duplicate ids fail validation.
     
-    # Create CSV for reading sessions
-    sessions_df = pd.DataFrame(sessions)
-    sessions_csv = sessions_df.to_csv(index=False)
+    With ``dry_run`` the files are only validated and nothing is written.
+    ``progress`` is an optional callable taking (fraction, message).
+    """
+    required_book_columns = ['title', 'author', 'status']
+    required_session_columns = ['book_id', 'date', 'pages_read', 'minutes_spent']
+    
+    def report(fraction, message):
+        if progress:
+            progress(fraction, message)
     
-    return books_csv, sessions_csv
-
-def import_library(books_file, sessions_file):
-    """Import library data from CSV files."""
     try:
-        # Read CSV files
-        books_df = pd.read_csv(books_file)
-        sessions_df = pd.read_csv(sessions_file)
-        
         # Validate data structure
-        required_book_columns = ['title', 'author', 'status']
-        required_session_columns = ['book_id', 'date', 'pages_read', 'minutes_spent']
+        books_file.seek(0)
+        books_header = pd.read_csv(books_file, nrows=0).columns
+        sessions_file.seek(0)
+        sessions_header = pd.read_csv(sessions_file, nrows=0).columns
         
-        if not all(col in books_df.columns for col in required_book_columns):
+        if not all(col in books_header for col in required_book_columns):
             return False, "Books CSV is missing required columns"
         
-        if not all(col in sessions_df.columns for col in required_session_columns):
+        if not all(col in sessions_header for col in required_session_columns):
             return False, "Sessions CSV is missing required columns"
         
-        # Reset the database
-        reset_database()
+        counts = {"books": 0, "sessions": 0, "skipped": 0}
+        today = datetime.datetime.now().strftime("%Y-%m-%d")
+        book_ids = set()
         
-        # Import books
-        for _, row in books_df.iterrows():
-            book_data = row.to_dict()
-            # Remove id column if present
-            if 'id' in book_data:
-                del book_data['id']
+        with db_connection() as conn:
+            if not dry_run:
+                # Runs inside this transaction, so a failed import keeps the old library
+                reset_database()
             
-            add_book(book_data)
-        
-        # Import sessions
-        for _, row in sessions_df.iterrows():
-            session_data = row.to_dict()
-            # Remove id column if present
-            if 'id' in session_data:
-                del session_data['id']
+            for chunk, fraction in _read_csv_chunks(books_file):
+                rows, skipped = _coerce_import_chunk(
+                    chunk, BOOK_TEXT_COLUMNS, BOOK_INTEGER_COLUMNS, required_book_columns
+                )
+                # id is the first column; a repeated id would fail the real
+                # import on the primary key, so catch it in the dry run too
+                for row in rows:
+                    if row[0] is not None:
+                        if row[0] in book_ids:
+                            # Raised, not returned: returning commits the reset and earlier chunks
+                            raise _ImportRejected(f"Books CSV has more than one book with id {row[0]}")
+                        book_ids.add(row[0])
+                counts["books"] += len(rows)
+                counts["skipped"] += skipped
+                if not dry_run:
+                    columns = BOOK_INTEGER_COLUMNS + BOOK_TEXT_COLUMNS
+                    # date_added is the last column; default it like add_book does
+                    conn.executemany(
+                        f"INSERT INTO books ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                        [row[:-1] + (row[-1] or today,) for row in rows]
+                    )
+                report(fraction * 0.5, f"Books: {counts['books']} rows")
             
-            add_reading_session(session_data)
-        
-        return True, "Library data imported successfully!"
-    
+            for chunk, fraction in _read_csv_chunks(sessions_file):
+                rows, skipped = _coerce_import_chunk(
+                    chunk, SESSION_TEXT_COLUMNS, SESSION_INTEGER_COLUMNS, required_session_columns
+                )
+                counts["sessions"] += len(rows)
+                counts["skipped"] += skipped
+                if not dry_run:
+                    columns = SESSION_INTEGER_COLUMNS + SESSION_TEXT_COLUMNS
+                    conn.executemany(
+                        f"INSERT INTO reading_sessions ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                        rows
+                    )
+                report(0.5 + fraction * 0.5, f"Reading sessions: {counts['sessions']} rows")
+            
+            if not dry_run:
+                report(1.0, "Updating tags and reading progress")
+                _backfill_book_tags(conn)
+                
+                # An exported current_page already includes the sessions, so it
+                # is kept; books read without one get it from their sessions,
+                # capped at the page count like add_reading_session does
+                conn.execute("""
+                    UPDATE books
+                    SET current_page = MIN(
+                        (SELECT SUM(pages_read) FROM reading_sessions WHERE book_id = books.id),
+                        CASE WHEN pages > 0 THEN pages ELSE 9223372036854775807 END
+                    )
+                    WHERE status = 'Reading' AND current_page IS NULL
+                        AND id IN (SELECT book_id FROM reading_sessions)
+                """)
+        
+        summary = f"{counts['books']} books and {counts['sessions']} reading sessions"
+        if counts["skipped"]:
+            summary += f" ({counts['skipped']} invalid rows skipped)"
+        
+        if dry_run:
+            return True, f"Validation passed: {summary} would be imported."
+        return True, f"Library data imported successfully: {summary}."
+    
+    except _ImportRejected as e:
+        return False, str(e)
     except Exception as e:
         return False, f"Error importing data: {str(e)}"
 
 def reset_database():
     """Reset the database by removing all books and reading sessions."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
     try:
-        c.execute("DELETE FROM books")
-        c.execute("DELETE FROM reading_sessions")
-        conn.commit()
+        with db_connection() as conn:
+            c = conn.cursor()
+            c.execute("DELETE FROM books")
+            c.execute("DELETE FROM reading_sessions")
         return True
     except Exception as e:
         print(f"Error resetting database: {str(e)}")
         return False
-    finally:
-        conn.close()
 
 def get_library_statistics():
-    """Get statistics about the library."""
-    conn = sqlite3.connect('library.db')
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    """Get statistics about the library.
     
+    Reads the counters that the library_stats triggers keep up to date, so
+    the cost does not grow with the number of books or sessions.
+    """
     stats = {}
     
     try:
-        # Total books
-        c.execute("SELECT COUNT(*) as count FROM books")
-        stats["total_books"] = c.fetchone()["count"]
-        
-        # Books by status
-        c.execute("SELECT status, COUNT(*) as count FROM books GROUP BY status")
-        status_counts = {row["status"]: row["count"] for row in c.fetchall()}
-        stats["status_counts"] = status_counts
-        
-        # Books by genre
-        c.execute("SELECT genre, COUNT(*) as count FROM books WHERE genre != '' GROUP BY genre ORDER BY count DESC LIMIT 10")
-        genre_counts = {row["genre"]: row["count"] for row in c.fetchall()}
-        stats["genre_counts"] = genre_counts
-        
-        # Total pages and read pages
-        c.execute("SELECT SUM(pages) as total_pages FROM books")
-        stats["total_pages"] = c.fetchone()["total_pages"] or 0
-        
-        c.execute("""
-            SELECT SUM(rs.pages_read) as read_pages
-            FROM reading_sessions rs
-        """)
-        stats["total_read_pages"] = c.fetchone()["read_pages"] or 0
-        
-        # Reading sessions stats
-        c.execute("SELECT COUNT(*) as count FROM reading_sessions")
-        stats["total_sessions"] = c.fetchone()["count"]
-        
-        c.execute("SELECT SUM(minutes_spent) as total_minutes FROM reading_sessions")
-        stats["session_minutes"] = c.fetchone()["total_minutes"] or 0
-        
-        c.execute("SELECT SUM(pages_read) as total_pages FROM reading_sessions")
-        stats["session_pages"] = c.fetchone()["total_pages"] or 0
-        
-        return stats
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            # Totals for books, pages and reading sessions
+            c.execute("SELECT name, value FROM library_stats")
+            counters = {row["name"]: row["value"] for row in c.fetchall()}
+            stats["total_books"] = counters.get("total_books", 0)
+            stats["total_pages"] = counters.get("total_pages", 0)
+            stats["total_read_pages"] = counters.get("session_pages", 0)
+            stats["total_sessions"] = counters.get("total_sessions", 0)
+            stats["session_minutes"] = counters.get("session_minutes", 0)
+            stats["session_pages"] = counters.get("session_pages", 0)
+            
+            # Books by status, top genres and top authors
+            grouped_stats = (
+                ("status", "status_counts", -1),
+                ("genre", "genre_counts", 10),
+                ("author", "author_counts", 5),
+            )
+            for dimension, key, limit in grouped_stats:
+                c.execute("""
+                    SELECT key, count FROM library_stat_groups
+                    WHERE dimension = ?
+                    ORDER BY count DESC
+                    LIMIT ?
+                """, (dimension, limit))
+                stats[key] = {row["key"]: row["count"] for row in c.fetchall()}
+            
+            return stats
     
     except Exception as e:
         print(f"Error getting library statistics: {str(e)}")
         return {}
-    
-    finally:
-        conn.close()
 
 def get_genres_list():
     """Get a list of all genres in the library."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
     try:
-        c.execute("SELECT DISTINCT genre FROM books WHERE genre != '' ORDER BY genre")
-        genres = [row[0] for row in c.fetchall()]
-        return genres
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            c.execute("SELECT DISTINCT genre FROM books WHERE genre != '' ORDER BY genre")
+            genres = [row[0] for row in c.fetchall()]
+            return genres
     
     except Exception as e:
         print(f"Error getting genres list: {str(e)}")
         return []
-    
-    finally:
-        conn.close()
 
 def display_header():
     """Display the application header."""
@@ -1567,6 +1928,10 @@ def display_book_card(book, on_edit=None, on_delete=None):
             if book['status'] == 'Reading':
                 st.markdown(f"**Progress:** {book['current_page']}/{book['pages']} pages ({round((book['current_page'] / book['pages']) * 100) if book['pages'] else 0}%)")
         
+        # Matching text from a full-text search
+        if book.get('snippet'):
+            st.markdown(f"> {book['snippet']}")
+        
         # Book description
         if book['description']:
             with st.expander("Description"):
@@ -1664,315 +2029,856 @@ def display_book_form(book=None, is_update=False):
         
         return None
 
-def init_db():
-    """Initialize the database if it doesn't exist."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
+# Columns offered in the library "Sort By" selector; each one gets an index
+SORTABLE_COLUMNS = ["title", "author", "publication_year", "rating", "status", "date_added"]
+
+# Choices for the number of book cards rendered per library page
+PAGE_SIZE_OPTIONS = [10, 20, 50, 100]
+
+# Columns indexed by the books_fts full-text table
+FTS_COLUMNS = ["title", "author", "description", "notes", "tags"]
+
+# Search words of at least FTS_MIN_PREFIX characters match as prefixes and
+# are served by books_fts's prefix indexes; shorter words match whole words
+FTS_MIN_PREFIX = 3
+FTS_PREFIX_LENGTHS = "3 4 5 6"
+
+# Extra books_fts columns a filtered books query can join onto its rows
+FTS_RESULT_COLUMNS = {"rank": "rank", "snippet": "snippet(books_fts, -1, '**', '**', '…', 12)"}
+
+# A relevance-sorted page ranks only the newest SEARCH_RANK_LIMIT matches:
+# bm25 over every match of a broad prefix takes hundreds of milliseconds
+SEARCH_RANK_LIMIT = 1000
+
+def _add_notes_column(conn):
+    """Add books.notes for databases created before the column existed."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(books)")]
+    if "notes" not in columns:
+        conn.execute("ALTER TABLE books ADD COLUMN notes TEXT")
+
+def parse_tags(tags):
+    """Split a comma-separated tag string (or list of tags) into unique names.
     
-    # Create tables if they don't exist
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY,
-            title TEXT NOT NULL,
-            author TEXT NOT NULL,
-            publication_year INTEGER,
-            genre TEXT,
-            status TEXT NOT NULL,
-            rating INTEGER,
-            pages INTEGER,
-            current_page INTEGER,
-            description TEXT,
-            tags TEXT,
-            date_added TEXT
+    Names are stripped and de-duplicated case-insensitively, keeping the
+    first spelling seen.
+    """
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    
+    unique_tags = {}
+    for tag in tags:
+        tag = str(tag).strip()
+        if tag:
+            unique_tags.setdefault(tag.lower(), tag)
+    return list(unique_tags.values())
+
+def _sync_book_tags(conn, book_id, tags):
+    """Replace the book_tags rows of a book with the tags in ``tags``."""
+    names = parse_tags(tags)
+    conn.execute("DELETE FROM book_tags WHERE book_id = ?", (book_id,))
+    if names:
+        conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(name,) for name in names])
+        conn.executemany(
+            "INSERT OR IGNORE INTO book_tags (book_id, tag_id) SELECT ?, id FROM tags WHERE name = ?",
+            [(book_id, name) for name in names]
         )
-    ''')
-    
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS reading_sessions (
+
+def _backfill_book_tags(conn):
+    """Populate tags and book_tags from the existing books.tags strings."""
+    rows = conn.execute("SELECT id, tags FROM books WHERE tags IS NOT NULL AND tags != ''").fetchall()
+    for book_id, tags in rows:
+        _sync_book_tags(conn, book_id, tags)
+
+# Per-value book counts maintained in library_stat_groups: dimension -> column
+STAT_GROUP_COLUMNS = {"status": "status", "genre": "genre", "author": "author"}
+
+def _stat_group_sql(row, delta):
+    """SQL for a trigger body adjusting the per-value counts of ``row``."""
+    statements = []
+    for dimension, column in STAT_GROUP_COLUMNS.items():
+        value = f"{row}.{column}"
+        if delta > 0:
+            statements.append(f"""
+                INSERT INTO library_stat_groups (dimension, key, count)
+                SELECT '{dimension}', {value}, 1 WHERE {value} IS NOT NULL AND {value} != ''
+                ON CONFLICT (dimension, key) DO UPDATE SET count = count + 1;""")
+        else:
+            statements.append(f"""
+                UPDATE library_stat_groups SET count = count - 1
+                WHERE dimension = '{dimension}' AND key = {value};
+                DELETE FROM library_stat_groups
+                WHERE dimension = '{dimension}' AND key = {value} AND count <= 0;""")
+    return "".join(statements)
+
+def _stat_counter_sql(counters):
+    """SQL for a trigger body adding expressions to library_stats counters."""
+    return "".join(
+        f"""
+                UPDATE library_stats SET value = value + ({expression}) WHERE name = '{name}';"""
+        for name, expression in counters.items()
+    )
+
+def _backfill_library_stats(conn):
+    """Recompute library_stats and library_stat_groups from scratch."""
+    conn.execute("DELETE FROM library_stats")
+    conn.execute("DELETE FROM library_stat_groups")
+    conn.execute("""
+        INSERT INTO library_stats (name, value)
+        SELECT 'total_books', COUNT(*) FROM books
+        UNION ALL SELECT 'total_pages', COALESCE(SUM(pages), 0) FROM books
+        UNION ALL SELECT 'total_sessions', COUNT(*) FROM reading_sessions
+        UNION ALL SELECT 'session_pages', COALESCE(SUM(pages_read), 0) FROM reading_sessions
+        UNION ALL SELECT 'session_minutes', COALESCE(SUM(minutes_spent), 0) FROM reading_sessions
+    """)
+    for dimension, column in STAT_GROUP_COLUMNS.items():
+        conn.execute(f"""
+            INSERT INTO library_stat_groups (dimension, key, count)
+            SELECT ?, {column}, COUNT(*) FROM books
+            WHERE {column} IS NOT NULL AND {column} != ''
+            GROUP BY {column}
+        """, (dimension,))
+
+FTS_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    {", ".join(FTS_COLUMNS)},
+    content='books', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='{FTS_PREFIX_LENGTHS}'
+)
+"""
+
+# Only edits to indexed columns (or the id used as rowid) touch the FTS
+# index, not progress, rating or status updates
+FTS_UPDATE_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS books_fts_update
+AFTER UPDATE OF id, {", ".join(FTS_COLUMNS)} ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, {", ".join(FTS_COLUMNS)})
+    VALUES ('delete', old.id, {", ".join("old." + column for column in FTS_COLUMNS)});
+    INSERT INTO books_fts (rowid, {", ".join(FTS_COLUMNS)})
+    VALUES (new.id, {", ".join("new." + column for column in FTS_COLUMNS)});
+END
+"""
+
+# Schema migrations. Entry N upgrades a database from user_version N to N + 1;
+# each step is either an SQL statement or a callable taking the connection.
+MIGRATIONS = [
+    # 1: secondary indexes for session lookups, grouping, filtering and sorting
+    [
+        "CREATE INDEX IF NOT EXISTS idx_reading_sessions_book_id ON reading_sessions (book_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_reading_sessions_date ON reading_sessions (date)",
+        "CREATE INDEX IF NOT EXISTS idx_books_genre ON books (genre)",
+    ] + [
+        f"CREATE INDEX IF NOT EXISTS idx_books_{column} ON books ({column})"
+        for column in SORTABLE_COLUMNS
+    ],
+    # 2: FTS5 index over the searchable text columns, kept in sync by triggers
+    [
+        _add_notes_column,
+        FTS_TABLE,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, {", ".join(FTS_COLUMNS)})
+            VALUES (new.id, {", ".join("new." + column for column in FTS_COLUMNS)});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, {", ".join(FTS_COLUMNS)})
+            VALUES ('delete', old.id, {", ".join("old." + column for column in FTS_COLUMNS)});
+        END
+        """,
+        FTS_UPDATE_TRIGGER,
+        "INSERT INTO books_fts (books_fts) VALUES ('rebuild')",
+    ],
+    # 3: normalized tags, backfilled from the comma-separated books.tags column
+    [
+        """
+        CREATE TABLE IF NOT EXISTS tags (
             id INTEGER PRIMARY KEY,
-            book_id INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            pages_read INTEGER NOT NULL,
-            minutes_spent INTEGER NOT NULL,
-            notes TEXT,
-            FOREIGN KEY (book_id) REFERENCES books (id)
+            name TEXT NOT NULL UNIQUE COLLATE NOCASE
         )
-    ''')
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS book_tags (
+            book_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (book_id, tag_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_book_tags_tag_id ON book_tags (tag_id, book_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS book_tags_delete AFTER DELETE ON books BEGIN
+            DELETE FROM book_tags WHERE book_id = old.id;
+        END
+        """,
+        _backfill_book_tags,
+    ],
+    # 4: materialized statistics maintained incrementally by triggers
+    [
+        """
+        CREATE TABLE IF NOT EXISTS library_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS library_stat_groups (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (dimension, key)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_library_stat_groups_count ON library_stat_groups (dimension, count)",
+        f"""
+        CREATE TRIGGER IF NOT EXISTS books_stats_insert AFTER INSERT ON books BEGIN
+            {_stat_counter_sql({"total_books": "1", "total_pages": "COALESCE(new.pages, 0)"})}
+            {_stat_group_sql("new", 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS books_stats_delete AFTER DELETE ON books BEGIN
+            {_stat_counter_sql({"total_books": "-1", "total_pages": "-COALESCE(old.pages, 0)"})}
+            {_stat_group_sql("old", -1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS books_stats_update
+        AFTER UPDATE OF {", ".join(STAT_GROUP_COLUMNS.values())}, pages ON books BEGIN
+            {_stat_counter_sql({"total_pages": "COALESCE(new.pages, 0) - COALESCE(old.pages, 0)"})}
+            {_stat_group_sql("old", -1)}
+            {_stat_group_sql("new", 1)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS reading_sessions_stats_insert AFTER INSERT ON reading_sessions BEGIN
+            {_stat_counter_sql({
+                "total_sessions": "1",
+                "session_pages": "COALESCE(new.pages_read, 0)",
+                "session_minutes": "COALESCE(new.minutes_spent, 0)",
+            })}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS reading_sessions_stats_delete AFTER DELETE ON reading_sessions BEGIN
+            {_stat_counter_sql({
+                "total_sessions": "-1",
+                "session_pages": "-COALESCE(old.pages_read, 0)",
+                "session_minutes": "-COALESCE(old.minutes_spent, 0)",
+            })}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS reading_sessions_stats_update
+        AFTER UPDATE OF pages_read, minutes_spent ON reading_sessions BEGIN
+            {_stat_counter_sql({
+                "session_pages": "COALESCE(new.pages_read, 0) - COALESCE(old.pages_read, 0)",
+                "session_minutes": "COALESCE(new.minutes_spent, 0) - COALESCE(old.minutes_spent, 0)",
+            })}
+        END
+        """,
+        _backfill_library_stats,
+    ],
+    # 5: databases from version 2 have an FTS update trigger on every column
+    [
+        "DROP TRIGGER IF EXISTS books_fts_update",
+        FTS_UPDATE_TRIGGER,
+    ],
+    # 6: prefix indexes for the 3-6 letter prefixes searches use, instead of 2-3
+    [
+        "DROP TABLE IF EXISTS books_fts",
+        FTS_TABLE,
+        "INSERT INTO books_fts (books_fts) VALUES ('rebuild')",
+    ],
+]
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate_db(conn):
+    """Apply pending migrations in place, one transaction per version."""
+    if get_schema_version(conn) >= len(MIGRATIONS):
+        return
     
     conn.commit()
-    conn.close()
+    while True:
+        # Take the write lock before re-reading the version so that two
+        # processes starting at once don't both apply the same migration
+        conn.execute("BEGIN IMMEDIATE")
+        version = get_schema_version(conn)
+        if version >= len(MIGRATIONS):
+            conn.commit()
+            break
+        
+        try:
+            for step in MIGRATIONS[version]:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    conn.execute("PRAGMA optimize")
 
-def add_book(book_data):
-    """Add a new book to the database."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
-    try:
-        # Extract values from book_data
-        title = book_data.get('title')
-        author = book_data.get('author')
-        publication_year = book_data.get('publication_year')
-        genre = book_data.get('genre')
-        status = book_data.get('status')
-        rating = book_data.get('rating')
-        pages = book_data.get('pages')
-        current_page = book_data.get('current_page')
-        description = book_data.get('description')
-        tags = book_data.get('tags')
-        date_added = book_data.get('date_added', datetime.now().strftime("%Y-%m-%d"))
-        
-        # Validate required fields
-        if not title or not author or not status:
-            return False, "Title, author, and status are required fields.", None
-        
-        # Insert the book
+def explain_query_plan(sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    with db_connection() as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def init_db():
+    """Initialize the database if it doesn't exist."""
+    with db_connection() as conn:
+        c = conn.cursor()
+        
+        # Create tables if they don't exist
         c.execute('''
-            INSERT INTO books (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, date_added)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, date_added))
+            CREATE TABLE IF NOT EXISTS books (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                publication_year INTEGER,
+                genre TEXT,
+                status TEXT NOT NULL,
+                rating INTEGER,
+                pages INTEGER,
+                current_page INTEGER,
+                description TEXT,
+                tags TEXT,
+                date_added TEXT
+            )
+        ''')
         
-        book_id = c.lastrowid
-        conn.commit()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS reading_sessions (
+                id INTEGER PRIMARY KEY,
+                book_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                pages_read INTEGER NOT NULL,
+                minutes_spent INTEGER NOT NULL,
+                notes TEXT,
+                FOREIGN KEY (book_id) REFERENCES books (id)
+            )
+        ''')
         
-        return True, "Book added successfully!", book_id
+        # Bring older library.db files up to the current schema
+        migrate_db(conn)
+
+def add_book(book_data):
+    """Add a new book to the database."""
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            # Extract values from book_data
+            title = book_data.get('title')
+            author = book_data.get('author')
+            publication_year = book_data.get('publication_year')
+            genre = book_data.get('genre')
+            status = book_data.get('status')
+            rating = book_data.get('rating')
+            pages = book_data.get('pages')
+            current_page = book_data.get('current_page')
+            description = book_data.get('description')
+            tags = book_data.get('tags')
+            date_added = book_data.get('date_added', datetime.datetime.now().strftime("%Y-%m-%d"))
+            
+            # Validate required fields
+            if not title or not author or not status:
+                return False, "Title, author, and status are required fields.", None
+            
+            # Insert the book
+            c.execute('''
+                INSERT INTO books (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, date_added)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, date_added))
+            
+            book_id = c.lastrowid
+            _sync_book_tags(conn, book_id, tags)
+            
+            return True, "Book added successfully!", book_id
     
     except Exception as e:
         print(f"Error adding book: {str(e)}")
         return False, f"Error adding book: {str(e)}", None
-    
-    finally:
-        conn.close()
 
 def update_book(book_id, book_data):
     """Update an existing book in the database."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
     try:
-        # Extract values from book_data
-        title = book_data.get('title')
-        author = book_data.get('author')
-        publication_year = book_data.get('publication_year')
-        genre = book_data.get('genre')
-        status = book_data.get('status')
-        rating = book_data.get('rating')
-        pages = book_data.get('pages')
-        current_page = book_data.get('current_page')
-        description = book_data.get('description')
-        tags = book_data.get('tags')
-        
-        # Validate required fields
-        if not title or not author or not status:
-            return False, "Title, author, and status are required fields."
-        
-        # Update the book
-        c.execute('''
-            UPDATE books
-            SET title = ?, author = ?, publication_year = ?, genre = ?, status = ?, 
-                rating = ?, pages = ?, current_page = ?, description = ?, tags = ?
-            WHERE id = ?
-        ''', (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, book_id))
-        
-        conn.commit()
-        
-        return True, "Book updated successfully!"
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            # Extract values from book_data
+            title = book_data.get('title')
+            author = book_data.get('author')
+            publication_year = book_data.get('publication_year')
+            genre = book_data.get('genre')
+            status = book_data.get('status')
+            rating = book_data.get('rating')
+            pages = book_data.get('pages')
+            current_page = book_data.get('current_page')
+            description = book_data.get('description')
+            tags = book_data.get('tags')
+            
+            # Validate required fields
+            if not title or not author or not status:
+                return False, "Title, author, and status are required fields."
+            
+            # Update the book
+            c.execute('''
+                UPDATE books
+                SET title = ?, author = ?, publication_year = ?, genre = ?, status = ?, 
+                    rating = ?, pages = ?, current_page = ?, description = ?, tags = ?
+                WHERE id = ?
+            ''', (title, author, publication_year, genre, status, rating, pages, current_page, description, tags, book_id))
+            _sync_book_tags(conn, book_id, tags)
+            
+            return True, "Book updated successfully!"
     
     except Exception as e:
         print(f"Error updating book: {str(e)}")
         return False, f"Error updating book: {str(e)}"
-    
-    finally:
-        conn.close()
 
 def delete_book(book_id):
     """Delete a book from the database."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
     try:
-        # Delete associated reading sessions first
-        c.execute("DELETE FROM reading_sessions WHERE book_id = ?", (book_id,))
-        
-        # Delete the book
-        c.execute("DELETE FROM books WHERE id = ?", (book_id,))
-        
-        conn.commit()
-        
-        return True, "Book deleted successfully!"
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            # Delete associated reading sessions first
+            c.execute("DELETE FROM reading_sessions WHERE book_id = ?", (book_id,))
+            
+            # Delete the book
+            c.execute("DELETE FROM books WHERE id = ?", (book_id,))
+            
+            return True, "Book deleted successfully!"
     
     except Exception as e:
         print(f"Error deleting book: {str(e)}")
         return False, f"Error deleting book: {str(e)}"
-    
-    finally:
-        conn.close()
 
 def get_book(book_id):
     """Get a book by its ID."""
-    conn = sqlite3.connect('library.db')
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
     try:
-        c.execute("SELECT * FROM books WHERE id = ?", (book_id,))
-        book = c.fetchone()
-        
-        if book:
-            return dict(book)
-        else:
-            return None
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            c.execute("SELECT * FROM books WHERE id = ?", (book_id,))
+            book = c.fetchone()
+            
+            if book:
+                return dict(book)
+            else:
+                return None
     
     except Exception as e:
         print(f"Error getting book: {str(e)}")
         return None
+
+def build_fts_query(text, column=None):
+    """Turn free text into an FTS5 query matching every word.
+    
+    Words of FTS_MIN_PREFIX or more characters match as prefixes; shorter
+    ones, whose prefix matches would cover much of the library, only match
+    whole words. Returns None when the text has no searchable words.
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
     
-    finally:
-        conn.close()
+    query = " ".join(f'"{term}"' + ("*" if len(term) >= FTS_MIN_PREFIX else "") for term in terms)
+    if column:
+        return f"{{{column}}} : ({query})"
+    return f"({query})"
+
+def _fts_match(filters):
+    """Combine the text filters into one FTS5 MATCH query, or None without any.
+    
+    "search" looks across all indexed columns; "title" and "author" only
+    in their own column.
+    """
+    if not filters:
+        return None
+    match_parts = [build_fts_query(filters.get("search"))]
+    for column in ("title", "author"):
+        if filters.get(column):
+            match_parts.append(build_fts_query(filters[column], column))
+    match_parts = [part for part in match_parts if part]
+    return " AND ".join(match_parts) or None
+
+def _book_filter_clauses(filters, fts_columns=(), rank_limit=None):
+    """Translate library filters into (join, conditions, params) for a books query.
+    
+    Text filters become an FTS5 MATCH joined onto the books rows as fts,
+    carrying the FTS_RESULT_COLUMNS named in ``fts_columns`` (fts.rank,
+    fts.snippet). With ``rank_limit`` only that many of the newest matches
+    are joined. "tags" matches exact tag names through book_tags, requiring
+    every tag when "tags_mode" is "all" and any of them otherwise.
+    """
+    join = ""
+    conditions = []
+    params = []
+    
+    if not filters:
+        return join, conditions, params
+    
+    match = _fts_match(filters)
+    if match:
+        columns = "".join(f", {FTS_RESULT_COLUMNS[name]} AS {name}" for name in fts_columns)
+        join = f"""
+            JOIN (
+                SELECT rowid{columns}
+                FROM books_fts
+                WHERE books_fts MATCH ?{" ORDER BY rowid DESC LIMIT ?" if rank_limit else ""}
+            ) AS fts ON fts.rowid = books.id"""
+        params.append(match)
+        if rank_limit:
+            params.append(rank_limit)
+    
+    tags = parse_tags(filters.get("tags"))
+    if tags:
+        placeholders = ", ".join("?" for _ in tags)
+        tag_query = f"""
+            books.id IN (
+                SELECT bt.book_id
+                FROM book_tags bt
+                JOIN tags t ON t.id = bt.tag_id
+                WHERE t.name IN ({placeholders})"""
+        params.extend(tags)
+        if filters.get("tags_mode") == "all":
+            tag_query += """
+                GROUP BY bt.book_id
+                HAVING COUNT(*) = ?"""
+            params.append(len(tags))
+        conditions.append(tag_query + ")")
+    
+    if filters.get("genre"):
+        conditions.append("genre = ?")
+        params.append(filters['genre'])
+    
+    if filters.get("status"):
+        conditions.append("status = ?")
+        params.append(filters['status'])
+    
+    if filters.get("rating", 0) > 0:
+        conditions.append("rating >= ?")
+        params.append(filters['rating'])
+    
+    return join, conditions, params
+
+def _book_snippets(conn, match, book_ids):
+    """Highlighted snippets for just the given books, keyed by book id.
+    
+    snippet() in a page query would be computed for every match before
+    the sort, so pages look up the snippets of their own rows afterwards.
+    FTS5 runs the query again for each value of a rowid IN (...), so the
+    rowid range bounds one pass and the unary + keeps IN out of the index.
+    """
+    if not book_ids:
+        return {}
+    rows = conn.execute(f"""
+        SELECT rowid, {FTS_RESULT_COLUMNS["snippet"]}
+        FROM books_fts
+        WHERE books_fts MATCH ? AND rowid BETWEEN ? AND ?
+            AND +rowid IN ({", ".join("?" for _ in book_ids)})
+    """, [match, min(book_ids), max(book_ids), *book_ids])
+    return dict(rows.fetchall())
 
 def get_all_books(filters=None, sort_by="title", ascending=True):
-    """Get all books with optional filtering and sorting."""
-    conn = sqlite3.connect('library.db')
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
+    """Get all books with optional filtering and sorting.
     
+    ``sort_by`` may also be "relevance", which orders full-text matches by
+    their bm25 rank (falling back to title when no text filter is set).
+    """
     try:
-        query = "SELECT * FROM books"
-        params = []
-        
-        # Apply filters if provided
-        if filters:
-            filter_conditions = []
+        with db_connection() as conn:
+            c = conn.cursor()
             
-            if "title" in filters:
-                filter_conditions.append("title LIKE ?")
-                params.append(f"%{filters['title']}%")
+            join, conditions, params = _book_filter_clauses(filters, ("rank", "snippet"))
             
-            if "author" in filters:
-                filter_conditions.append("author LIKE ?")
-                params.append(f"%{filters['author']}%")
+            query = "SELECT books.*" + (", fts.snippet" if join else "") + " FROM books" + join
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
             
-            if "genre" in filters:
-                filter_conditions.append("genre = ?")
-                params.append(filters['genre'])
+            # Apply sorting
+            order_dir = "ASC" if ascending else "DESC"
+            if sort_by == "relevance":
+                order_by = "fts.rank" if join else "title"
+                order_dir = "ASC"
+            else:
+                order_by = sort_by
+            query += f" ORDER BY {order_by} {order_dir}"
             
-            if "tags" in filters:
-                filter_conditions.append("tags LIKE ?")
-                params.append(f"%{filters['tags']}%")
+            c.execute(query, params)
+            books = c.fetchall()
             
-            if "status" in filters:
-                filter_conditions.append("status = ?")
-                params.append(filters['status'])
+            return [dict(book) for book in books]
+    
+    except Exception as e:
+        print(f"Error getting books: {str(e)}")
+        return []
+
+def count_books(filters=None):
+    """Count the books matching ``filters`` without fetching them."""
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
             
-            if "rating" in filters and filters['rating'] > 0:
-                filter_conditions.append("rating >= ?")
-                params.append(filters['rating'])
+            join, conditions, params = _book_filter_clauses(filters)
+            if join and not conditions:
+                # Every books_fts row is a book, so text filters alone are counted in the index
+                query = "SELECT COUNT(*) FROM books_fts WHERE books_fts MATCH ?"
+            else:
+                query = "SELECT COUNT(*) FROM books" + join
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
             
-            if filter_conditions:
-                query += " WHERE " + " AND ".join(filter_conditions)
-        
-        # Apply sorting
-        order_dir = "ASC" if ascending else "DESC"
-        query += f" ORDER BY {sort_by} {order_dir}"
-        
-        c.execute(query, params)
-        books = c.fetchall()
-        
-        return [dict(book) for book in books]
+            c.execute(query, params)
+            return c.fetchone()[0]
     
     except Exception as e:
-        print(f"Error getting books: {str(e)}")
+        print(f"Error counting books: {str(e)}")
+        return 0
+
+def get_books_page(filters=None, sort_by="title", ascending=True, page_size=20, cursor=None):
+    """Get one page of books using keyset (cursor) pagination.
+    
+    ``cursor`` is the ``next_cursor`` returned with the previous page, a
+    (sort value, id) pair for its last row, or None for the first page.
+    Returns (books, next_cursor); next_cursor is None on the last page.
+    
+    Rows are ordered by (sort column, id). SQLite sorts NULLs first, so the
+    page is read from a NULL block and a non-NULL block, each of which can
+    seek straight to the cursor position through the sort column's index.
+    
+    "relevance" ranks the newest SEARCH_RANK_LIMIT text matches. Snippets
+    are looked up for the returned rows only.
+    """
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            match = _fts_match(filters)
+            if sort_by == "relevance" and match:
+                join, conditions, params = _book_filter_clauses(filters, ("rank",), SEARCH_RANK_LIMIT)
+                sort_expr = "fts.rank"
+                ascending = True
+            else:
+                join, conditions, params = _book_filter_clauses(filters)
+                sort_expr = f"books.{sort_by}" if sort_by in SORTABLE_COLUMNS else "books.title"
+            
+            null_block = f"{sort_expr} IS NULL"
+            value_block = f"{sort_expr} IS NOT NULL"
+            if sort_expr == "fts.rank":
+                # rank is never NULL, and each block would run the search again
+                segments = [(f"({sort_expr}, books.id) > (?, ?)", list(cursor))] if cursor else [(value_block, [])]
+            elif ascending:
+                if cursor is None:
+                    segments = [(null_block, []), (value_block, [])]
+                elif cursor[0] is None:
+                    segments = [(f"{null_block} AND books.id > ?", [cursor[1]]), (value_block, [])]
+                else:
+                    segments = [(f"({sort_expr}, books.id) > (?, ?)", list(cursor))]
+            else:
+                if cursor is None:
+                    segments = [(value_block, []), (null_block, [])]
+                elif cursor[0] is None:
+                    segments = [(f"{null_block} AND books.id < ?", [cursor[1]])]
+                else:
+                    segments = [(f"({sort_expr}, books.id) < (?, ?)", list(cursor)), (null_block, [])]
+            
+            # Fetch one extra row to learn whether another page follows
+            order_dir = "ASC" if ascending else "DESC"
+            columns = "books.*, " + sort_expr + " AS sort_value"
+            selects = []
+            query_params = []
+            for segment, segment_params in segments:
+                where = " AND ".join(conditions + [segment])
+                selects.append(f"""
+                    SELECT * FROM (
+                        SELECT {columns} FROM books{join}
+                        WHERE {where}
+                        ORDER BY {sort_expr} {order_dir}, books.id {order_dir}
+                        LIMIT ?
+                    )""")
+                query_params += params + segment_params + [page_size + 1]
+            
+            query = " UNION ALL ".join(selects) + " LIMIT ?"
+            c.execute(query, query_params + [page_size + 1])
+            books = [dict(book) for book in c.fetchall()]
+            
+            next_cursor = None
+            if len(books) > page_size:
+                books = books[:page_size]
+                next_cursor = (books[-1]["sort_value"], books[-1]["id"])
+            
+            if match:
+                snippets = _book_snippets(conn, match, [book["id"] for book in books])
+                for book in books:
+                    book["snippet"] = snippets.get(book["id"])
+            
+            return books, next_cursor
+    
+    except Exception as e:
+        print(f"Error getting books page: {str(e)}")
+        return [], None
+
+def search_books(text, limit=20):
+    """Ranked full-text search over title, author, description, notes and tags.
+    
+    Words match as in build_fts_query(); the newest SEARCH_RANK_LIMIT
+    matches are ordered best match first and carry a ``snippet`` with the
+    matching words in bold.
+    """
+    query = build_fts_query(text)
+    if not query:
         return []
     
-    finally:
-        conn.close()
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
+            c.execute("""
+                SELECT books.*
+                FROM (
+                    SELECT rowid, rank
+                    FROM books_fts
+                    WHERE books_fts MATCH ?
+                    ORDER BY rowid DESC
+                    LIMIT ?
+                ) AS fts
+                JOIN books ON books.id = fts.rowid
+                ORDER BY fts.rank
+                LIMIT ?
+            """, (query, SEARCH_RANK_LIMIT, limit))
+            books = [dict(book) for book in c.fetchall()]
+            
+            snippets = _book_snippets(conn, query, [book["id"] for book in books])
+            for book in books:
+                book["snippet"] = snippets.get(book["id"])
+            return books
+    
+    except Exception as e:
+        print(f"Error searching books: {str(e)}")
+        return []
+
+def get_tags_list():
+    """Get a sorted list of all tags used by at least one book."""
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
+            c.execute("""
+                SELECT t.name
+                FROM tags t
+                WHERE EXISTS (SELECT 1 FROM book_tags bt WHERE bt.tag_id = t.id)
+                ORDER BY t.name
+            """)
+            return [row[0] for row in c.fetchall()]
+    
+    except Exception as e:
+        print(f"Error getting tags list: {str(e)}")
+        return []
+
+def get_tag_counts():
+    """Get the number of books per tag, most used first."""
+    try:
+        with db_connection() as conn:
+            c = conn.cursor()
+            c.execute("""
+                SELECT t.name, COUNT(*) as count
+                FROM book_tags bt
+                JOIN tags t ON t.id = bt.tag_id
+                GROUP BY bt.tag_id
+                ORDER BY count DESC, t.name
+            """)
+            return {row["name"]: row["count"] for row in c.fetchall()}
+    
+    except Exception as e:
+        print(f"Error getting tag counts: {str(e)}")
+        return {}
 
 def add_reading_session(session_data):
     """Add a new reading session to the database."""
-    conn = sqlite3.connect('library.db')
-    c = conn.cursor()
-    
     try:
-        # Extract values from session_data
-        book_id = session_data.get('book_id')
-        date = session_data.get('date')
-        pages_read = session_data.get('pages_read')
-        minutes_spent = session_data.get('minutes_spent')
-        notes = session_data.get('notes')
-        
-        # Validate required fields
-        if not book_id or not date or not pages_read or not minutes_spent:
-            return False, "Book, date, pages read, and time spent are required fields."
-        
-        # Insert the session
-        c.execute('''
-            INSERT INTO reading_sessions (book_id, date, pages_read, minutes_spent, notes)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (book_id, date, pages_read, minutes_spent, notes))
-        
-        # Update book's current page if it's in "Reading" status
-        c.execute("SELECT status, current_page, pages FROM books WHERE id = ?", (book_id,))
-        book = c.fetchone()
-        
-        if book and book[0] == "Reading":
-            current_page = book[1] or 0
-            total_pages = book[2] or 0
+        with db_connection() as conn:
+            c = conn.cursor()
             
-            new_current_page = current_page + pages_read
+            # Extract values from session_data
+            book_id = session_data.get('book_id')
+            date = session_data.get('date')
+            pages_read = session_data.get('pages_read')
+            minutes_spent = session_data.get('minutes_spent')
+            notes = session_data.get('notes')
             
-            # Don't exceed total pages
-            if total_pages > 0 and new_current_page > total_pages:
-                new_current_page = total_pages
+            # Validate required fields
+            if not book_id or not date or not pages_read or not minutes_spent:
+                return False, "Book, date, pages read, and time spent are required fields."
             
-            c.execute("UPDATE books SET current_page = ? WHERE id = ?", (new_current_page, book_id))
+            # Insert the session
+            c.execute('''
+                INSERT INTO reading_sessions (book_id, date, pages_read, minutes_spent, notes)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (book_id, date, pages_read, minutes_spent, notes))
             
-            # If reached the end of the book, ask if want to mark as completed
-            if total_pages > 0 and new_current_page >= total_pages:
-                pass  # This will be handled in the UI
-        
-        conn.commit()
-        
-        return True, "Reading session added successfully!"
+            # Update book's current page if it's in "Reading" status
+            c.execute("SELECT status, current_page, pages FROM books WHERE id = ?", (book_id,))
+            book = c.fetchone()
+            
+            if book and book[0] == "Reading":
+                current_page = book[1] or 0
+                total_pages = book[2] or 0
+            
+                new_current_page = current_page + pages_read
+            
+                # Don't exceed total pages
+                if total_pages > 0 and new_current_page > total_pages:
+                    new_current_page = total_pages
+            
+                c.execute("UPDATE books SET current_page = ? WHERE id = ?", (new_current_page, book_id))
+            
+                # If reached the end of the book, ask if want to mark as completed
+                if total_pages > 0 and new_current_page >= total_pages:
+                    pass  # This will be handled in the UI
+            
+            return True, "Reading session added successfully!"
     
     except Exception as e:
         print(f"Error adding reading session: {str(e)}")
         return False, f"Error adding reading session: {str(e)}"
-    
-    finally:
-        conn.close()
 
 def get_all_reading_sessions(book_id=None):
     """Get all reading sessions, optionally filtered by book ID."""
-    conn = sqlite3.connect('library.db')
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-    
     try:
-        if book_id:
-            c.execute('''
-                SELECT rs.*, b.title as book_title
-                FROM reading_sessions rs
-                JOIN books b ON rs.book_id = b.id
-                WHERE rs.book_id = ?
-                ORDER BY rs.date DESC
-            ''', (book_id,))
-        else:
-            c.execute('''
-                SELECT rs.*, b.title as book_title
-                FROM reading_sessions rs
-                JOIN books b ON rs.book_id = b.id
-                ORDER BY rs.date DESC
-            ''')
-        
-        sessions = c.fetchall()
-        
-        return [dict(session) for session in sessions]
+        with db_connection() as conn:
+            c = conn.cursor()
+            
+            if book_id:
+                c.execute('''
+                    SELECT rs.*, b.title as book_title
+                    FROM reading_sessions rs
+                    JOIN books b ON rs.book_id = b.id
+                    WHERE rs.book_id = ?
+                    ORDER BY rs.date DESC
+                ''', (book_id,))
+            else:
+                c.execute('''
+                    SELECT rs.*, b.title as book_title
+                    FROM reading_sessions rs
+                    JOIN books b ON rs.book_id = b.id
+                    ORDER BY rs.date DESC
+                ''')
+            
+            sessions = c.fetchall()
+            
+            return [dict(session) for session in sessions]
     
     except Exception as e:
         print(f"Error getting reading sessions: {str(e)}")
         return []
-    
-    finally:
-        conn.close()
 
 def display_reading_sessions(sessions):
     """Display reading sessions."""